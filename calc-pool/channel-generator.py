@@ -5,13 +5,18 @@ Ray Tracing 기반 채널 생성 시뮬레이터
 """
 
 import redis
-import json
 import time
 import logging
 import os
 import numpy as np
+import requests
 from datetime import datetime
 
+from scenario_generator import expand_scenario
+from status_index import set_status
+from task_queue import get_queue
+from worker_runtime import WorkerRuntime
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -21,6 +26,12 @@ logger = logging.getLogger(__name__)
 # Redis 연결
 REDIS_HOST = os.getenv("REDIS_HOST", "redis-service.queue-system.svc.cluster.local")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+STORAGE_SERVICE_URL = os.getenv(
+    "STORAGE_SERVICE_URL", "http://storage-service.storage-pool.svc.cluster.local:8080"
+)
+
+# 시계열을 Storage에 청크로 저장하는 단위 (step 수)
+TIMESERIES_CHUNK_STEPS = int(os.getenv("TIMESERIES_CHUNK_STEPS", 20))
 
 CHANNEL_QUEUE = "channel_queue"
 MONITOR_UPDATE_QUEUE = "monitor_update_queue"
@@ -38,8 +49,13 @@ except Exception as e:
     logger.error(f"Failed to connect to Redis: {str(e)}")
     exit(1)
 
+monitor_update_queue = get_queue(redis_client, MONITOR_UPDATE_QUEUE)
+
+# Storage 연결 재사용
+http_session = requests.Session()
 
-def calculate_path_loss(distance, frequency_hz):
+
+def calculate_path_loss(distance, frequency_hz, rng=np.random):
     """
     3GPP Urban Micro (UMi) 간소화 Path Loss 모델
     더 현실적인 SNR 값을 위해 조정된 모델
@@ -56,7 +72,7 @@ def calculate_path_loss(distance, frequency_hz):
     path_loss = 32.4 + 20 * np.log10(frequency_ghz) + 21 * np.log10(distance)
 
     # Shadow fading 추가 (4 dB 표준편차)
-    shadow_fading = np.random.normal(0, 4)
+    shadow_fading = rng.normal(0, 4)
 
     return path_loss + shadow_fading
 
@@ -90,8 +106,8 @@ def calculate_snr(tx_power_dbm, path_loss_db, bandwidth_hz=20e6, noise_figure_db
     return snr_db
 
 
-def generate_channel_response(user, base_station):
-    """사용자-기지국 간 채널 응답 생성"""
+def generate_channel_response(user, base_station, rng=np.random):
+    """사용자-기지국 간 채널 응답 생성 (rng: seed 고정 시 재현 가능)"""
     # 거리 계산
     dx = user["position"]["x"] - base_station["position"]["x"]
     dy = user["position"]["y"] - base_station["position"]["y"]
@@ -99,7 +115,7 @@ def generate_channel_response(user, base_station):
     distance = np.sqrt(dx**2 + dy**2 + dz**2)
 
     # Path Loss 계산
-    path_loss = calculate_path_loss(distance, base_station["frequency"])
+    path_loss = calculate_path_loss(distance, base_station["frequency"], rng)
 
     # 현실적인 SNR 계산
     snr_db = calculate_snr(base_station["tx_power"], path_loss)
@@ -110,8 +126,8 @@ def generate_channel_response(user, base_station):
 
     for i in range(num_paths):
         # 각 경로의 복소 채널 계수
-        real_part = np.random.randn()
-        imag_part = np.random.randn()
+        real_part = rng.standard_normal()
+        imag_part = rng.standard_normal()
         magnitude = np.sqrt(real_part**2 + imag_part**2)
         phase = np.arctan2(imag_part, real_part)
 
@@ -137,13 +153,80 @@ def generate_channel_response(user, base_station):
     }
 
 
+def save_result(simulation_id, result_data):
+    """최종 결과를 Storage에 저장"""
+    try:
+        response = http_session.post(
+            f"{STORAGE_SERVICE_URL}/results/{simulation_id}",
+            json=result_data,
+            timeout=5,
+        )
+        return response.status_code == 201
+    except Exception as e:
+        logger.error(f"Error saving result: {str(e)}")
+        return False
+
+
+# 시계열 컬럼 (user_states 필드 -> 컬럼 이름)
+TIMESERIES_COLUMNS = {
+    "pos_x": lambda state: state["position"]["x"],
+    "pos_y": lambda state: state["position"]["y"],
+    "vel_x": lambda state: state["velocity"]["x"],
+    "vel_y": lambda state: state["velocity"]["y"],
+    "snr_db": lambda state: state["snr_db"],
+    "best_bs": lambda state: state["best_bs"] or "",
+}
+
+
+def save_timeseries_chunk(simulation_id, start_step, user_ids, columns):
+    """단계별 시계열 청크를 Storage에 저장 (실패해도 시뮬레이션은 계속)"""
+    try:
+        response = http_session.post(
+            f"{STORAGE_SERVICE_URL}/timeseries/{simulation_id}",
+            json={"start_step": start_step, "user_ids": user_ids, "columns": columns},
+            timeout=10,
+        )
+        if response.status_code != 201:
+            logger.warning(f"Failed to save time series chunk: {response.text}")
+    except Exception as e:
+        logger.warning(f"Error saving time series chunk: {str(e)}")
+
+
+def patch_result(simulation_id, fields, append=None):
+    """
+    진행 중인 결과 문서 부분 갱신 (실패해도 시뮬레이션은 계속)
+    append: (리스트 필드 경로, 추가할 값 목록)
+    """
+    try:
+        response = http_session.patch(
+            f"{STORAGE_SERVICE_URL}/results/{simulation_id}", json=fields, timeout=5
+        )
+        if response.status_code != 200:
+            logger.warning(f"Failed to patch result: {response.text}")
+            return
+        if append:
+            path, values = append
+            http_session.post(
+                f"{STORAGE_SERVICE_URL}/results/{simulation_id}/append",
+                json={"path": path, "values": values},
+                timeout=5,
+            )
+    except Exception as e:
+        logger.warning(f"Error patching result: {str(e)}")
+
+
 def process_channel_generation(job_data):
     """채널 생성 및 실시간 시뮬레이션 처리"""
     simulation_id = job_data["simulation_id"]
-    scenario = job_data["scenario"]
+    # 절차적 시나리오는 parameters + seed로 사용자 / 기지국을 직접 생성
+    scenario = expand_scenario(job_data["scenario"])
     duration = scenario.get("duration", 60)  # 기본 60초
     update_interval = 1.0  # 1초마다 업데이트
 
+    start_time = datetime.now().isoformat()
+    # seed가 주어지면 동일한 결과를 재현 (결과 캐시 전제 조건)
+    rng = np.random.default_rng(job_data.get("seed"))
+
     logger.info(f"Starting realtime simulation {simulation_id} for {duration}s")
 
     users = scenario["users"]
@@ -151,6 +234,12 @@ def process_channel_generation(job_data):
 
     # 시뮬레이션 루프: duration 동안 실시간 업데이트 전송
     num_steps = int(duration / update_interval)
+    step_avg_snr = []
+
+    # 시계열 버퍼 (TIMESERIES_CHUNK_STEPS마다 Storage로 전송)
+    user_ids = [user["user_id"] for user in users]
+    chunk_start = 0
+    chunk_columns = {name: [] for name in TIMESERIES_COLUMNS}
 
     for time_step in range(num_steps):
         # 사용자 위치 업데이트 (속도 기반 이동)
@@ -158,8 +247,8 @@ def process_channel_generation(job_data):
             # 속도가 없으면 랜덤 속도 생성
             if "velocity" not in user:
                 user["velocity"] = {
-                    "x": round(np.random.uniform(-2, 2), 2),
-                    "y": round(np.random.uniform(-2, 2), 2),
+                    "x": round(rng.uniform(-2, 2), 2),
+                    "y": round(rng.uniform(-2, 2), 2),
                     "z": 0,
                 }
 
@@ -182,7 +271,7 @@ def process_channel_generation(job_data):
             best_bs = None
 
             for bs in base_stations:
-                channel = generate_channel_response(user, bs)
+                channel = generate_channel_response(user, bs, rng)
                 snr = channel["snr_db"]
                 all_snr_values.append(snr)
 
@@ -225,7 +314,35 @@ def process_channel_generation(job_data):
             },
         }
 
-        redis_client.lpush(MONITOR_UPDATE_QUEUE, json.dumps(monitor_update))
+        # 모니터 업데이트와 상태 인덱스 진행률을 한 번의 왕복으로 전송
+        pipe = redis_client.pipeline(transaction=False)
+        monitor_update_queue.push(monitor_update, pipe=pipe)
+        set_status(
+            redis_client,
+            simulation_id,
+            progress=(time_step + 1) / num_steps,
+            time_step=time_step,
+            sweep_id=job_data.get("sweep_id"),
+            pipe=pipe,
+        )
+        pipe.execute()
+        step_avg_snr.append(monitor_update["data"]["statistics"]["avg_snr_db"])
+
+        for name, extract in TIMESERIES_COLUMNS.items():
+            chunk_columns[name].append([extract(state) for state in user_states])
+        if time_step + 1 - chunk_start >= TIMESERIES_CHUNK_STEPS:
+            save_timeseries_chunk(simulation_id, chunk_start, user_ids, chunk_columns)
+            # 저장된 결과 문서에도 진행률 / 단계별 평균 SNR을 청크 단위로 반영
+            patch_result(
+                simulation_id,
+                {"progress": (time_step + 1) / num_steps, "time_step": time_step},
+                append=(
+                    "statistics.avg_snr_db_per_step",
+                    step_avg_snr[chunk_start : time_step + 1],
+                ),
+            )
+            chunk_start = time_step + 1
+            chunk_columns = {name: [] for name in TIMESERIES_COLUMNS}
         logger.info(
             f"Step {time_step}/{num_steps}: Avg SNR = {monitor_update['data']['statistics']['avg_snr_db']} dB"
         )
@@ -233,42 +350,57 @@ def process_channel_generation(job_data):
         # 다음 업데이트까지 대기
         time.sleep(update_interval)
 
+    if chunk_columns["snr_db"]:
+        save_timeseries_chunk(simulation_id, chunk_start, user_ids, chunk_columns)
+
     logger.info(f"Simulation {simulation_id} completed after {num_steps} steps")
-    return True
+
+    # 최종 결과 저장 (cache_key가 있으면 Storage가 결과 캐시에 등록)
+    saved = save_result(
+        simulation_id,
+        {
+            "simulation_id": simulation_id,
+            "scenario_id": scenario.get("scenario_id"),
+            "status": "completed",
+            "progress": 1.0,
+            "start_time": start_time,
+            "end_time": datetime.now().isoformat(),
+            "seed": job_data.get("seed"),
+            "cache_key": job_data.get("cache_key"),
+            "num_users": len(users),
+            "num_steps": num_steps,
+            "statistics": {
+                "avg_snr_db": round(float(np.mean(step_avg_snr)), 2)
+                if step_avg_snr
+                else None,
+                "avg_snr_db_per_step": step_avg_snr,
+            },
+        },
+    )
+    if saved:
+        set_status(
+            redis_client,
+            simulation_id,
+            "completed",
+            1.0,
+            sweep_id=job_data.get("sweep_id"),
+        )
+    else:
+        set_status(
+            redis_client,
+            simulation_id,
+            "failed",
+            error="result_save_failed",
+            sweep_id=job_data.get("sweep_id"),
+        )
+    return saved
 
 
 def main():
     """메인 워커 루프"""
     logger.info("Channel Generator Worker started")
-    logger.info(f"Listening on queue: {CHANNEL_QUEUE}")
-
-    while True:
-        try:
-            result = redis_client.brpop(CHANNEL_QUEUE, timeout=1)
-
-            if result:
-                queue_name, job_json = result
-                job_data = json.loads(job_json)
-
-                logger.info(
-                    f"Received channel job: {job_data.get('simulation_id', 'unknown')}"
-                )
-
-                success = process_channel_generation(job_data)
-
-                if success:
-                    logger.info(f"Channel generation completed")
-                else:
-                    logger.error(f"Channel generation failed")
-
-            time.sleep(0.1)
 
-        except KeyboardInterrupt:
-            logger.info("Worker stopped by user")
-            break
-        except Exception as e:
-            logger.error(f"Error in worker loop: {str(e)}")
-            time.sleep(1)
+    WorkerRuntime(redis_client, CHANNEL_QUEUE, process_channel_generation, "Channel Generator").run()
 
 
 if __name__ == "__main__":
@@ -5,13 +5,16 @@ PDP (Power Delay Profile) Interpolator Worker
 """
 
 import redis
-import json
-import time
 import logging
 import os
 import numpy as np
 from datetime import datetime
 
+from scenario_generator import expand_scenario
+from status_index import set_status
+from task_queue import get_queue
+from worker_runtime import WorkerRuntime
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -39,7 +42,9 @@ except Exception as e:
     logger.error(f"Failed to connect to Redis: {str(e)}")
     exit(1)
 
-def interpolate_pdp(user_positions, time_steps):
+monitor_update_queue = get_queue(redis_client, MONITOR_UPDATE_QUEUE)
+
+def interpolate_pdp(user_positions, time_steps, rng=np.random):
     """
     PDP 보간 처리
     시간에 따른 사용자 위치 변화를 고려한 전력 지연 프로파일 계산
@@ -60,7 +65,7 @@ def interpolate_pdp(user_positions, time_steps):
             # PDP 계산 (실제로는 채널 응답으로부터 계산하지만 여기서는 간소화)
             num_delays = 10
             delays = np.linspace(0, 1000, num_delays)  # 0-1000 ns
-            powers = np.exp(-delays / 200) * (1 + 0.1 * np.random.randn(num_delays))
+            powers = np.exp(-delays / 200) * (1 + 0.1 * rng.standard_normal(num_delays))
             
             time_pdp.append({
                 'user_id': user['user_id'],
@@ -80,7 +85,7 @@ def interpolate_pdp(user_positions, time_steps):
 def process_pdp_interpolation(job_data):
     """PDP 보간 처리"""
     simulation_id = job_data['simulation_id']
-    scenario = job_data['scenario']
+    scenario = expand_scenario(job_data['scenario'])
     
     logger.info(f"Processing PDP interpolation for simulation {simulation_id}")
     
@@ -88,7 +93,8 @@ def process_pdp_interpolation(job_data):
     time_steps = min(scenario['simulation_config']['total_steps'], 100)  # 샘플에서는 최대 100 스텝
     
     # PDP 보간 수행
-    pdp_profiles = interpolate_pdp(users, time_steps)
+    rng = np.random.default_rng(job_data.get('seed'))
+    pdp_profiles = interpolate_pdp(users, time_steps, rng)
     
     logger.info(f"Generated PDP profiles for {len(users)} users over {time_steps} time steps")
     
@@ -115,40 +121,21 @@ def process_pdp_interpolation(job_data):
         }
     }
     
-    redis_client.lpush(MONITOR_UPDATE_QUEUE, json.dumps(monitor_update))
+    pipe = redis_client.pipeline(transaction=False)
+    monitor_update_queue.push(monitor_update, pipe=pipe)
+    set_status(
+        redis_client, simulation_id, pdp_status='completed',
+        sweep_id=job_data.get('sweep_id'), pipe=pipe
+    )
+    pipe.execute()
     
     return True
 
 def main():
     """메인 워커 루프"""
     logger.info("PDP Interpolator Worker started")
-    logger.info(f"Listening on queue: {PDP_QUEUE}")
-    
-    while True:
-        try:
-            result = redis_client.brpop(PDP_QUEUE, timeout=1)
-            
-            if result:
-                queue_name, job_json = result
-                job_data = json.loads(job_json)
-                
-                logger.info(f"Received PDP job: {job_data.get('simulation_id', 'unknown')}")
-                
-                success = process_pdp_interpolation(job_data)
-                
-                if success:
-                    logger.info(f"PDP interpolation completed")
-                else:
-                    logger.error(f"PDP interpolation failed")
-            
-            time.sleep(0.1)
-            
-        except KeyboardInterrupt:
-            logger.info("Worker stopped by user")
-            break
-        except Exception as e:
-            logger.error(f"Error in worker loop: {str(e)}")
-            time.sleep(1)
+
+    WorkerRuntime(redis_client, PDP_QUEUE, process_pdp_interpolation, "PDP Interpolator").run()
 
 if __name__ == '__main__':
     main()
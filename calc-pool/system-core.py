@@ -5,13 +5,22 @@ System Core Worker
 """
 
 import redis
+import hashlib
 import json
 import time
 import logging
 import os
 import requests
+import threading
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 
+from scenario_generator import scenario_num_users
+from status_index import set_status
+from task_queue import get_queue
+from worker_runtime import WorkerRuntime
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +33,22 @@ REDIS_HOST = os.getenv('REDIS_HOST', 'redis-service.queue-system.svc.cluster.loc
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
 STORAGE_SERVICE_URL = "http://storage-service.storage-pool.svc.cluster.local:8080"
 
+# 시나리오 캐시 설정
+SCENARIO_CACHE_SIZE = int(os.getenv('SCENARIO_CACHE_SIZE', 64))
+SCENARIO_CACHE_TTL = float(os.getenv('SCENARIO_CACHE_TTL', 5))  # 재검증 없이 사용하는 시간 (초)
+SCENARIO_CACHE_STATS_KEY = "stats:scenario_cache"
+
+# 결과 캐시 (동일 시나리오 + seed + 모델 버전의 결과 재사용)
+RESULT_CACHE_STATS_KEY = "stats:result_cache"
+# 채널/PDP 모델 구현이 바뀌면 올려서 이전 결과가 재사용되지 않도록 함
+MODEL_VERSION = os.getenv('MODEL_VERSION', 'umi-los-rayleigh-v1')
+# 시나리오 내용 해시에서 제외할 메타데이터 필드
+SCENARIO_VOLATILE_FIELDS = ('scenario_id', 'name', 'created_at')
+
+# Channel 큐가 이 길이 이상이면 새 시뮬레이션 분배 보류
+# (작업이 simulation_queue에 남아 있어야 우선순위/공정 스케줄링이 적용됨)
+MAX_DOWNSTREAM_DEPTH = int(os.getenv('MAX_DOWNSTREAM_DEPTH', 20))
+
 # Queue 이름
 SIMULATION_QUEUE = "simulation_queue"
 CHANNEL_QUEUE = "channel_queue"
@@ -42,26 +67,131 @@ except Exception as e:
     logger.error(f"Failed to connect to Redis: {str(e)}")
     exit(1)
 
+channel_queue = get_queue(redis_client, CHANNEL_QUEUE)
+pdp_queue = get_queue(redis_client, PDP_QUEUE)
+
+# Storage 연결 재사용 (Keep-Alive 커넥션 풀)
+http_session = requests.Session()
+http_session.mount(
+    'http://',
+    HTTPAdapter(pool_connections=4, pool_maxsize=16)
+)
+
+class ScenarioCache:
+    """
+    파싱된 시나리오의 LRU 캐시
+    ETag / Last-Modified를 함께 저장해 Storage에 조건부 GET으로 재검증
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scenario_id):
+        with self._lock:
+            entry = self._entries.get(scenario_id)
+            if entry is not None:
+                self._entries.move_to_end(scenario_id)
+            return entry
+
+    def put(self, scenario_id, scenario, content_hash, etag, last_modified):
+        """항목 저장, 제거된(evicted) 항목 수 반환"""
+        with self._lock:
+            self._entries[scenario_id] = {
+                'scenario': scenario,
+                'content_hash': content_hash,
+                'etag': etag,
+                'last_modified': last_modified,
+                'validated_at': time.monotonic()
+            }
+            self._entries.move_to_end(scenario_id)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def touch(self, scenario_id):
+        """재검증 성공 시 검증 시각 갱신"""
+        with self._lock:
+            entry = self._entries.get(scenario_id)
+            if entry is not None:
+                entry['validated_at'] = time.monotonic()
+
+scenario_cache = ScenarioCache(SCENARIO_CACHE_SIZE)
+
+def record_cache_stat(stats_key=SCENARIO_CACHE_STATS_KEY, **counters):
+    """캐시 hit/miss 카운터를 Redis에 누적 (모니터링용)"""
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for name, amount in counters.items():
+            pipe.hincrby(stats_key, name, amount)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record cache stats: {str(e)}")
+
+def scenario_content_hash(scenario):
+    """메타데이터를 제외한 시나리오 내용의 SHA-256"""
+    content = {
+        key: value for key, value in scenario.items()
+        if key not in SCENARIO_VOLATILE_FIELDS
+    }
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
 def get_scenario(scenario_id):
-    """Storage에서 시나리오 데이터 로드"""
+    """
+    Storage에서 시나리오 데이터 로드 (LRU 캐시 + 조건부 GET)
+    (scenario, content_hash) 반환, 실패 시 (None, None)
+    """
+    entry = scenario_cache.get(scenario_id)
+
+    # TTL 이내의 항목은 재검증 없이 사용
+    if entry and time.monotonic() - entry['validated_at'] < SCENARIO_CACHE_TTL:
+        record_cache_stat(hits=1)
+        return entry['scenario'], entry['content_hash']
+
+    headers = {}
+    if entry:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
     try:
-        response = requests.get(
+        response = http_session.get(
             f"{STORAGE_SERVICE_URL}/scenarios/{scenario_id}",
+            headers=headers,
             timeout=5
         )
-        if response.status_code == 200:
-            return response.json()
+        if response.status_code == 304 and entry:
+            scenario_cache.touch(scenario_id)
+            record_cache_stat(hits=1, revalidations=1)
+            return entry['scenario'], entry['content_hash']
+        elif response.status_code == 200:
+            scenario = response.json()
+            content_hash = scenario_content_hash(scenario)
+            evicted = scenario_cache.put(
+                scenario_id,
+                scenario,
+                content_hash,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
+            record_cache_stat(misses=1, evictions=evicted)
+            return scenario, content_hash
         else:
             logger.error(f"Failed to load scenario: {response.text}")
-            return None
+            return None, None
     except Exception as e:
         logger.error(f"Error loading scenario: {str(e)}")
-        return None
+        return None, None
 
 def save_result(simulation_id, result_data):
     """결과를 Storage에 저장"""
     try:
-        response = requests.post(
+        response = http_session.post(
             f"{STORAGE_SERVICE_URL}/results/{simulation_id}",
             json=result_data,
             timeout=5
@@ -71,92 +201,159 @@ def save_result(simulation_id, result_data):
         logger.error(f"Error saving result: {str(e)}")
         return False
 
+def result_cache_key(content_hash, seed):
+    """시나리오 내용 + seed + 모델 버전으로 결과 캐시 키 생성"""
+    key_source = json.dumps({
+        'scenario': content_hash,
+        'seed': seed,
+        'model_version': MODEL_VERSION
+    }, sort_keys=True)
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+def lookup_cached_result(cache_key):
+    """캐시 키에 해당하는 완료된 결과의 simulation_id 조회 (없으면 None)"""
+    try:
+        response = http_session.get(
+            f"{STORAGE_SERVICE_URL}/cache/{cache_key}",
+            timeout=5
+        )
+        if response.status_code == 200:
+            return response.json().get('simulation_id')
+    except Exception as e:
+        logger.warning(f"Result cache lookup failed: {str(e)}")
+    return None
+
+def downstream_ready():
+    """하위 큐에 여유가 있는지 확인"""
+    return channel_queue.length() < MAX_DOWNSTREAM_DEPTH
+
 def process_simulation(job_data):
     """시뮬레이션 처리"""
     simulation_id = job_data['simulation_id']
     scenario_id = job_data['scenario_id']
+    sweep_id = job_data.get('sweep_id')
     
-    logger.info(f"Processing simulation {simulation_id} with scenario {scenario_id}")
+    logger.info(
+        f"Processing simulation {simulation_id} with scenario {scenario_id} "
+        f"(priority={job_data.get('priority')}, submitter={job_data.get('submitter')})"
+    )
     
     # 1. 시나리오 로드
-    scenario = get_scenario(scenario_id)
+    scenario, content_hash = get_scenario(scenario_id)
     if not scenario:
         logger.error(f"Scenario {scenario_id} not found")
+        set_status(
+            redis_client, simulation_id, 'failed',
+            error='scenario_not_found', sweep_id=sweep_id
+        )
         return False
     
-    num_users = len(scenario['users'])
+    # 절차적 시나리오는 전개하지 않고 그대로 작업에 넣음 (Calc 워커가 직접 전개)
+    num_users = scenario_num_users(scenario)
     num_steps = scenario['simulation_config']['total_steps']
     
     logger.info(f"Simulation config: {num_users} users, {num_steps} time steps")
     
-    # 2. Channel Generation 작업 큐에 추가
+    # 2. 결과 캐시 확인 (seed가 고정된 실행만 재현 가능하므로 캐시 대상)
+    seed = job_data.get('seed')
+    cache_key = result_cache_key(content_hash, seed) if seed is not None else None
+    
+    if cache_key is None:
+        record_cache_stat(RESULT_CACHE_STATS_KEY, uncacheable=1)
+    elif not job_data.get('use_cache', True):
+        record_cache_stat(RESULT_CACHE_STATS_KEY, bypassed=1)
+    else:
+        cached_simulation_id = lookup_cached_result(cache_key)
+        if cached_simulation_id:
+            record_cache_stat(RESULT_CACHE_STATS_KEY, hits=1)
+            logger.info(
+                f"Result cache hit for {simulation_id}: "
+                f"reusing {cached_simulation_id}"
+            )
+            # 채널/PDP 작업 없이 캐시된 결과에 연결
+            # (결과 문서를 먼저 저장, completed 이벤트를 받은 클라이언트가 바로 결과를 조회할 수 있도록)
+            saved = save_result(simulation_id, {
+                'simulation_id': simulation_id,
+                'scenario_id': scenario_id,
+                'status': 'completed',
+                'progress': 1.0,
+                'cached_from': cached_simulation_id,
+                'cache_key': cache_key,
+                'seed': seed,
+                'start_time': datetime.now().isoformat(),
+                'end_time': datetime.now().isoformat(),
+                'num_users': num_users,
+                'num_steps': num_steps
+            })
+            if saved:
+                set_status(
+                    redis_client, simulation_id, 'completed', 1.0,
+                    cached_from=cached_simulation_id, sweep_id=sweep_id
+                )
+            else:
+                set_status(
+                    redis_client, simulation_id, 'failed',
+                    error='result_save_failed', sweep_id=sweep_id
+                )
+            return saved
+        record_cache_stat(RESULT_CACHE_STATS_KEY, misses=1)
+    
+    # 3. 초기 결과 저장 (진행 상태 추적용)
+    # 하위 작업을 넣기 전에 기록 (빠른 워커가 먼저 completed / failed를 쓴 뒤
+    # processing으로 덮어써지지 않도록)
+    initial_result = {
+        'simulation_id': simulation_id,
+        'scenario_id': scenario_id,
+        'status': 'processing',
+        'start_time': datetime.now().isoformat(),
+        'progress': 0.0,
+        'seed': seed,
+        'cache_key': cache_key,
+        'num_users': num_users,
+        'num_steps': num_steps
+    }
+    
+    save_result(simulation_id, initial_result)
+    set_status(redis_client, simulation_id, 'processing', 0.0, sweep_id=sweep_id)
+    
+    # 4. Channel Generation 작업 큐에 추가
     channel_job = {
         'job_type': 'channel_generation',
         'simulation_id': simulation_id,
         'scenario': scenario,
+        'seed': seed,
+        'cache_key': cache_key,
+        'sweep_id': sweep_id,
         'timestamp': datetime.now().isoformat()
     }
-    redis_client.lpush(CHANNEL_QUEUE, json.dumps(channel_job))
+    channel_queue.push(channel_job)
     logger.info(f"Enqueued channel generation job for {simulation_id}")
     
-    # 3. PDP Interpolation 작업 큐에 추가
+    # 5. PDP Interpolation 작업 큐에 추가
     pdp_job = {
         'job_type': 'pdp_interpolation',
         'simulation_id': simulation_id,
         'scenario': scenario,
+        'seed': seed,
+        'sweep_id': sweep_id,
         'timestamp': datetime.now().isoformat()
     }
-    redis_client.lpush(PDP_QUEUE, json.dumps(pdp_job))
+    pdp_queue.push(pdp_job)
     logger.info(f"Enqueued PDP interpolation job for {simulation_id}")
     
-    # 4. 초기 결과 저장 (진행 상태 추적용)
-    initial_result = {
-        'simulation_id': simulation_id,
-        'scenario_id': scenario_id,
-        'status': 'processing',
-        'start_time': datetime.now().isoformat(),
-        'progress': 0.0,
-        'num_users': num_users,
-        'num_steps': num_steps
-    }
-    
-    save_result(simulation_id, initial_result)
-    
     return True
 
 def main():
     """메인 워커 루프"""
     logger.info("System Core Worker started")
-    logger.info(f"Listening on queue: {SIMULATION_QUEUE}")
-    
-    while True:
-        try:
-            # BRPOP: Blocking Right POP (타임아웃 1초)
-            result = redis_client.brpop(SIMULATION_QUEUE, timeout=1)
-            
-            if result:
-                queue_name, job_json = result
-                job_data = json.loads(job_json)
-                
-                logger.info(f"Received job: {job_data.get('simulation_id', 'unknown')}")
-                
-                # 작업 처리
-                success = process_simulation(job_data)
-                
-                if success:
-                    logger.info(f"Job completed successfully")
-                else:
-                    logger.error(f"Job failed")
-            
-            # CPU 사용량 제한
-            time.sleep(0.1)
-            
-        except KeyboardInterrupt:
-            logger.info("Worker stopped by user")
-            break
-        except Exception as e:
-            logger.error(f"Error in worker loop: {str(e)}")
-            time.sleep(1)
+
+    WorkerRuntime(
+        redis_client,
+        SIMULATION_QUEUE,
+        process_simulation,
+        "System Core",
+        dispatch_ready=downstream_ready,
+    ).run()
 
 if __name__ == '__main__':
     main()
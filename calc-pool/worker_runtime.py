@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Calc Pool Worker Runtime
+System Core / Channel Generator / PDP Interpolator 워커가 공유하는 큐 소비 루프
+"""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import redis
+
+from task_queue import (
+    QUEUE_CLAIM_IDLE_MS,
+    WORKER_HEARTBEAT_INTERVAL,
+    default_consumer_name,
+    get_queue,
+    record_heartbeat,
+    remove_heartbeat,
+)
+
+logger = logging.getLogger(__name__)
+
+# 런타임 설정 (환경변수)
+WORKER_BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", 10))  # 한 번에 가져올 최대 작업 수
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", 1))  # 프로세스 내 동시 처리 수
+WORKER_BLOCK_TIMEOUT = int(os.getenv("WORKER_BLOCK_TIMEOUT", 1))  # 큐가 비었을 때 대기 (초)
+WORKER_MAX_ERROR_BACKOFF = float(os.getenv("WORKER_MAX_ERROR_BACKOFF", 30))
+
+
+class WorkerRuntime:
+    """
+    작업 큐 소비 런타임 (task_queue의 List / Streams 백엔드 공용)
+
+    - 큐에 작업이 쌓여 있으면 한 번의 왕복으로 최대 min(batch_size, 빈 슬롯 수)개를 가져옴
+    - 큐가 비었을 때만 블로킹 대기 (고정 sleep 없음)
+    - ThreadPoolExecutor로 concurrency개 작업을 동시에 처리
+    - 처리가 끝난 작업은 ACK (Streams 백엔드), 처리 중인 작업은 주기적으로 touch
+    - 주기적으로 heartbeat(동시 처리 한도, 처리 중 작업 수)를 기록해 API Gateway가
+      처리 용량을 알 수 있게 함
+    - SIGTERM/SIGINT 수신 시 새 작업을 받지 않고, 처리 중인 작업은 마치고,
+      아직 시작하지 않은 작업은 큐에 되돌린 후 종료
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        queue_name,
+        handler,
+        name,
+        batch_size=WORKER_BATCH_SIZE,
+        concurrency=WORKER_CONCURRENCY,
+        block_timeout=WORKER_BLOCK_TIMEOUT,
+        dispatch_ready=None,
+    ):
+        self.redis = redis_client
+        self.queue = get_queue(redis_client, queue_name)
+        self.queue_name = queue_name
+        self.handler = handler
+        self.name = name
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.block_timeout = block_timeout
+        self.dispatch_ready = dispatch_ready  # False를 반환하면 새 작업 수신 보류
+        self.worker_id = default_consumer_name()
+        self._stopping = threading.Event()
+
+    def stop(self, signum=None, frame=None):
+        """종료 요청 (시그널 핸들러 겸용)"""
+        if not self._stopping.is_set():
+            logger.info(f"{self.name} worker shutting down (signal={signum})")
+        self._stopping.set()
+
+    def run_job(self, handle, job_json):
+        """단일 작업 처리 후 ACK (실패한 작업도 재시도하지 않음)"""
+        try:
+            return self.process(job_json)
+        finally:
+            try:
+                self.queue.ack([handle])
+            except redis.RedisError as e:
+                logger.error(f"Failed to ack job on {self.queue_name}: {str(e)}")
+
+    def process(self, job_json):
+        """작업 파싱 및 핸들러 호출"""
+        try:
+            job_data = json.loads(job_json)
+        except ValueError as e:
+            logger.error(f"Discarding malformed job: {str(e)}")
+            return False
+
+        logger.info(
+            f"Received {self.name} job: {job_data.get('simulation_id', 'unknown')}"
+        )
+
+        try:
+            success = self.handler(job_data)
+        except Exception as e:
+            logger.error(f"Error processing {self.name} job: {str(e)}")
+            success = False
+
+        if success:
+            logger.info(f"{self.name} job completed")
+        else:
+            logger.error(f"{self.name} job failed")
+        return success
+
+    def run(self):
+        """메인 워커 루프"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        logger.info(
+            f"Listening on queue: {self.queue_name} "
+            f"(backend={self.queue.backend}, batch_size={self.batch_size}, "
+            f"concurrency={self.concurrency})"
+        )
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix=self.name
+        )
+        pending = {}  # {future: (handle, job_json)}
+        error_backoff = 1.0
+        touch_interval = QUEUE_CLAIM_IDLE_MS / 1000 / 3
+        last_touch = time.monotonic()
+        last_heartbeat = 0.0
+
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() - last_heartbeat >= WORKER_HEARTBEAT_INTERVAL:
+                    record_heartbeat(
+                        self.redis,
+                        self.queue_name,
+                        self.worker_id,
+                        self.concurrency,
+                        min(len(pending), self.concurrency),
+                    )
+                    last_heartbeat = time.monotonic()
+
+                # 오래 걸리는 작업이 다른 컨슈머에게 회수되지 않도록 idle 시간 갱신
+                if pending and time.monotonic() - last_touch >= touch_interval:
+                    self.queue.touch([handle for handle, _ in pending.values()])
+                    last_touch = time.monotonic()
+
+                # 동시성 한도만큼 처리 중이면 하나가 끝날 때까지 대기
+                if len(pending) >= self.concurrency:
+                    done, _ = wait(
+                        pending, timeout=self.block_timeout, return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        pending.pop(future)
+                    continue
+
+                # 하위 단계가 밀려 있으면 새 작업을 가져오지 않고 대기
+                if self.dispatch_ready and not self.dispatch_ready():
+                    self._stopping.wait(self.block_timeout)
+                    continue
+
+                # 비어 있는 슬롯 수만큼만 가져옴 (실행하지 못할 작업을 잡아 두지 않도록:
+                # 다른 레플리카가 가져갈 수 있고, 적체가 큐 길이에 그대로 보임)
+                free_slots = self.concurrency - len(pending)
+                entries = self.queue.pop_batch(
+                    min(self.batch_size, free_slots), self.block_timeout
+                )
+                error_backoff = 1.0
+            except redis.RedisError as e:
+                logger.error(f"Error in worker loop: {str(e)}")
+                self._stopping.wait(error_backoff)
+                error_backoff = min(error_backoff * 2, WORKER_MAX_ERROR_BACKOFF)
+                continue
+
+            for handle, job_json in entries:
+                future = executor.submit(self.run_job, handle, job_json)
+                pending[future] = (handle, job_json)
+
+            for future in [f for f in pending if f.done()]:
+                pending.pop(future)
+
+        # 시작하지 않은 작업은 큐에 반환, 처리 중인 작업은 완료까지 대기
+        unstarted = [entry for future, entry in pending.items() if future.cancel()]
+        try:
+            self.queue.requeue(unstarted)
+            if unstarted:
+                logger.info(
+                    f"Returned {len(unstarted)} unstarted jobs to {self.queue_name}"
+                )
+        except redis.RedisError as e:
+            logger.error(f"Failed to requeue {len(unstarted)} jobs: {str(e)}")
+
+        executor.shutdown(wait=True)
+        try:
+            remove_heartbeat(self.redis, self.queue_name, self.worker_id)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to remove heartbeat: {str(e)}")
+        logger.info(f"{self.name} worker stopped")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Scenario Generator
+NumPy 기반 시나리오 사용자 / 기지국 일괄 생성 + 절차적(procedural) 시나리오 전개
+
+- 사용자 위치 / 속도 / 단말 종류를 seed가 주어진 Generator로 배열 단위 생성
+  (같은 seed, 같은 파라미터면 같은 시나리오)
+- 기지국은 육각 격자(hex grid) 배치, 사이트 수는 임의 (영역을 고르게 채우는 간격을 탐색)
+- 절차적 시나리오는 parameters(seed 포함) + generator + overrides만 저장하고
+  users / base_stations는 사용하는 쪽(Scenario Pool, Calc 워커)이 expand_scenario로 직접 생성
+"""
+
+import math
+
+import numpy as np
+
+DEVICE_TYPES = ("smartphone", "tablet", "laptop")
+
+# 절차적 시나리오 생성기 이름 (생성 방식이 바뀌면 새 이름을 추가해서 기존 시나리오가 그대로 재현되도록 함)
+PROCEDURAL_GENERATOR = "uniform-hex-v1"
+
+# overrides로 바꿀 수 있는 사용자 필드
+USER_OVERRIDE_FIELDS = ("position", "velocity", "device_type")
+
+# 사용자 높이 범위 (사람 높이), 속도 범위 (m/s)
+USER_HEIGHT_RANGE = (1.5, 2.0)
+USER_SPEED_RANGE = (-5.0, 5.0)
+
+# 기지국 공통 설정
+BS_HEIGHT = 25.0
+BS_FREQUENCY = 3.5e9   # 3.5 GHz
+BS_BANDWIDTH = 100e6   # 100 MHz
+BS_TX_POWER = 43       # dBm
+
+
+def make_rng(seed):
+    """seed 기반 Generator"""
+    return np.random.default_rng(seed)
+
+
+def generate_user_arrays(num_users, area_size, rng):
+    """
+    사용자 배열 생성
+    {"positions": (N, 3), "velocities": (N, 3), "device_types": (N,) DEVICE_TYPES 인덱스}
+    """
+    low = (0.0, 0.0, USER_HEIGHT_RANGE[0])
+    high = (float(area_size[0]), float(area_size[1]), USER_HEIGHT_RANGE[1])
+    positions = rng.uniform(low, high, size=(num_users, 3))
+    velocities = np.zeros((num_users, 3))
+    velocities[:, :2] = rng.uniform(*USER_SPEED_RANGE, size=(num_users, 2))
+    device_types = rng.integers(0, len(DEVICE_TYPES), size=num_users)
+    return {"positions": positions, "velocities": velocities, "device_types": device_types}
+
+
+def users_from_arrays(arrays):
+    """사용자 배열 -> 시나리오 JSON 사용자 목록"""
+    positions = arrays["positions"].tolist()
+    velocities = arrays["velocities"].tolist()
+    device_types = arrays["device_types"].tolist()
+    return [
+        {
+            "user_id": f"user_{i:04d}",
+            "position": {"x": position[0], "y": position[1], "z": position[2]},
+            "velocity": {"x": velocity[0], "y": velocity[1], "z": velocity[2]},
+            "device_type": DEVICE_TYPES[device_type]
+        }
+        for i, (position, velocity, device_type) in enumerate(zip(positions, velocities, device_types))
+    ]
+
+
+def generate_user_positions(num_users, area_size, rng):
+    """사용자 초기 위치 / 속도 / 단말 종류 생성"""
+    return users_from_arrays(generate_user_arrays(num_users, area_size, rng))
+
+
+def hex_grid(width, height, spacing):
+    """영역 중앙에 맞춘 육각 격자 점 (짝수 / 홀수 행을 서로 반대로 spacing / 4씩 이동), (N, 2)"""
+    row_spacing = spacing * math.sqrt(3) / 2
+    # 격자 칸(spacing x row_spacing)이 영역 안에 들어가는 수만큼만 배치 (사이트가 경계에 붙지 않도록)
+    num_rows = max(1, int(height // row_spacing))
+    num_cols = max(1, int(width // spacing))
+    ys = height / 2 + (np.arange(num_rows) - (num_rows - 1) / 2) * row_spacing
+    xs = width / 2 + (np.arange(num_cols) - (num_cols - 1) / 2) * spacing
+    shifts = np.where(np.arange(num_rows) % 2 == 1, spacing / 4, -spacing / 4) if num_rows > 1 else np.zeros(1)
+    grid_x = xs[None, :] + shifts[:, None]
+    grid_y = np.broadcast_to(ys[:, None], grid_x.shape)
+    points = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+    inside = (points[:, 0] >= 0) & (points[:, 0] <= width) & (points[:, 1] >= 0) & (points[:, 1] <= height)
+    return points[inside]
+
+
+def hex_site_positions(width, height, num_sites, iterations=50):
+    """
+    num_sites개 사이트의 육각 격자 배치, (num_sites, 2)
+    사이트가 num_sites개 이상 들어가는 가장 넓은 간격을 이분 탐색한 후
+    남는 사이트는 영역 중앙에서 먼 것부터 제외
+    """
+    if num_sites <= 0:
+        return np.empty((0, 2))
+    low = 1e-3 * max(width, height, 1.0)
+    high = 2.0 * max(width, height, 1.0)
+    for _ in range(iterations):
+        spacing = (low + high) / 2
+        if len(hex_grid(width, height, spacing)) >= num_sites:
+            low = spacing
+        else:
+            high = spacing
+    points = hex_grid(width, height, low)
+    if len(points) > num_sites:
+        distance = np.hypot(points[:, 0] - width / 2, points[:, 1] - height / 2)
+        points = points[np.sort(np.argsort(distance, kind="stable")[:num_sites])]
+    return points
+
+
+def generate_base_stations(area_size, num_bs=4):
+    """기지국 위치 생성 (육각 격자)"""
+    sites = hex_site_positions(float(area_size[0]), float(area_size[1]), num_bs)
+    return [
+        {
+            "bs_id": f"bs_{i:02d}",
+            "position": {"x": x, "y": y, "z": BS_HEIGHT},
+            "frequency": BS_FREQUENCY,
+            "bandwidth": BS_BANDWIDTH,
+            "tx_power": BS_TX_POWER
+        }
+        for i, (x, y) in enumerate(sites.tolist())
+    ]
+
+
+def is_procedural(scenario):
+    """users / base_stations 없이 생성기 정보만 있는 시나리오인지"""
+    return "generator" in scenario and "users" not in scenario
+
+
+def scenario_num_users(scenario):
+    """시나리오 사용자 수 (절차적 시나리오는 전개하지 않고 parameters에서)"""
+    if is_procedural(scenario):
+        return scenario["parameters"]["num_users"]
+    return len(scenario["users"])
+
+
+def user_index(user_id, num_users):
+    """user_0042 -> 42 (범위 밖이거나 형식이 다르면 ValueError)"""
+    prefix, _, number = user_id.partition("_")
+    if prefix != "user" or not number.isdigit() or int(number) >= num_users:
+        raise ValueError(f"Unknown user in overrides: {user_id}")
+    return int(number)
+
+
+def validate_overrides(parameters, overrides):
+    """
+    overrides 형식 확인
+    {"users": {user_id: {position / velocity / device_type}}, "base_stations": [기지국, ...]}
+    """
+    if not isinstance(overrides, dict) or not isinstance(overrides.get("users") or {}, dict):
+        raise ValueError("overrides must be an object and overrides.users a map of user_id to fields")
+    unknown = set(overrides) - {"users", "base_stations"}
+    if unknown:
+        raise ValueError(f"Unknown overrides: {sorted(unknown)}")
+    for user_id, fields in (overrides.get("users") or {}).items():
+        user_index(user_id, parameters["num_users"])
+        if not isinstance(fields, dict) or set(fields) - set(USER_OVERRIDE_FIELDS):
+            raise ValueError(f"Invalid override for {user_id}: fields must be {list(USER_OVERRIDE_FIELDS)}")
+        if "device_type" in fields and fields["device_type"] not in DEVICE_TYPES:
+            raise ValueError(f"Unknown device_type for {user_id}: {fields['device_type']}")
+    base_stations = overrides.get("base_stations")
+    if base_stations is not None and (
+        not isinstance(base_stations, list) or not all("bs_id" in bs and "position" in bs for bs in base_stations)
+    ):
+        raise ValueError("base_stations override must be a list of base stations with bs_id and position")
+
+
+def apply_overrides(users, base_stations, overrides):
+    """생성한 users / base_stations에 overrides 반영, (users, base_stations) 반환"""
+    for user_id, fields in (overrides.get("users") or {}).items():
+        user = users[user_index(user_id, len(users))]
+        for name, value in fields.items():
+            if isinstance(value, dict):
+                user[name].update(value)
+            else:
+                user[name] = value
+    if overrides.get("base_stations") is not None:
+        base_stations = [dict(bs) for bs in overrides["base_stations"]]
+    return users, base_stations
+
+
+def expand_scenario(scenario):
+    """
+    절차적 시나리오 -> users / base_stations를 포함한 시나리오 (새 dict)
+    이미 전개된(users가 있는) 시나리오는 그대로 반환
+    """
+    if not is_procedural(scenario):
+        return scenario
+    generator = scenario["generator"]
+    if generator != PROCEDURAL_GENERATOR:
+        raise ValueError(f"Unsupported scenario generator: {generator}")
+
+    parameters = scenario["parameters"]
+    users = generate_user_positions(parameters["num_users"], parameters["area_size"], make_rng(parameters["seed"]))
+    base_stations = generate_base_stations(parameters["area_size"], parameters.get("num_base_stations", 4))
+    users, base_stations = apply_overrides(users, base_stations, scenario.get("overrides") or {})
+    return {**scenario, "users": users, "base_stations": base_stations}
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Simulation Status Index
+시뮬레이션별 상태 / 진행률을 Redis 해시에 보관하는 경량 인덱스
+
+- 키: simulation:status:{simulation_id} (해시, SIMULATION_STATUS_TTL 후 만료)
+- 필드: status, progress, updated_at (+ 단계별 보조 필드)
+- 워커가 상태가 바뀔 때마다 갱신하고, API Gateway는 결과 JSON을 읽지 않고
+  여러 시뮬레이션의 상태를 파이프라인 한 번으로 조회
+- 갱신 내용은 STATUS_EVENTS_CHANNEL로 publish (API Gateway SSE 스트림의 입력)
+"""
+
+import json
+import os
+from datetime import datetime
+
+STATUS_KEY_PREFIX = "simulation:status:"
+SIMULATION_STATUS_TTL = int(os.getenv("SIMULATION_STATUS_TTL", 7 * 24 * 3600))
+STATUS_EVENTS_CHANNEL = "simulation:events"
+
+# 더 이상 바뀌지 않는 상태
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def status_key(simulation_id):
+    return f"{STATUS_KEY_PREFIX}{simulation_id}"
+
+
+def set_status(redis_client, simulation_id, status=None, progress=None, pipe=None, **fields):
+    """
+    상태 갱신 (주어진 필드만 덮어씀) 및 변경 이벤트 publish
+    pipe가 주어지면 파이프라인에 적재만 함
+    (sweep에 속한 시뮬레이션은 sweep_id를 넘겨야 sweep 스트림에 전달됨)
+    """
+    mapping = {"updated_at": datetime.now().isoformat()}
+    if status is not None:
+        mapping["status"] = status
+    if progress is not None:
+        mapping["progress"] = round(float(progress), 4)
+    mapping.update({name: value for name, value in fields.items() if value is not None})
+
+    key = status_key(simulation_id)
+    target = pipe if pipe is not None else redis_client.pipeline(transaction=False)
+    target.hset(key, mapping=mapping)
+    target.expire(key, SIMULATION_STATUS_TTL)
+    target.publish(
+        STATUS_EVENTS_CHANNEL, json.dumps({"simulation_id": simulation_id, **mapping})
+    )
+    if pipe is None:
+        target.execute()
+
+
+def parse_status(fields):
+    """Redis 해시 값을 응답용 dict로 변환"""
+    status = dict(fields)
+    status["progress"] = float(status.get("progress", 0.0))
+    return status
+
+
+def get_statuses(redis_client, simulation_ids):
+    """
+    여러 시뮬레이션 상태를 한 번의 왕복으로 조회
+    {simulation_id: status dict 또는 None (인덱스에 없음)}
+    """
+    simulation_ids = list(simulation_ids)
+    if not simulation_ids:
+        return {}
+
+    pipe = redis_client.pipeline(transaction=False)
+    for simulation_id in simulation_ids:
+        pipe.hgetall(status_key(simulation_id))
+    results = pipe.execute()
+
+    return {
+        simulation_id: parse_status(fields) if fields else None
+        for simulation_id, fields in zip(simulation_ids, results)
+    }
@@ -0,0 +1,749 @@
+#!/usr/bin/env python3
+"""
+Task Queue Layer
+Redis 기반 작업 큐 추상화 (List / Streams 백엔드)
+
+- list:   LPUSH / RPOP 기반 단순 큐 (기본값)
+- stream: Redis Streams + Consumer Group 기반 신뢰성 큐
+          (XREADGROUP 배치 수신, 명시적 ACK, 죽은 컨슈머의 pending 작업 회수, 스트림 트리밍)
+- fair:   우선순위 클래스 + 제출자별 라운드로빈 스케줄링 큐 (simulation_queue)
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# 큐 백엔드 설정 (환경변수)
+QUEUE_BACKEND = os.getenv("QUEUE_BACKEND", "list")  # list | stream
+QUEUE_CONSUMER_GROUP = os.getenv("QUEUE_CONSUMER_GROUP", "workers")
+QUEUE_CLAIM_IDLE_MS = int(os.getenv("QUEUE_CLAIM_IDLE_MS", 300000))  # 이 시간 이상 ACK 없는 작업 회수
+QUEUE_CLAIM_INTERVAL = float(os.getenv("QUEUE_CLAIM_INTERVAL", 30))  # 회수 검사 주기 (초)
+
+# 큐 텔레메트리 (enqueue/dequeue 카운터는 시간 버킷 단위, 대기 시간은 최근 샘플)
+QUEUE_STATS_BUCKET_SECONDS = int(os.getenv("QUEUE_STATS_BUCKET_SECONDS", 60))
+QUEUE_STATS_RETENTION = int(os.getenv("QUEUE_STATS_RETENTION", 3600))
+QUEUE_WAIT_SAMPLES = int(os.getenv("QUEUE_WAIT_SAMPLES", 1000))
+
+# 워커 heartbeat (처리 용량 집계용)
+WORKER_HEARTBEAT_INTERVAL = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", 5))
+WORKER_HEARTBEAT_TTL = float(os.getenv("WORKER_HEARTBEAT_TTL", 15))  # 이 시간 이상 갱신 없으면 제외
+
+JOB_FIELD = "job"
+
+# 우선순위 클래스 (높은 순서)
+PRIORITIES = ["interactive", "batch", "background"]
+DEFAULT_PRIORITY = "interactive"
+DEFAULT_SUBMITTER = "anonymous"
+
+# 공정 스케줄링을 적용하는 큐 (백엔드 설정과 무관하게 FairQueue 사용)
+FAIR_QUEUES = {"simulation_queue"}
+
+
+def default_consumer_name():
+    """컨슈머 이름 (Pod 이름 + PID)"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def encode_job(job):
+    """작업 직렬화 (대기 시간 측정용 enqueued_at 기록, 재적재된 작업은 기존 값 유지)"""
+    if "enqueued_at" in job:
+        return json.dumps(job)
+    return json.dumps({**job, "enqueued_at": time.time()})
+
+
+def enqueued_at(job_json):
+    """직렬화된 작업의 enqueue 시각 (없으면 None)"""
+    if not job_json:
+        return None
+    try:
+        return float(json.loads(job_json)["enqueued_at"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def stats_bucket(now=None):
+    return int((now or time.time()) // QUEUE_STATS_BUCKET_SECONDS)
+
+
+def queue_stats_key(name, bucket):
+    """시간 버킷별 enqueue/dequeue 카운터 해시 키"""
+    return f"stats:queue:{name}:{bucket}"
+
+
+def wait_samples_key(name):
+    """최근 작업 대기 시간 샘플 리스트 키"""
+    return f"stats:queue:{name}:wait"
+
+
+def record_enqueued(client, name, count):
+    """enqueue 카운터 증가 (client는 파이프라인이어도 됨)"""
+    key = queue_stats_key(name, stats_bucket())
+    client.hincrby(key, "enqueued", count)
+    client.expire(key, QUEUE_STATS_RETENTION)
+
+
+def record_dequeued(redis_client, name, entries):
+    """dequeue 카운터 증가 + 대기 시간 샘플 기록, entries를 그대로 반환"""
+    if not entries:
+        return entries
+
+    now = time.time()
+    waits = []
+    for _, job_json in entries:
+        at = enqueued_at(job_json)
+        if at is not None:
+            waits.append(round(max(0.0, now - at), 3))
+
+    key = queue_stats_key(name, stats_bucket(now))
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hincrby(key, "dequeued", len(entries))
+    pipe.expire(key, QUEUE_STATS_RETENTION)
+    if waits:
+        pipe.lpush(wait_samples_key(name), *waits)
+        pipe.ltrim(wait_samples_key(name), 0, QUEUE_WAIT_SAMPLES - 1)
+    try:
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to record queue stats for {name}: {str(e)}")
+    return entries
+
+
+class ListQueue:
+    """
+    Redis List 큐
+    pop 시점에 작업이 큐에서 제거되므로 ACK가 필요 없음 (크래시 시 유실 가능)
+    """
+
+    backend = "list"
+
+    def __init__(self, redis_client, name):
+        self.redis = redis_client
+        self.name = name
+
+    def push(self, job, pipe=None):
+        """작업 추가 (pipe가 주어지면 파이프라인에 적재만 함)"""
+        self.push_many([job], pipe=pipe)
+
+    def push_many(self, jobs, pipe=None):
+        """여러 작업을 한 번의 왕복으로 추가"""
+        if not jobs:
+            return
+        target = self.redis.pipeline(transaction=False) if pipe is None else pipe
+        target.lpush(self.name, *[encode_job(job) for job in jobs])
+        record_enqueued(target, self.name, len(jobs))
+        if pipe is None:
+            target.execute()
+
+    def pop_batch(self, max_jobs, block_timeout):
+        """
+        최대 max_jobs개 작업 수신, [(handle, job_json), ...] 반환
+        작업이 쌓여 있으면 RPOP 한 번으로 가져오고, 비었을 때만 BRPOP으로 대기
+        """
+        jobs = self.redis.rpop(self.name, max_jobs)
+        if jobs:
+            return record_dequeued(
+                self.redis, self.name, [(None, job_json) for job_json in jobs]
+            )
+
+        result = self.redis.brpop(self.name, timeout=block_timeout)
+        if result:
+            queue_name, job_json = result
+            return record_dequeued(self.redis, self.name, [(None, job_json)])
+        return []
+
+    def ack(self, handles):
+        """List 백엔드는 pop 시 이미 제거됨"""
+
+    def touch(self, handles):
+        """List 백엔드는 처리 중 상태를 추적하지 않음"""
+
+    def requeue(self, entries):
+        """시작하지 않은 작업을 pop 위치로 되돌림 (순서 유지)"""
+        if entries:
+            self.redis.rpush(self.name, *reversed([job_json for _, job_json in entries]))
+
+    def length(self):
+        """대기 중인 작업 수"""
+        return self.redis.llen(self.name)
+
+    def telemetry_commands(self, pipe):
+        """텔레메트리 조회 명령을 파이프라인에 적재 (parse_telemetry와 짝)"""
+        pipe.llen(self.name)
+        pipe.lindex(self.name, -1)  # 가장 오래된 작업 (RPOP 위치)
+
+    def parse_telemetry(self, results):
+        """파이프라인 결과 이터레이터에서 자기 몫을 읽어 해석"""
+        waiting = next(results)
+        return {
+            "waiting": waiting,
+            "in_flight": None,
+            "oldest_enqueued_at": enqueued_at(next(results)),
+        }
+
+
+class StreamQueue:
+    """
+    Redis Streams + Consumer Group 큐
+    ACK 전까지 작업이 컨슈머의 pending 목록(PEL)에 남아 크래시 시에도 유실되지 않음
+    (ACK한 작업은 XDEL로 지우므로 길이 제한(MAXLEN) 트리밍 없이 미완료 작업만 남음,
+    MAXLEN은 처리하지 않은 작업까지 잘라낼 수 있어 사용하지 않음)
+    """
+
+    backend = "stream"
+
+    def __init__(
+        self,
+        redis_client,
+        name,
+        group=QUEUE_CONSUMER_GROUP,
+        consumer=None,
+        claim_idle_ms=QUEUE_CLAIM_IDLE_MS,
+    ):
+        self.redis = redis_client
+        self.name = name
+        self.group = group
+        self.consumer = consumer or default_consumer_name()
+        self.claim_idle_ms = claim_idle_ms
+        self._group_ready = False
+        self._last_claim = 0.0
+        self._backlog_script = redis_client.register_script(STREAM_BACKLOG_SCRIPT)
+
+    def ensure_group(self):
+        """Consumer Group 생성 (스트림이 없으면 함께 생성)"""
+        if self._group_ready:
+            return
+        try:
+            self.redis.xgroup_create(self.name, self.group, id="0", mkstream=True)
+            logger.info(f"Created consumer group {self.group} on {self.name}")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def push(self, job, pipe=None):
+        """작업 추가"""
+        target = self.redis.pipeline(transaction=False) if pipe is None else pipe
+        target.xadd(self.name, {JOB_FIELD: encode_job(job)})
+        record_enqueued(target, self.name, 1)
+        if pipe is None:
+            target.execute()
+
+    def push_many(self, jobs, pipe=None):
+        """여러 작업을 한 번의 왕복으로 추가"""
+        if not jobs:
+            return
+        target = self.redis.pipeline(transaction=False) if pipe is None else pipe
+        for job in jobs:
+            self.push(job, pipe=target)
+        if pipe is None:
+            target.execute()
+
+    def _entries(self, messages):
+        return [
+            (entry_id, fields[JOB_FIELD])
+            for entry_id, fields in messages
+            if fields and JOB_FIELD in fields
+        ]
+
+    def reclaim(self, max_jobs):
+        """claim_idle_ms 이상 ACK되지 않은 다른 컨슈머의 작업 회수"""
+        result = self.redis.xautoclaim(
+            self.name,
+            self.group,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            start_id="0-0",
+            count=max_jobs,
+        )
+        # Redis 7: [next_start_id, messages, deleted_ids]
+        messages = result[1]
+        entries = self._entries(messages)
+        if entries:
+            logger.warning(
+                f"Reclaimed {len(entries)} stale jobs on {self.name} for {self.consumer}"
+            )
+        return entries
+
+    def pop_batch(self, max_jobs, block_timeout):
+        """
+        최대 max_jobs개 작업 수신, [(entry_id, job_json), ...] 반환
+        주기적으로 죽은 컨슈머의 pending 작업을 먼저 회수
+        """
+        self.ensure_group()
+
+        now = time.monotonic()
+        if now - self._last_claim >= QUEUE_CLAIM_INTERVAL:
+            self._last_claim = now
+            entries = self.reclaim(max_jobs)
+            if entries:
+                return record_dequeued(self.redis, self.name, entries)
+
+        response = self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.name: ">"},
+            count=max_jobs,
+            block=int(block_timeout * 1000),
+        )
+        if not response:
+            return []
+        stream_name, messages = response[0]
+        return record_dequeued(self.redis, self.name, self._entries(messages))
+
+    def ack(self, handles):
+        """처리 완료 ACK 후 스트림에서 삭제 (스트림에는 미완료 작업만 남음)"""
+        handles = [h for h in handles if h]
+        if handles:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.xack(self.name, self.group, *handles)
+            pipe.xdel(self.name, *handles)
+            pipe.execute()
+
+    def touch(self, handles):
+        """처리 중인 작업의 idle 시간 초기화 (오래 걸리는 작업이 회수되지 않도록)"""
+        handles = [h for h in handles if h]
+        if handles:
+            self.redis.xclaim(
+                self.name,
+                self.group,
+                self.consumer,
+                min_idle_time=0,
+                message_ids=handles,
+                justid=True,
+            )
+
+    def requeue(self, entries):
+        """
+        시작하지 않은 작업을 다른 컨슈머가 바로 받을 수 있도록 재등록
+        (스트림 끝에 다시 추가되므로 순서는 보장하지 않음)
+        """
+        if not entries:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        for entry_id, job_json in entries:
+            pipe.xadd(self.name, {JOB_FIELD: job_json})
+        handles = [entry_id for entry_id, _ in entries]
+        pipe.xack(self.name, self.group, *handles)
+        pipe.xdel(self.name, *handles)
+        pipe.execute()
+
+    def length(self):
+        """ACK되지 않은 작업 수 (대기 + 처리 중)"""
+        return self.redis.xlen(self.name)
+
+    def telemetry_commands(self, pipe):
+        """텔레메트리 조회 명령을 파이프라인에 적재 (parse_telemetry와 짝)"""
+        self._backlog_script(
+            keys=[self.name], args=[self.group, JOB_FIELD], client=pipe
+        )
+
+    def parse_telemetry(self, results):
+        """파이프라인 결과 이터레이터에서 자기 몫을 읽어 해석"""
+        waiting, in_flight, oldest = next(results)
+        return {
+            "waiting": waiting,
+            "in_flight": in_flight,
+            "oldest_enqueued_at": float(oldest) if oldest else None,
+        }
+
+
+# 스트림 대기 현황: {대기 작업 수, 처리 중(pending) 수, 가장 오래된 대기 작업의 enqueued_at}
+# ACK된 작업은 XDEL로 삭제되므로 대기 = XLEN - pending,
+# 가장 오래된 대기 작업은 그룹의 last-delivered-id 바로 다음 항목
+STREAM_BACKLOG_SCRIPT = """
+local groups = redis.pcall('XINFO', 'GROUPS', KEYS[1])
+if type(groups) ~= 'table' or groups['err'] then
+    return {0, 0, false}
+end
+for _, group in ipairs(groups) do
+    local info = {}
+    for i = 1, #group, 2 do
+        info[group[i]] = group[i + 1]
+    end
+    if info['name'] == ARGV[1] then
+        local pending = tonumber(info['pending'])
+        local waiting = redis.call('XLEN', KEYS[1]) - pending
+        local oldest = false
+        local entries = redis.call(
+            'XRANGE', KEYS[1], '(' .. info['last-delivered-id'], '+', 'COUNT', 1
+        )
+        if #entries > 0 then
+            local fields = entries[1][2]
+            for i = 1, #fields, 2 do
+                if fields[i] == ARGV[2] then
+                    local ok, job = pcall(cjson.decode, fields[i + 1])
+                    if ok and job['enqueued_at'] then
+                        oldest = tostring(job['enqueued_at'])
+                    end
+                end
+            end
+        end
+        return {waiting, pending, oldest}
+    end
+end
+return {redis.call('XLEN', KEYS[1]), 0, false}
+"""
+
+# 작업 추가: 제출자 큐에 넣고, 새로 활성화된 제출자는 라운드로빈 링 뒤에 추가
+FAIR_PUSH_SCRIPT = """
+local length = redis.call('LPUSH', KEYS[1], ARGV[1])
+if length == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[2])
+end
+redis.call('HINCRBY', KEYS[3], ARGV[3], 1)
+redis.call('LPUSH', KEYS[4], 1)
+redis.call('LTRIM', KEYS[4], 0, 0)
+return length
+"""
+
+# 작업 수신: 우선순위 순서대로, 같은 우선순위 안에서는 제출자를 돌아가며 하나씩 꺼냄
+FAIR_POP_SCRIPT = """
+local prefix = ARGV[1]
+local max_jobs = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local jobs = {}
+for i = 4, #ARGV do
+    local priority = ARGV[i]
+    local ring = prefix .. ':' .. priority .. ':ring'
+    while #jobs < max_jobs do
+        local submitter = redis.call('RPOPLPUSH', ring, ring)
+        if not submitter then
+            break
+        end
+        local queue = prefix .. ':' .. priority .. ':q:' .. submitter
+        local job = redis.call('RPOP', queue)
+        if job then
+            table.insert(jobs, job)
+            redis.call('HINCRBY', prefix .. ':depth', priority, -1)
+            redis.call('ZADD', prefix .. ':inflight', now, job)
+        end
+        if redis.call('LLEN', queue) == 0 then
+            redis.call('LREM', ring, 1, submitter)
+        end
+    end
+    if #jobs >= max_jobs then
+        break
+    end
+end
+return jobs
+"""
+
+# 처리 중 작업을 제출자 큐의 pop 위치로 반환 (다른 컨슈머가 먼저 반환했으면 무시)
+FAIR_RETURN_SCRIPT = """
+local prefix = ARGV[1]
+local returned = 0
+for i = 2, #ARGV do
+    local job = ARGV[i]
+    if redis.call('ZREM', prefix .. ':inflight', job) == 1 then
+        local data = cjson.decode(job)
+        local priority = data['priority'] or 'interactive'
+        local submitter = data['submitter'] or 'anonymous'
+        local queue = prefix .. ':' .. priority .. ':q:' .. submitter
+        if redis.call('RPUSH', queue, job) == 1 then
+            redis.call('LPUSH', prefix .. ':' .. priority .. ':ring', submitter)
+        end
+        redis.call('HINCRBY', prefix .. ':depth', priority, 1)
+        returned = returned + 1
+    end
+end
+if returned > 0 then
+    redis.call('LPUSH', prefix .. ':wakeup', 1)
+    redis.call('LTRIM', prefix .. ':wakeup', 0, 0)
+end
+return returned
+"""
+
+
+# 가장 오래된 대기 작업의 enqueued_at (모든 우선순위 / 제출자 큐의 pop 위치 중 최소)
+FAIR_OLDEST_SCRIPT = """
+local prefix = ARGV[1]
+local oldest = nil
+for i = 2, #ARGV do
+    local priority = ARGV[i]
+    for _, submitter in ipairs(redis.call('LRANGE', prefix .. ':' .. priority .. ':ring', 0, -1)) do
+        local job = redis.call('LINDEX', prefix .. ':' .. priority .. ':q:' .. submitter, -1)
+        if job then
+            local ok, data = pcall(cjson.decode, job)
+            local at = ok and tonumber(data['enqueued_at'])
+            if at and (oldest == nil or at < oldest) then
+                oldest = at
+            end
+        end
+    end
+end
+if oldest == nil then
+    return false
+end
+return tostring(oldest)
+"""
+
+
+class FairQueue:
+    """
+    우선순위 + 공정 스케줄링 큐
+
+    - 작업의 priority(interactive / batch / background)별로 엄격한 우선순위 적용
+    - 같은 우선순위 안에서는 submitter별 큐를 라운드로빈으로 순회
+      (한 사용자의 대량 sweep이 다른 사용자의 작업을 막지 않음)
+    - 수신한 작업은 ACK 전까지 inflight ZSET에 남아, 응답 없는 컨슈머의 작업은 회수됨
+    """
+
+    backend = "fair"
+
+    def __init__(self, redis_client, name, claim_idle_ms=QUEUE_CLAIM_IDLE_MS):
+        self.redis = redis_client
+        self.name = name
+        self.claim_idle_ms = claim_idle_ms
+        self.depth_key = f"{name}:depth"
+        self.inflight_key = f"{name}:inflight"
+        self.wakeup_key = f"{name}:wakeup"
+        self._push_script = redis_client.register_script(FAIR_PUSH_SCRIPT)
+        self._pop_script = redis_client.register_script(FAIR_POP_SCRIPT)
+        self._return_script = redis_client.register_script(FAIR_RETURN_SCRIPT)
+        self._oldest_script = redis_client.register_script(FAIR_OLDEST_SCRIPT)
+        self._last_claim = 0.0
+
+    @staticmethod
+    def normalize(job):
+        """작업에 priority / submitter 기본값 채우기"""
+        if job.get("priority") not in PRIORITIES:
+            job["priority"] = DEFAULT_PRIORITY
+        job["submitter"] = str(job.get("submitter") or DEFAULT_SUBMITTER)
+        return job
+
+    def push(self, job, pipe=None):
+        """작업 추가"""
+        job = self.normalize(job)
+        priority = job["priority"]
+        submitter = job["submitter"]
+        target = self.redis.pipeline(transaction=False) if pipe is None else pipe
+        self._push_script(
+            keys=[
+                f"{self.name}:{priority}:q:{submitter}",
+                f"{self.name}:{priority}:ring",
+                self.depth_key,
+                self.wakeup_key,
+            ],
+            args=[encode_job(job), submitter, priority],
+            client=target,
+        )
+        record_enqueued(target, self.name, 1)
+        if pipe is None:
+            target.execute()
+
+    def push_many(self, jobs, pipe=None):
+        """여러 작업을 한 번의 왕복으로 추가"""
+        if not jobs:
+            return
+        target = self.redis.pipeline(transaction=False) if pipe is None else pipe
+        for job in jobs:
+            self.push(job, pipe=target)
+        if pipe is None:
+            target.execute()
+
+    def _pop(self, max_jobs):
+        return self._pop_script(
+            args=[self.name, max_jobs, time.time(), *PRIORITIES]
+        )
+
+    def reclaim(self):
+        """claim_idle_ms 이상 touch/ACK되지 않은 처리 중 작업을 큐로 반환"""
+        deadline = time.time() - self.claim_idle_ms / 1000
+        stale = self.redis.zrangebyscore(self.inflight_key, "-inf", deadline)
+        if stale:
+            returned = self._return_script(args=[self.name, *stale])
+            if returned:
+                logger.warning(f"Reclaimed {returned} stale jobs on {self.name}")
+
+    def pop_batch(self, max_jobs, block_timeout):
+        """
+        최대 max_jobs개 작업 수신, [(handle, job_json), ...] 반환
+        큐가 비었을 때만 wakeup 신호를 BRPOP으로 대기
+        """
+        now = time.monotonic()
+        if now - self._last_claim >= QUEUE_CLAIM_INTERVAL:
+            self._last_claim = now
+            self.reclaim()
+
+        jobs = self._pop(max_jobs)
+        if not jobs and self.redis.brpop(self.wakeup_key, timeout=block_timeout):
+            jobs = self._pop(max_jobs)
+        return record_dequeued(
+            self.redis, self.name, [(job_json, job_json) for job_json in jobs]
+        )
+
+    def ack(self, handles):
+        """처리 완료된 작업을 inflight에서 제거"""
+        handles = [h for h in handles if h]
+        if handles:
+            self.redis.zrem(self.inflight_key, *handles)
+
+    def touch(self, handles):
+        """처리 중인 작업의 마지막 활동 시각 갱신"""
+        handles = [h for h in handles if h]
+        if handles:
+            now = time.time()
+            self.redis.zadd(
+                self.inflight_key, {handle: now for handle in handles}, xx=True
+            )
+
+    def requeue(self, entries):
+        """시작하지 않은 작업을 제출자 큐의 pop 위치로 반환"""
+        if entries:
+            self._return_script(
+                args=[self.name, *reversed([handle for handle, _ in entries])]
+            )
+
+    def depths(self):
+        """우선순위별 대기 작업 수"""
+        depth = self.redis.hgetall(self.depth_key)
+        return {priority: int(depth.get(priority, 0)) for priority in PRIORITIES}
+
+    def length(self):
+        """대기 중인 작업 수 (전체 우선순위 합)"""
+        return sum(self.depths().values())
+
+    def in_flight(self):
+        """처리 중인 작업 수"""
+        return self.redis.zcard(self.inflight_key)
+
+    def telemetry_commands(self, pipe):
+        """텔레메트리 조회 명령을 파이프라인에 적재 (parse_telemetry와 짝)"""
+        pipe.hgetall(self.depth_key)
+        pipe.zcard(self.inflight_key)
+        self._oldest_script(args=[self.name, *PRIORITIES], client=pipe)
+
+    def parse_telemetry(self, results):
+        """파이프라인 결과 이터레이터에서 자기 몫을 읽어 해석"""
+        depth = next(results)
+        by_priority = {priority: int(depth.get(priority, 0)) for priority in PRIORITIES}
+        in_flight = next(results)
+        oldest = next(results)
+        return {
+            "waiting": sum(by_priority.values()),
+            "by_priority": by_priority,
+            "in_flight": in_flight,
+            "oldest_enqueued_at": float(oldest) if oldest else None,
+        }
+
+
+def workers_key(queue_name):
+    """큐를 소비하는 워커 heartbeat 해시 키"""
+    return f"{queue_name}:workers"
+
+
+def record_heartbeat(redis_client, queue_name, worker, concurrency, busy):
+    """워커 heartbeat 기록 (동시 처리 한도, 처리 중 작업 수)"""
+    redis_client.hset(
+        workers_key(queue_name),
+        worker,
+        json.dumps({"concurrency": concurrency, "busy": busy, "heartbeat": time.time()}),
+    )
+
+
+def remove_heartbeat(redis_client, queue_name, worker):
+    """정상 종료한 워커 제거"""
+    redis_client.hdel(workers_key(queue_name), worker)
+
+
+def live_workers(heartbeats, now=None):
+    """
+    heartbeat 해시(HGETALL 결과)에서 WORKER_HEARTBEAT_TTL 안에 갱신된 워커만 반환
+    {worker: {"concurrency", "busy", "heartbeat"}}
+    """
+    now = now or time.time()
+    workers = {}
+    for worker, value in heartbeats.items():
+        try:
+            info = json.loads(value)
+        except ValueError:
+            continue
+        if now - info.get("heartbeat", 0) <= WORKER_HEARTBEAT_TTL:
+            workers[worker] = info
+    return workers
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def collect_telemetry(redis_client, queues):
+    """
+    큐별 텔레메트리를 파이프라인 한 번으로 수집
+    (대기/처리 중 작업 수, 가장 오래된 대기 작업 나이, enqueue/dequeue 속도,
+     대기 시간 p50/p95, 워커 종류별 처리 중 작업 수)
+    """
+    now = time.time()
+    bucket = stats_bucket(now)
+
+    pipe = redis_client.pipeline(transaction=False)
+    for queue in queues:
+        queue.telemetry_commands(pipe)
+        pipe.hgetall(queue_stats_key(queue.name, bucket - 1))
+        pipe.hgetall(queue_stats_key(queue.name, bucket))
+        pipe.lrange(wait_samples_key(queue.name), 0, -1)
+        pipe.hgetall(workers_key(queue.name))
+    results = iter(pipe.execute())
+
+    # 직전 버킷 전체 + 현재 버킷의 경과 시간 기준 초당 처리량
+    window = QUEUE_STATS_BUCKET_SECONDS + (now % QUEUE_STATS_BUCKET_SECONDS)
+
+    telemetry = {}
+    for queue in queues:
+        stats = queue.parse_telemetry(results)
+        previous, current = next(results), next(results)
+        waits = sorted(float(value) for value in next(results))
+        workers = live_workers(next(results), now)
+
+        oldest = stats.pop("oldest_enqueued_at")
+        busy = sum(worker.get("busy", 0) for worker in workers.values())
+        if stats["in_flight"] is None:
+            # List 백엔드는 처리 중 작업을 추적하지 않으므로 워커 heartbeat로 대체
+            stats["in_flight"] = busy
+        counts = {
+            name: int(previous.get(name, 0)) + int(current.get(name, 0))
+            for name in ("enqueued", "dequeued")
+        }
+        telemetry[queue.name] = {
+            "backend": queue.backend,
+            **stats,
+            "oldest_job_age_seconds": round(now - oldest, 3) if oldest else None,
+            "enqueue_rate_per_second": round(counts["enqueued"] / window, 4),
+            "dequeue_rate_per_second": round(counts["dequeued"] / window, 4),
+            "wait_seconds": {
+                "p50": percentile(waits, 0.5),
+                "p95": percentile(waits, 0.95),
+                "samples": len(waits),
+            },
+            "workers": {
+                "count": len(workers),
+                "slots": sum(worker.get("concurrency", 1) for worker in workers.values()),
+                "busy": busy,
+            },
+        }
+    return telemetry
+
+
+def get_queue(redis_client, name, backend=None):
+    """
+    큐 객체 생성
+    FAIR_QUEUES(simulation_queue)는 항상 FairQueue, 나머지 큐만 QUEUE_BACKEND(list | stream) 적용
+    """
+    if name in FAIR_QUEUES:
+        return FairQueue(redis_client, name)
+    backend = backend or QUEUE_BACKEND
+    if backend == "stream":
+        return StreamQueue(redis_client, name)
+    if backend == "list":
+        return ListQueue(redis_client, name)
+    raise ValueError(f"Unknown queue backend: {backend}")
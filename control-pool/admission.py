@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Admission Control
+API Gateway의 작업 제출 허용 여부 판단
+(큐 적체 / 워커 처리 용량 기반 backpressure + 클라이언트별 토큰 버킷)
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from task_queue import PRIORITIES, live_workers, workers_key
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트별 토큰 버킷 (Redis에 상태 보관, 게이트웨이 레플리카 간 공유)
+# KEYS[1]: 버킷 키, ARGV: rate(토큰/초), burst, cost
+# 반환: {허용 여부(1/0), 재시도까지 대기 시간(초, 문자열)}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+-- burst보다 큰 요청(sweep)은 버킷이 가득 찼을 때 허용하고 음수(빚)로 차감
+-- (이후 빚을 갚을 때까지 같은 클라이언트의 제출은 거부)
+local required = math.min(cost, burst)
+local allowed = 0
+local retry_after = 0
+if tokens >= required then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (required - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - math.min(tokens, 0)) / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass
+class AdmissionDecision:
+    """제출 허용 여부"""
+
+    admitted: bool
+    reason: str = None  # rate_limited | queue_full
+    retry_after: int = 0
+    detail: dict = None
+
+
+class AdmissionController:
+    """
+    작업 제출 허용 판단
+
+    - 요청 우선순위 이상의 backlog(intake 큐의 같거나 높은 우선순위 대기 수 + 처리 큐 대기 수)가
+      이미 budget에 도달했으면 거부
+      (낮은 우선순위 적체는 높은 우선순위 제출을 막지 않음, budget보다 큰 sweep도 한 번에 적재하고
+      초과분은 FairQueue 우선순위 스케줄링이 흡수)
+      budget = min_backlog + backlog_per_slot x 살아 있는 처리 워커 슬롯 수
+      우선순위별로 budget의 일부만 사용 (낮은 우선순위가 먼저 거부됨)
+    - Retry-After는 초과분이 현재 처리 용량으로 빠지는 데 걸리는 시간으로 추정
+    - 클라이언트별 토큰 버킷으로 제출 속도 제한 (작업 수만큼 토큰 차감)
+    - 큐 상태는 refresh_interval 동안 재사용 (요청마다 Redis 조회하지 않음)
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        queues,
+        intake_queue,
+        work_queue,
+        min_backlog=50,
+        backlog_per_slot=4,
+        job_seconds=60.0,
+        priority_share=None,
+        rate=5.0,
+        burst=20,
+        max_retry_after=300,
+        refresh_interval=0.5,
+    ):
+        self.redis = redis_client
+        self.queues = queues
+        self.intake_queue = intake_queue
+        self.work_queue = work_queue
+        self.min_backlog = min_backlog
+        self.backlog_per_slot = backlog_per_slot
+        self.job_seconds = job_seconds
+        self.priority_share = priority_share or {}
+        self.rate = rate
+        self.burst = burst
+        self.max_retry_after = max_retry_after
+        self.refresh_interval = refresh_interval
+
+        self._token_bucket = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._snapshot = None
+        self._snapshot_at = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """큐 적체 / 처리 용량 (refresh_interval 동안 캐시)"""
+        with self._lock:
+            if (
+                self._snapshot is not None
+                and time.monotonic() - self._snapshot_at < self.refresh_interval
+            ):
+                return self._snapshot
+
+        intake = self.queues[self.intake_queue]
+        if hasattr(intake, "depths"):
+            depths = intake.depths()
+        else:
+            depths = {PRIORITIES[0]: intake.length()}
+        work_backlog = self.queues[self.work_queue].length()
+        workers = live_workers(self.redis.hgetall(workers_key(self.work_queue)))
+        slots = sum(worker.get("concurrency", 1) for worker in workers.values())
+        snapshot = {
+            "backlog": sum(depths.values()) + work_backlog,
+            "intake_depths": depths,
+            "work_backlog": work_backlog,
+            "workers": len(workers),
+            "slots": slots,
+            "budget": self.min_backlog + self.backlog_per_slot * slots,
+        }
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._snapshot_at = time.monotonic()
+        return snapshot
+
+    @staticmethod
+    def backlog_for(snapshot, priority):
+        """priority 이상(같거나 높은 우선순위)의 intake 대기 수 + 처리 큐 대기 수"""
+        rank = PRIORITIES.index(priority) if priority in PRIORITIES else 0
+        ahead = sum(snapshot["intake_depths"].get(p, 0) for p in PRIORITIES[: rank + 1])
+        return ahead + snapshot["work_backlog"]
+
+    def estimate_retry_after(self, excess, slots):
+        """초과 backlog가 처리되는 데 걸리는 시간 (초)"""
+        if slots <= 0:
+            return self.max_retry_after
+        seconds = excess * self.job_seconds / slots
+        return max(1, min(self.max_retry_after, math.ceil(seconds)))
+
+    def check_rate(self, client_id, cost=1):
+        """클라이언트별 토큰 버킷 확인 (cost: 제출하는 작업 수)"""
+        allowed, retry_after = self._token_bucket(
+            keys=[f"ratelimit:{client_id}"], args=[self.rate, self.burst, cost]
+        )
+        return bool(allowed), max(1, math.ceil(float(retry_after)))
+
+    def check(self, client_id, priority, jobs=1):
+        """제출 허용 여부 판단 (jobs: 요청이 적재하는 작업 수, sweep은 전체 시뮬레이션 수)"""
+        snapshot = self.snapshot()
+        budget = int(snapshot["budget"] * self.priority_share.get(priority, 1.0))
+        backlog = self.backlog_for(snapshot, priority)
+        # backlog 확인을 먼저 해서 거부된 요청이 토큰을 쓰지 않도록 함
+        if backlog >= budget:
+            excess = backlog - budget + 1
+            return AdmissionDecision(
+                False,
+                "queue_full",
+                self.estimate_retry_after(excess, snapshot["slots"]),
+                {
+                    **snapshot,
+                    "priority_backlog": backlog,
+                    "priority_budget": budget,
+                    "jobs": jobs,
+                },
+            )
+
+        allowed, retry_after = self.check_rate(client_id, jobs)
+        if not allowed:
+            return AdmissionDecision(
+                False,
+                "rate_limited",
+                retry_after,
+                {"rate": self.rate, "burst": self.burst, "jobs": jobs},
+            )
+
+        # 캐시된 스냅샷에도 반영 (refresh_interval 안의 다음 요청이 방금 허용한 작업을 보도록)
+        with self._lock:
+            if self._snapshot is snapshot:
+                depths = snapshot["intake_depths"]
+                key = priority if priority in depths or priority in PRIORITIES else PRIORITIES[0]
+                depths[key] = depths.get(key, 0) + jobs
+                snapshot["backlog"] += jobs
+
+        return AdmissionDecision(True)
@@ -4,18 +4,43 @@ API Gateway
 모든 API 엔드포인트를 통합하고 WebSocket 프록시 역할 수행
 """
 
+import os
+
+# gevent 모드: 소켓 I/O를 협력형(비동기)으로 전환해 적은 스레드로 많은 동시 연결 처리
+# (다른 모듈을 import하기 전에 패치해야 함)
+SERVER_MODE = os.getenv("SERVER_MODE", "gevent")  # gevent | dev
+if SERVER_MODE == "gevent":
+    from gevent import monkey
+
+    monkey.patch_all()
+
+import itertools
 import json
 import logging
-import os
+import queue
+import time
 import uuid
+import zlib
 from datetime import datetime
 from pathlib import Path
 
 import redis
 import requests
-from flask import Flask, jsonify, redirect, request, send_from_directory
+from flask import Flask, Response, jsonify, redirect, request, send_from_directory
 from flask_cors import CORS
 
+from admission import AdmissionController
+from event_hub import EventHub
+from response_cache import ResponseCache
+from status_index import (
+    STATUS_EVENTS_CHANNEL,
+    TERMINAL_STATUSES,
+    get_statuses,
+    set_status,
+)
+from task_queue import DEFAULT_PRIORITY, PRIORITIES, collect_telemetry, get_queue
+from upstream import Upstream, UpstreamBusy
+
 app = Flask(__name__, static_folder=None)
 CORS(app)
 
@@ -40,6 +65,57 @@ MONITOR_SERVICE_URL = os.getenv(
     "MONITOR_SERVICE_URL", "http://monitor-service.monitor-pool.svc.cluster.local:8080"
 )
 
+# 업스트림 클라이언트 (공유 Keep-Alive 커넥션 풀 + 업스트림별 동시 요청 제한)
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 2))
+UPSTREAM_ACQUIRE_TIMEOUT = float(os.getenv("UPSTREAM_ACQUIRE_TIMEOUT", 2))
+
+scenario_service = Upstream(
+    "scenario",
+    SCENARIO_SERVICE_URL,
+    max_concurrency=int(os.getenv("SCENARIO_MAX_CONCURRENCY", 16)),
+    connect_timeout=UPSTREAM_CONNECT_TIMEOUT,
+    acquire_timeout=UPSTREAM_ACQUIRE_TIMEOUT,
+)
+storage_service = Upstream(
+    "storage",
+    STORAGE_SERVICE_URL,
+    max_concurrency=int(os.getenv("STORAGE_MAX_CONCURRENCY", 64)),
+    connect_timeout=UPSTREAM_CONNECT_TIMEOUT,
+    acquire_timeout=UPSTREAM_ACQUIRE_TIMEOUT,
+)
+monitor_service = Upstream(
+    "monitor",
+    MONITOR_SERVICE_URL,
+    max_concurrency=int(os.getenv("MONITOR_MAX_CONCURRENCY", 16)),
+    connect_timeout=UPSTREAM_CONNECT_TIMEOUT,
+    acquire_timeout=UPSTREAM_ACQUIRE_TIMEOUT,
+)
+upstreams = [scenario_service, storage_service, monitor_service]
+
+# gevent 서버 동시 연결 한도
+GATEWAY_MAX_CONNECTIONS = int(os.getenv("GATEWAY_MAX_CONNECTIONS", 1000))
+
+# 스트리밍 프록시 설정
+PROXY_CHUNK_SIZE = int(os.getenv("PROXY_CHUNK_SIZE", 64 * 1024))
+PROXY_GZIP_LEVEL = int(os.getenv("PROXY_GZIP_LEVEL", 6))
+PROXY_GZIP_MIN_SIZE = int(os.getenv("PROXY_GZIP_MIN_SIZE", 1024))
+# 클라이언트 요청에서 업스트림으로 전달할 헤더 (조건부 GET)
+PROXY_REQUEST_HEADERS = ("If-None-Match", "If-Modified-Since")
+# 업스트림 응답에서 클라이언트로 전달할 헤더
+PROXY_RESPONSE_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson")
+
+# 조회 전용 엔드포인트 응답 캐시 (라우트별 TTL, 초)
+response_cache = ResponseCache(
+    {
+        "scenario_templates": float(os.getenv("CACHE_TTL_SCENARIO_TEMPLATES", 300)),
+        "scenario_list": float(os.getenv("CACHE_TTL_SCENARIO_LIST", 5)),
+        "results_list": float(os.getenv("CACHE_TTL_RESULTS_LIST", 2)),
+        "monitor_stats": float(os.getenv("CACHE_TTL_MONITOR_STATS", 1)),
+    },
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256)),
+)
+
 # Redis 연결
 REDIS_HOST = os.getenv("REDIS_HOST", "redis-service.queue-system.svc.cluster.local")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
@@ -57,6 +133,204 @@ except Exception as e:
     logger.error(f"Failed to connect to Redis: {str(e)}")
 
 SIMULATION_QUEUE = "simulation_queue"
+QUEUE_NAMES = [SIMULATION_QUEUE, "channel_queue", "pdp_queue", "monitor_update_queue"]
+
+queues = {name: get_queue(redis_client, name) for name in QUEUE_NAMES}
+
+# 제출 허용 제어 (큐 적체 / 워커 용량 기반 backpressure + 클라이언트별 토큰 버킷)
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+admission = AdmissionController(
+    redis_client,
+    queues,
+    intake_queue=SIMULATION_QUEUE,
+    work_queue="channel_queue",
+    min_backlog=int(os.getenv("ADMISSION_MIN_BACKLOG", 50)),
+    backlog_per_slot=int(os.getenv("ADMISSION_BACKLOG_PER_SLOT", 4)),
+    job_seconds=float(os.getenv("ADMISSION_JOB_SECONDS", 60)),  # 채널 작업 평균 처리 시간
+    # 낮은 우선순위는 budget의 일부만 사용 (interactive용 여유 확보)
+    priority_share={"interactive": 1.0, "batch": 0.8, "background": 0.5},
+    rate=float(os.getenv("RATE_LIMIT_PER_SECOND", 5)),
+    burst=int(os.getenv("RATE_LIMIT_BURST", 20)),
+)
+
+# Parameter Sweep 설정
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", 50))  # 시나리오 생성/큐 적재 배치 크기
+MAX_SWEEP_POINTS = int(os.getenv("MAX_SWEEP_POINTS", 5000))
+SWEEP_TTL = int(os.getenv("SWEEP_TTL", 7 * 24 * 3600))  # sweep 메타데이터 보관 (초)
+
+# 일괄 상태 조회 한 번에 허용하는 시뮬레이션 수
+MAX_STATUS_BATCH = int(os.getenv("MAX_STATUS_BATCH", 1000))
+
+# 상태 이벤트 스트림 (SSE) 설정
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", 15))  # keep-alive 주석 전송 주기
+SSE_MAX_DURATION = float(os.getenv("SSE_MAX_DURATION", 3600))  # 이후 클라이언트가 재연결
+SSE_SWEEP_SUMMARY_INTERVAL = float(os.getenv("SSE_SWEEP_SUMMARY_INTERVAL", 1))
+
+event_hub = EventHub(redis_client, STATUS_EVENTS_CHANNEL)
+
+# ========== Error Handling ==========
+
+
+def error_response(context, error):
+    """라우트 예외를 JSON 에러 응답으로 변환 (업스트림 포화 시 503 + Retry-After)"""
+    if isinstance(error, UpstreamBusy):
+        response = jsonify({"error": str(error)})
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response, 503
+    logger.error(f"Error in {context}: {str(error)}")
+    return jsonify({"error": str(error)}), 500
+
+
+def admit(submitter, priority, jobs=1):
+    """제출 허용 여부 확인 (jobs: 적재할 작업 수), 거부 시 429 응답 반환 (허용이면 None)"""
+    if not ADMISSION_ENABLED:
+        return None
+
+    decision = admission.check(submitter, priority, jobs)
+    if decision.admitted:
+        return None
+
+    logger.warning(
+        f"Submission rejected for {submitter} ({decision.reason}, "
+        f"retry after {decision.retry_after}s)"
+    )
+    response = jsonify(
+        {
+            "error": "Too many requests"
+            if decision.reason == "rate_limited"
+            else "Simulation queue is over capacity",
+            "reason": decision.reason,
+            "retry_after": decision.retry_after,
+            "detail": decision.detail,
+        }
+    )
+    response.headers["Retry-After"] = str(decision.retry_after)
+    return response, 429
+
+
+# ========== Streaming Proxy ==========
+
+
+def client_accepts_gzip():
+    return "gzip" in request.accept_encodings
+
+
+def gzip_stream(chunks):
+    """청크 단위 gzip 압축 (메모리 사용량은 청크 크기로 제한)"""
+    compressor = zlib.compressobj(PROXY_GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def proxy_stream(upstream, path):
+    """
+    업스트림 응답을 파싱하지 않고 그대로 스트리밍 전달
+    - 상태 코드 / 주요 헤더 / 본문을 청크 단위로 전달
+    - 클라이언트가 gzip을 지원하면 업스트림 gzip은 그대로, 비압축 본문은 즉석 압축
+    - 본문이 없는 응답(HEAD / 204 / 304)은 업스트림을 바로 닫음
+      (WSGI 서버가 본문 iterator를 시작하지 않으므로 generator의 finally에 의존하지 않음)
+    """
+    headers = {
+        name: request.headers[name]
+        for name in PROXY_REQUEST_HEADERS
+        if name in request.headers
+    }
+    upstream_response = upstream.stream(
+        "GET", path, params=request.args, headers=headers
+    )
+
+    try:
+        response_headers = {
+            name: upstream_response.headers[name]
+            for name in PROXY_RESPONSE_HEADERS
+            if name in upstream_response.headers
+        }
+        response_headers["Vary"] = "Accept-Encoding"
+
+        upstream_encoding = upstream_response.headers.get("Content-Encoding")
+        content_length = upstream_response.headers.get("Content-Length")
+        content_type = upstream_response.headers.get("Content-Type", "")
+
+        if upstream_encoding == "gzip" and client_accepts_gzip():
+            # 이미 압축된 본문은 풀지 않고 전달
+            body = upstream_response.iter_raw(PROXY_CHUNK_SIZE)
+            response_headers["Content-Encoding"] = "gzip"
+            if content_length:
+                response_headers["Content-Length"] = content_length
+        else:
+            body = upstream_response.iter_decoded(PROXY_CHUNK_SIZE)
+            compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+            large_enough = (
+                content_length is None or int(content_length) >= PROXY_GZIP_MIN_SIZE
+            )
+            if client_accepts_gzip() and compressible and large_enough:
+                body = gzip_stream(body)
+                response_headers["Content-Encoding"] = "gzip"
+            elif content_length and not upstream_encoding:
+                response_headers["Content-Length"] = content_length
+    except Exception:
+        upstream_response.close()
+        raise
+
+    if request.method == "HEAD" or upstream_response.status_code in (204, 304):
+        upstream_response.close()
+        return Response(status=upstream_response.status_code, headers=response_headers)
+
+    def generate():
+        try:
+            yield from body
+        finally:
+            upstream_response.close()
+
+    response = Response(
+        generate(),
+        status=upstream_response.status_code,
+        headers=response_headers,
+        direct_passthrough=True,
+    )
+    # 본문 전송 전에 응답이 닫혀도 (iterator 미시작) 슬롯 반환
+    response.call_on_close(upstream_response.close)
+    return response
+
+
+def cached_proxy(route, upstream, path):
+    """
+    응답 캐시를 거치는 프록시
+    miss일 때만 업스트림을 호출하고, 본문은 바이트 그대로 저장/전달
+    (gzip 본문은 첫 요청 시 한 번만 압축해서 항목에 보관)
+    """
+    query = request.query_string.decode()
+
+    def fetch():
+        response = upstream.get(path, params=request.args)
+        headers = {
+            name: response.headers[name]
+            for name in PROXY_RESPONSE_HEADERS
+            if name in response.headers
+        }
+        return response.status_code, response.content, headers
+
+    entry = response_cache.get_or_fetch(route, query, fetch)
+
+    headers = {**entry.headers, "Vary": "Accept-Encoding"}
+    content_type = headers.get("Content-Type", "")
+    body = entry.body
+    if (
+        client_accepts_gzip()
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and len(body) >= PROXY_GZIP_MIN_SIZE
+    ):
+        if entry.gzip_body is None:
+            compressor = zlib.compressobj(PROXY_GZIP_LEVEL, zlib.DEFLATED, 31)
+            entry.gzip_body = compressor.compress(body) + compressor.flush()
+        body = entry.gzip_body
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(body, status=entry.status, headers=headers)
+
 
 # ========== Static File Serving ==========
 
@@ -89,6 +363,12 @@ def health_check():
             {
                 "status": "healthy",
                 "service": "api-gateway",
+                "mode": SERVER_MODE,
+                "upstreams": {
+                    upstream.name: upstream.stats() for upstream in upstreams
+                },
+                "response_cache": response_cache.stats(),
+                "event_hub": event_hub.stats(),
                 "timestamp": datetime.now().isoformat(),
             }
         ),
@@ -128,9 +408,8 @@ def create_scenario():
         data = request.get_json()
 
         # Scenario Service로 전달
-        response = requests.post(
-            f"{SCENARIO_SERVICE_URL}/generate", json=data, timeout=10
-        )
+        response = scenario_service.post("/generate", json=data, timeout=10)
+        response_cache.invalidate("scenario_list")
 
         return jsonify(response.json()), response.status_code
 
@@ -138,48 +417,58 @@ def create_scenario():
         logger.error(f"Scenario service error: {str(e)}")
         return jsonify({"error": f"Scenario service error: {str(e)}"}), 500
     except Exception as e:
-        logger.error(f"Error in create_scenario: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("create_scenario", e)
 
 
 @app.route("/api/scenario/templates", methods=["GET"])
 def get_scenario_templates():
     """시나리오 템플릿 목록"""
     try:
-        response = requests.get(f"{SCENARIO_SERVICE_URL}/templates", timeout=5)
-        return jsonify(response.json()), response.status_code
+        return cached_proxy("scenario_templates", scenario_service, "/templates")
+    except Exception as e:
+        return error_response("get_scenario_templates", e)
+
+
+@app.route("/api/scenario/jobs/<job_id>", methods=["GET"])
+def get_scenario_job(job_id):
+    """대규모 시나리오 생성 작업 상태 / 진행률"""
+    try:
+        return proxy_stream(scenario_service, f"/generate/jobs/{job_id}")
     except Exception as e:
-        logger.error(f"Error in get_scenario_templates: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("get_scenario_job", e)
 
 
 @app.route("/api/scenario/list", methods=["GET"])
 def list_scenarios():
     """시나리오 목록 조회"""
     try:
-        response = requests.get(f"{STORAGE_SERVICE_URL}/scenarios", timeout=5)
-        return jsonify(response.json()), response.status_code
+        return cached_proxy("scenario_list", storage_service, "/scenarios")
     except Exception as e:
-        logger.error(f"Error in list_scenarios: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("list_scenarios", e)
 
 
 @app.route("/api/scenario/<scenario_id>", methods=["GET"])
 def get_scenario(scenario_id):
     """특정 시나리오 조회"""
     try:
-        response = requests.get(
-            f"{STORAGE_SERVICE_URL}/scenarios/{scenario_id}", timeout=5
-        )
-        return jsonify(response.json()), response.status_code
+        return proxy_stream(storage_service, f"/scenarios/{scenario_id}")
     except Exception as e:
-        logger.error(f"Error in get_scenario: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("get_scenario", e)
 
 
 # ========== Simulation Control ==========
 
 
+def get_submitter(data):
+    """요청 제출자 식별 (body > X-Client-Id 헤더 > 클라이언트 IP)"""
+    return (
+        data.get("submitter")
+        or request.headers.get("X-Client-Id")
+        or request.remote_addr
+        or "anonymous"
+    )
+
+
 @app.route("/api/simulation/start", methods=["POST"])
 def start_simulation():
     """시뮬레이션 시작"""
@@ -190,6 +479,25 @@ def start_simulation():
         if not scenario_id:
             return jsonify({"error": "scenario_id is required"}), 400
 
+        # 우선순위 클래스 (interactive / batch / background)
+        priority = data.get("priority", DEFAULT_PRIORITY)
+        if priority not in PRIORITIES:
+            return (
+                jsonify({"error": f"priority must be one of {PRIORITIES}"}),
+                400,
+            )
+
+        # 제출자 (같은 우선순위 안에서 제출자 간 라운드로빈)
+        submitter = get_submitter(data)
+
+        rejected = admit(submitter, priority)
+        if rejected:
+            return rejected
+
+        # seed가 고정된 실행은 동일한 이전 결과를 재사용 (use_cache=false로 비활성화)
+        seed = data.get("seed")
+        use_cache = bool(data.get("use_cache", True))
+
         # 시뮬레이션 ID 생성
         simulation_id = f"sim_{uuid.uuid4().hex[:12]}"
 
@@ -197,12 +505,24 @@ def start_simulation():
         job_data = {
             "simulation_id": simulation_id,
             "scenario_id": scenario_id,
+            "priority": priority,
+            "submitter": submitter,
+            "seed": seed,
+            "use_cache": use_cache,
             "timestamp": datetime.now().isoformat(),
         }
 
-        redis_client.lpush(SIMULATION_QUEUE, json.dumps(job_data))
+        # 큐 적재와 상태 인덱스 등록을 한 번의 왕복으로
+        pipe = redis_client.pipeline(transaction=False)
+        queues[SIMULATION_QUEUE].push(job_data, pipe=pipe)
+        set_status(redis_client, simulation_id, "queued", 0.0, pipe=pipe)
+        pipe.execute()
+        response_cache.invalidate("results_list", "monitor_stats")
 
-        logger.info(f"Simulation started: {simulation_id} with scenario {scenario_id}")
+        logger.info(
+            f"Simulation started: {simulation_id} with scenario {scenario_id} "
+            f"(priority={priority}, submitter={submitter})"
+        )
 
         return (
             jsonify(
@@ -210,6 +530,7 @@ def start_simulation():
                     "status": "started",
                     "simulation_id": simulation_id,
                     "scenario_id": scenario_id,
+                    "priority": priority,
                     "message": "Simulation queued successfully",
                     "websocket_url": "ws://<host>:30082/",
                 }
@@ -218,18 +539,16 @@ def start_simulation():
         )
 
     except Exception as e:
-        logger.error(f"Error in start_simulation: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("start_simulation", e)
 
 
 @app.route("/api/simulation/status/<simulation_id>", methods=["GET"])
 def get_simulation_status(simulation_id):
-    """시뮬레이션 상태 조회"""
+    """시뮬레이션 상태 조회 (?fields=로 data에 포함할 결과 필드 지정)"""
     try:
         # Storage에서 결과 조회
-        response = requests.get(
-            f"{STORAGE_SERVICE_URL}/results/{simulation_id}", timeout=5
-        )
+        params = {"fields": request.args["fields"]} if "fields" in request.args else None
+        response = storage_service.get(f"/results/{simulation_id}", params=params)
 
         if response.status_code == 200:
             result_data = response.json()
@@ -259,8 +578,415 @@ def get_simulation_status(simulation_id):
             return jsonify(response.json()), response.status_code
 
     except Exception as e:
-        logger.error(f"Error in get_simulation_status: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("get_simulation_status", e)
+
+
+def fetch_simulation_statuses(simulation_ids):
+    """
+    시뮬레이션별 상태 / 진행률 조회 {simulation_id: {status, progress, ...}}
+    결과 JSON 대신 상태 인덱스(Redis)를 한 번의 왕복으로 조회
+    """
+    return {
+        simulation_id: status or {"status": "not_found", "progress": 0.0}
+        for simulation_id, status in get_statuses(redis_client, simulation_ids).items()
+    }
+
+
+@app.route("/api/simulation/statuses", methods=["GET", "POST"])
+def get_simulation_statuses():
+    """
+    여러 시뮬레이션 상태 일괄 조회
+    GET ?ids=sim_a,sim_b 또는 POST {"simulation_ids": [...]}
+    """
+    try:
+        if request.method == "POST":
+            simulation_ids = (request.get_json() or {}).get("simulation_ids", [])
+        else:
+            simulation_ids = [
+                simulation_id
+                for simulation_id in request.args.get("ids", "").split(",")
+                if simulation_id
+            ]
+
+        if not isinstance(simulation_ids, list) or not simulation_ids:
+            return jsonify({"error": "simulation_ids is required"}), 400
+        if len(simulation_ids) > MAX_STATUS_BATCH:
+            return (
+                jsonify(
+                    {"error": f"At most {MAX_STATUS_BATCH} simulation_ids per request"}
+                ),
+                400,
+            )
+
+        # 중복 제거 (요청 순서 유지)
+        statuses = fetch_simulation_statuses(dict.fromkeys(simulation_ids))
+        return (
+            jsonify(
+                {
+                    "statuses": statuses,
+                    "count": len(statuses),
+                    "timestamp": datetime.now().isoformat(),
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        return error_response("get_simulation_statuses", e)
+
+
+# ========== Parameter Sweep ==========
+
+
+def expand_grid(grid):
+    """파라미터 그리드를 모든 조합의 목록으로 전개"""
+    keys = sorted(grid)
+    for key in keys:
+        if not isinstance(grid[key], list) or not grid[key]:
+            raise ValueError(f"grid.{key} must be a non-empty list of values")
+    return [
+        dict(zip(keys, combination))
+        for combination in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def chunked(items, size):
+    """리스트를 size 크기의 조각으로 분할"""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+@app.route("/api/sweep/submit", methods=["POST"])
+def submit_sweep():
+    """
+    Parameter Sweep 일괄 제출
+    grid의 모든 조합으로 시나리오를 배치 생성하고, 시나리오 x seeds 시뮬레이션을
+    Redis 파이프라인으로 배치 적재
+    """
+    try:
+        data = request.get_json() or {}
+        grid = data.get("grid")
+        if not isinstance(grid, dict) or not grid:
+            return jsonify({"error": "grid is required"}), 400
+
+        base_params = data.get("base", {})
+        seeds = data.get("seeds") or [None]
+        priority = data.get("priority", "batch")
+        if priority not in PRIORITIES:
+            return (
+                jsonify({"error": f"priority must be one of {PRIORITIES}"}),
+                400,
+            )
+        submitter = get_submitter(data)
+        use_cache = bool(data.get("use_cache", True))
+
+        try:
+            combinations = expand_grid(grid)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        total_points = len(combinations) * len(seeds)
+        if total_points > MAX_SWEEP_POINTS:
+            return (
+                jsonify(
+                    {
+                        "error": f"Sweep has {total_points} points "
+                        f"(max {MAX_SWEEP_POINTS})"
+                    }
+                ),
+                400,
+            )
+
+        # sweep은 시뮬레이션 수만큼 제출 토큰을 차지 (큐 한도는 현재 backlog 기준, sweep 크기와 무관)
+        rejected = admit(submitter, priority, jobs=total_points)
+        if rejected:
+            return rejected
+
+        sweep_id = f"sweep_{uuid.uuid4().hex[:12]}"
+        sweep_name = data.get("name", sweep_id)
+        sweep_key = f"sweep:{sweep_id}"
+        simulations_key = f"{sweep_key}:simulations"
+
+        redis_client.hset(
+            sweep_key,
+            mapping={
+                "sweep_id": sweep_id,
+                "name": sweep_name,
+                "priority": priority,
+                "submitter": submitter,
+                "total": total_points,
+                "status": "submitting",
+                "created_at": datetime.now().isoformat(),
+            },
+        )
+        redis_client.expire(sweep_key, SWEEP_TTL)
+
+        submitted = 0
+        scenario_count = 0
+        for batch_index, batch in enumerate(chunked(combinations, SWEEP_BATCH_SIZE)):
+            # 1. 시나리오 배치 생성 (Scenario Service 한 번 호출)
+            offset = batch_index * SWEEP_BATCH_SIZE
+            param_sets = [
+                {**base_params, **params, "name": f"{sweep_name}_{offset + i:04d}"}
+                for i, params in enumerate(batch)
+            ]
+            try:
+                response = scenario_service.post(
+                    "/generate/batch", json={"scenarios": param_sets}, timeout=60
+                )
+                error = None if response.status_code == 201 else response.text
+            except (requests.exceptions.RequestException, UpstreamBusy) as e:
+                error = str(e)
+            if error is not None:
+                logger.error(f"Sweep {sweep_id} scenario batch failed: {error}")
+                redis_client.hset(sweep_key, "status", "partial")
+                return (
+                    jsonify(
+                        {
+                            "error": f"Scenario service error: {error}",
+                            "sweep_id": sweep_id,
+                            "submitted": submitted,
+                            "total": total_points,
+                        }
+                    ),
+                    502,
+                )
+
+            scenario_ids = response.json()["scenario_ids"]
+            scenario_count += len(scenario_ids)
+
+            # 2. 시나리오 x seed 시뮬레이션 작업을 파이프라인 한 번으로 적재
+            jobs = []
+            for scenario_id, params in zip(scenario_ids, batch):
+                for seed in seeds:
+                    jobs.append(
+                        {
+                            "simulation_id": f"sim_{uuid.uuid4().hex[:12]}",
+                            "scenario_id": scenario_id,
+                            "sweep_id": sweep_id,
+                            "seed": seed,
+                            "use_cache": use_cache,
+                            "parameters": params,
+                            "priority": priority,
+                            "submitter": submitter,
+                            "timestamp": datetime.now().isoformat(),
+                        }
+                    )
+
+            pipe = redis_client.pipeline(transaction=False)
+            queues[SIMULATION_QUEUE].push_many(jobs, pipe=pipe)
+            for job in jobs:
+                set_status(
+                    redis_client,
+                    job["simulation_id"],
+                    "queued",
+                    0.0,
+                    sweep_id=sweep_id,
+                    pipe=pipe,
+                )
+            pipe.rpush(simulations_key, *[job["simulation_id"] for job in jobs])
+            pipe.expire(simulations_key, SWEEP_TTL)
+            pipe.execute()
+            submitted += len(jobs)
+            response_cache.invalidate(
+                "scenario_list", "results_list", "monitor_stats"
+            )
+
+        redis_client.hset(sweep_key, "status", "submitted")
+        logger.info(
+            f"Sweep submitted: {sweep_id} ({scenario_count} scenarios, "
+            f"{submitted} simulations, priority={priority})"
+        )
+
+        return (
+            jsonify(
+                {
+                    "status": "submitted",
+                    "sweep_id": sweep_id,
+                    "scenarios": scenario_count,
+                    "simulations": submitted,
+                    "priority": priority,
+                    "status_url": f"/api/sweep/{sweep_id}",
+                }
+            ),
+            202,
+        )
+
+    except Exception as e:
+        return error_response("submit_sweep", e)
+
+
+def summarize_sweep(statuses):
+    """시뮬레이션별 상태를 sweep 단위로 집계"""
+    counts = {}
+    for status in statuses.values():
+        counts[status["status"]] = counts.get(status["status"], 0) + 1
+    progress = (
+        sum(status["progress"] for status in statuses.values()) / len(statuses)
+        if statuses
+        else 0.0
+    )
+    return {
+        "status": (
+            "completed"
+            if statuses and counts.get("completed", 0) == len(statuses)
+            else "running"
+        ),
+        "status_counts": counts,
+        "progress": round(progress, 4),
+    }
+
+
+@app.route("/api/sweep/<sweep_id>", methods=["GET"])
+def get_sweep_status(sweep_id):
+    """Sweep 집계 상태 조회 (?details=true면 시뮬레이션별 상태 포함)"""
+    try:
+        sweep_key = f"sweep:{sweep_id}"
+        sweep = redis_client.hgetall(sweep_key)
+        if not sweep:
+            return jsonify({"error": "Sweep not found"}), 404
+
+        simulation_ids = redis_client.lrange(f"{sweep_key}:simulations", 0, -1)
+        statuses = fetch_simulation_statuses(simulation_ids)
+
+        response = {
+            **sweep,
+            "total": int(sweep["total"]),
+            "submission_status": sweep["status"],
+            **summarize_sweep(statuses),
+            "timestamp": datetime.now().isoformat(),
+        }
+        if request.args.get("details", "").lower() in ("1", "true"):
+            response["simulations"] = statuses
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        return error_response("get_sweep_status", e)
+
+
+# ========== Status Event Streams (SSE) ==========
+
+
+def sse_message(event, data):
+    """SSE 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def event_stream(key, initial_events, on_event):
+    """
+    SSE 응답 생성
+    - 구독을 먼저 등록한 후 현재 상태(initial_events)를 전송해 그 사이 이벤트 유실 방지
+    - on_event(event)는 (전송할 메시지 목록, 스트림 종료 여부)를 반환
+    - 이벤트가 없으면 heartbeat 주석 전송, SSE_MAX_DURATION 후 종료 (클라이언트 재연결)
+    - 구독은 본문 전송을 시작할 때 등록 (HEAD 등 iterator가 시작되지 않는 응답은 구독하지 않음)
+    """
+
+    def generate():
+        listener = event_hub.subscribe(key)
+        try:
+            messages, finished = initial_events()
+            yield from messages
+            deadline = time.monotonic() + SSE_MAX_DURATION
+            while not finished and time.monotonic() < deadline:
+                try:
+                    event = listener.get(timeout=SSE_HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                messages, finished = on_event(event)
+                yield from messages
+        finally:
+            event_hub.unsubscribe(key, listener)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/simulation/<simulation_id>/events", methods=["GET"])
+def stream_simulation_status(simulation_id):
+    """시뮬레이션 상태 이벤트 스트림 (완료/실패 시 종료)"""
+
+    def initial_events():
+        status = get_statuses(redis_client, [simulation_id])[simulation_id]
+        if status is None:
+            status = {"status": "not_found", "progress": 0.0}
+        return (
+            [sse_message("status", {"simulation_id": simulation_id, **status})],
+            status["status"] in TERMINAL_STATUSES,
+        )
+
+    def on_event(event):
+        return (
+            [sse_message("status", event)],
+            event.get("status") in TERMINAL_STATUSES,
+        )
+
+    try:
+        return event_stream(("simulation", simulation_id), initial_events, on_event)
+    except Exception as e:
+        return error_response("stream_simulation_status", e)
+
+
+@app.route("/api/sweep/<sweep_id>/events", methods=["GET"])
+def stream_sweep_status(sweep_id):
+    """
+    Sweep 상태 이벤트 스트림
+    - simulation: 시뮬레이션 상태가 바뀔 때 (단계별 진행률 이벤트는 전달하지 않음)
+    - sweep: 집계 상태 (최대 SSE_SWEEP_SUMMARY_INTERVAL마다)
+    - 모든 시뮬레이션이 완료/실패하면 종료
+    """
+    try:
+        sweep_key = f"sweep:{sweep_id}"
+        if not redis_client.exists(sweep_key):
+            return jsonify({"error": "Sweep not found"}), 404
+
+        statuses = {}
+        last_summary = [0.0]
+
+        def summary_message():
+            last_summary[0] = time.monotonic()
+            return sse_message(
+                "sweep",
+                {
+                    "sweep_id": sweep_id,
+                    **summarize_sweep(statuses),
+                    "timestamp": datetime.now().isoformat(),
+                },
+            )
+
+        def finished():
+            return bool(statuses) and all(
+                status["status"] in TERMINAL_STATUSES for status in statuses.values()
+            )
+
+        def initial_events():
+            simulation_ids = redis_client.lrange(f"{sweep_key}:simulations", 0, -1)
+            statuses.update(fetch_simulation_statuses(simulation_ids))
+            return [summary_message()], finished()
+
+        def on_event(event):
+            simulation_id = event["simulation_id"]
+            status = statuses.setdefault(
+                simulation_id, {"status": "queued", "progress": 0.0}
+            )
+            status.update(event)
+
+            messages = []
+            if "status" in event:
+                messages.append(sse_message("simulation", event))
+            done = finished()
+            if done or time.monotonic() - last_summary[0] >= SSE_SWEEP_SUMMARY_INTERVAL:
+                messages.append(summary_message())
+            return messages, done
+
+        return event_stream(("sweep", sweep_id), initial_events, on_event)
+
+    except Exception as e:
+        return error_response("stream_sweep_status", e)
 
 
 # ========== Results Management ==========
@@ -270,24 +996,39 @@ def get_simulation_status(simulation_id):
 def list_results():
     """결과 목록 조회"""
     try:
-        response = requests.get(f"{STORAGE_SERVICE_URL}/results", timeout=5)
-        return jsonify(response.json()), response.status_code
+        return cached_proxy("results_list", storage_service, "/results")
     except Exception as e:
-        logger.error(f"Error in list_results: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("list_results", e)
 
 
 @app.route("/api/results/<simulation_id>", methods=["GET"])
 def get_result(simulation_id):
     """특정 결과 조회"""
     try:
-        response = requests.get(
-            f"{STORAGE_SERVICE_URL}/results/{simulation_id}", timeout=5
-        )
-        return jsonify(response.json()), response.status_code
+        return proxy_stream(storage_service, f"/results/{simulation_id}")
     except Exception as e:
-        logger.error(f"Error in get_result: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("get_result", e)
+
+
+@app.route("/api/results/<simulation_id>/timeseries", methods=["GET"])
+def get_result_timeseries(simulation_id):
+    """단계별 시계열 범위 조회 (?start=&end=&columns=&users=)"""
+    try:
+        return proxy_stream(storage_service, f"/timeseries/{simulation_id}")
+    except Exception as e:
+        return error_response("get_result_timeseries", e)
+
+
+@app.route("/api/results/<simulation_id>/timeseries/aggregate", methods=["GET"])
+def get_result_timeseries_aggregate(simulation_id):
+    """
+    시계열 구간별 집계 (Storage에서 계산, 차트에 필요한 점만 전달)
+    ?column=&start=&end=&bucket=&points=&stats=mean,max,p95&group_by=user&groups=
+    """
+    try:
+        return proxy_stream(storage_service, f"/timeseries/{simulation_id}/aggregate")
+    except Exception as e:
+        return error_response("get_result_timeseries_aggregate", e)
 
 
 # ========== Monitoring ==========
@@ -297,11 +1038,9 @@ def get_result(simulation_id):
 def get_monitor_stats():
     """모니터링 통계"""
     try:
-        response = requests.get(f"{MONITOR_SERVICE_URL}/stats", timeout=5)
-        return jsonify(response.json()), response.status_code
+        return cached_proxy("monitor_stats", monitor_service, "/stats")
     except Exception as e:
-        logger.error(f"Error in get_monitor_stats: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("get_monitor_stats", e)
 
 
 # ========== Queue Statistics ==========
@@ -309,22 +1048,65 @@ def get_monitor_stats():
 
 @app.route("/api/queue/stats", methods=["GET"])
 def get_queue_stats():
-    """큐 통계"""
+    """
+    큐 통계 (파이프라인 한 번으로 수집)
+    큐별 대기 수 / 처리 속도 / 가장 오래된 작업 나이 / 대기 시간 p50·p95 / 워커 현황
+    """
     try:
+        telemetry = collect_telemetry(redis_client, list(queues.values()))
+        stats = {name: queue_stats["waiting"] for name, queue_stats in telemetry.items()}
+        stats["simulation_queue_by_priority"] = telemetry[SIMULATION_QUEUE]["by_priority"]
+        stats["backend"] = queues["channel_queue"].backend
+        stats["queues"] = telemetry
+        stats["admission"] = {"enabled": ADMISSION_ENABLED, **admission.snapshot()}
+        stats["timestamp"] = datetime.now().isoformat()
+        return jsonify(stats), 200
+    except Exception as e:
+        return error_response("get_queue_stats", e)
+
+
+# ========== Cache Statistics ==========
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def get_cache_stats():
+    """캐시 통계 (System Core 시나리오 캐시 / 결과 캐시 hit/miss)"""
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hgetall("stats:scenario_cache")
+        pipe.hgetall("stats:result_cache")
+        scenario_cache, result_cache = pipe.execute()
+
+        lookups = int(result_cache.get("hits", 0)) + int(result_cache.get("misses", 0))
         stats = {
-            "simulation_queue": redis_client.llen(SIMULATION_QUEUE),
-            "channel_queue": redis_client.llen("channel_queue"),
-            "pdp_queue": redis_client.llen("pdp_queue"),
-            "monitor_update_queue": redis_client.llen("monitor_update_queue"),
+            "scenario_cache": {
+                name: int(value) for name, value in scenario_cache.items()
+            },
+            "result_cache": {
+                name: int(value) for name, value in result_cache.items()
+            },
+            "result_cache_hit_rate": (
+                round(int(result_cache.get("hits", 0)) / lookups, 4) if lookups else 0.0
+            ),
             "timestamp": datetime.now().isoformat(),
         }
         return jsonify(stats), 200
     except Exception as e:
-        logger.error(f"Error in get_queue_stats: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return error_response("get_cache_stats", e)
 
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8080))
-    logger.info(f"Starting API Gateway on port {port}")
-    app.run(host="0.0.0.0", port=port, debug=False)
+    logger.info(f"Starting API Gateway on port {port} (mode={SERVER_MODE})")
+
+    if SERVER_MODE == "gevent":
+        from gevent.pool import Pool
+        from gevent.pywsgi import WSGIServer
+
+        # 요청마다 greenlet 하나, 업스트림 대기 중에도 다른 요청 처리
+        server = WSGIServer(
+            ("0.0.0.0", port), app, spawn=Pool(GATEWAY_MAX_CONNECTIONS), log=None
+        )
+        server.serve_forever()
+    else:
+        app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Event Hub
+Redis pub/sub 상태 이벤트를 API Gateway의 SSE 구독자에게 분배
+(Redis 구독 연결은 프로세스당 하나, 구독자는 로컬 큐로 수신)
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+
+import redis
+
+from status_index import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def is_terminal(event):
+    return event.get("status") in TERMINAL_STATUSES
+
+
+class ListenerQueue(queue.Queue):
+    """
+    구독자 큐
+    가득 차면 가장 오래된 비종료 이벤트(진행률 등)를 버리고 새 이벤트를 넣음
+    완료/실패 이벤트는 버리지 않음 (큐에 종료 이벤트만 남았으면 maxsize를 넘겨서라도 보관)
+    """
+
+    def offer(self, event):
+        """이벤트 추가, 대신 버린 이벤트 수 반환 (0 또는 1)"""
+        with self.mutex:
+            dropped = 0
+            if 0 < self.maxsize <= len(self.queue):
+                for index, queued in enumerate(self.queue):
+                    if not is_terminal(queued):
+                        del self.queue[index]
+                        dropped = 1
+                        break
+                else:
+                    if not is_terminal(event):
+                        return 1
+            self.queue.append(event)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+            return dropped
+
+
+class EventHub:
+    """
+    상태 이벤트 분배기
+
+    - 백그라운드 스레드(gevent 모드에서는 greenlet) 하나가 채널을 구독
+    - 이벤트의 simulation_id / sweep_id로 구독자를 찾아 각자의 큐에 전달
+    - 큐가 가득 찬(읽지 않는) 구독자는 오래된 진행률 이벤트부터 버림 (다른 구독자를 막지 않음,
+      완료/실패 이벤트는 항상 전달되어 스트림이 끝나지 않는 일이 없음)
+    - Redis 연결이 끊기면 지수 백오프로 재구독
+    """
+
+    def __init__(self, redis_client, channel, queue_size=256, max_backoff=30.0):
+        self.redis = redis_client
+        self.channel = channel
+        self.queue_size = queue_size
+        self.max_backoff = max_backoff
+
+        self._listeners = {}  # {("simulation" | "sweep", id): set(queue.Queue)}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.dropped = 0
+
+    def start(self):
+        """구독 스레드 시작 (처음 구독할 때 한 번)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="event-hub", daemon=True
+                )
+                self._thread.start()
+
+    def subscribe(self, key):
+        """구독 등록, 이벤트를 받을 큐 반환"""
+        self.start()
+        listener = ListenerQueue(maxsize=self.queue_size)
+        with self._lock:
+            self._listeners.setdefault(key, set()).add(listener)
+        return listener
+
+    def unsubscribe(self, key, listener):
+        """구독 해제"""
+        with self._lock:
+            listeners = self._listeners.get(key)
+            if listeners:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._listeners[key]
+
+    def _dispatch(self, event):
+        keys = [("simulation", event.get("simulation_id"))]
+        if event.get("sweep_id"):
+            keys.append(("sweep", event["sweep_id"]))
+
+        with self._lock:
+            targets = [
+                listener
+                for key in keys
+                for listener in self._listeners.get(key, ())
+            ]
+
+        for listener in targets:
+            self.dropped += listener.offer(event)
+
+    def _run(self):
+        """구독 루프"""
+        backoff = 1.0
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                logger.info(f"Event hub subscribed to {self.channel}")
+                backoff = 1.0
+                for message in pubsub.listen():
+                    try:
+                        self._dispatch(json.loads(message["data"]))
+                    except ValueError:
+                        logger.warning("Discarding malformed status event")
+            except redis.RedisError as e:
+                logger.error(f"Event hub connection lost: {str(e)}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            finally:
+                pubsub.close()
+
+    def stats(self):
+        """구독 현황"""
+        with self._lock:
+            subscribers = sum(len(listeners) for listeners in self._listeners.values())
+            return {
+                "running": self._thread is not None,
+                "subscribed_keys": len(self._listeners),
+                "subscribers": subscribers,
+                "dropped_events": self.dropped,
+            }
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+API Gateway의 조회 전용 엔드포인트용 TTL 응답 캐시
+(라우트별 TTL + 동시 miss 합치기(single-flight) + 명시적 무효화)
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """캐시된 업스트림 응답 (본문은 바이트 그대로 보관)"""
+
+    status: int
+    body: bytes
+    headers: dict
+    expires_at: float
+    gzip_body: bytes = None
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class ResponseCache:
+    """
+    라우트 단위 TTL 캐시
+
+    - 키: (route, 쿼리 문자열), 라우트마다 TTL이 다름
+    - 같은 키에 대한 동시 miss는 첫 요청(leader)만 업스트림을 호출하고
+      나머지는 그 결과를 기다려서 재사용
+    - invalidate(route) 시 해당 라우트의 모든 항목 삭제,
+      무효화 이전에 시작된 업스트림 호출 결과는 저장하지 않음
+    - 2xx 응답만 저장
+    """
+
+    def __init__(self, ttls, max_entries=256, wait_timeout=10.0):
+        self.ttls = dict(ttls)  # {route: ttl_seconds}
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+
+        self._entries = {}  # {(route, query): CachedResponse}
+        self._inflight = {}  # {(route, query): threading.Event}
+        self._generations = {route: 0 for route in self.ttls}
+        self._lock = threading.Lock()
+        self.stats_counters = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+        }
+
+    def get_or_fetch(self, route, query, fetch):
+        """
+        캐시 조회, 없으면 fetch()로 채움
+        fetch는 CachedResponse 생성에 필요한 (status, body, headers)를 반환
+        """
+        key = (route, query)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry.expires_at > time.monotonic():
+                    self.stats_counters["hits"] += 1
+                    return entry
+
+                event = self._inflight.get(key)
+                if event is None:
+                    # 이 요청이 leader
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    generation = self._generations[route]
+                    self.stats_counters["misses"] += 1
+                    break
+
+                self.stats_counters["coalesced"] += 1
+
+            # 다른 요청이 채우는 중: 완료를 기다린 후 다시 조회
+            # (leader가 실패했거나 무효화로 저장되지 않았으면 다음 루프에서 leader가 됨)
+            event.wait(self.wait_timeout)
+
+        try:
+            status, body, headers = fetch()
+            entry = CachedResponse(
+                status=status,
+                body=body,
+                headers=headers,
+                expires_at=time.monotonic() + self.ttls[route],
+            )
+            if 200 <= status < 300:
+                with self._lock:
+                    if self._generations[route] == generation:
+                        self._store(key, entry)
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _store(self, key, entry):
+        """항목 저장 (한도 초과 시 만료가 가장 빠른 항목부터 삭제, lock 보유 상태에서 호출)"""
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            for old_key in sorted(
+                self._entries, key=lambda k: self._entries[k].expires_at
+            )[: len(self._entries) - self.max_entries]:
+                del self._entries[old_key]
+
+    def invalidate(self, *routes):
+        """라우트 단위 무효화"""
+        with self._lock:
+            for route in routes:
+                self._generations[route] += 1
+                for key in [key for key in self._entries if key[0] == route]:
+                    del self._entries[key]
+            self.stats_counters["invalidations"] += 1
+        logger.debug(f"Response cache invalidated: {', '.join(routes)}")
+
+    def stats(self):
+        """캐시 사용 현황"""
+        with self._lock:
+            lookups = self.stats_counters["hits"] + self.stats_counters["misses"]
+            return {
+                **self.stats_counters,
+                "entries": len(self._entries),
+                "hit_rate": (
+                    round(self.stats_counters["hits"] / lookups, 4) if lookups else 0.0
+                ),
+                "ttls": self.ttls,
+            }
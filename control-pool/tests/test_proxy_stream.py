@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Streaming Proxy 테스트
+본문을 보내지 않는 응답(HEAD / 304)에서도 업스트림 동시 요청 슬롯이 반환되는지 확인
+"""
+
+import importlib.util
+import io
+import os
+import sys
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "common"))
+sys.path.insert(0, os.path.join(ROOT, "control-pool"))
+
+os.environ.setdefault("SERVER_MODE", "dev")
+os.environ.setdefault("REDIS_HOST", "127.0.0.1")
+os.environ.setdefault("STORAGE_MAX_CONCURRENCY", "3")
+os.environ.setdefault("UPSTREAM_ACQUIRE_TIMEOUT", "0.1")
+
+
+def load_gateway():
+    spec = importlib.util.spec_from_file_location(
+        "api_gateway", os.path.join(ROOT, "control-pool", "api-gateway.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gateway = load_gateway()
+
+
+def make_response(status_code, body=b""):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(
+        {"Content-Type": "application/json", "ETag": '"abc"'}
+    )
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@pytest.fixture
+def client():
+    return gateway.app.test_client()
+
+
+def serve(monkeypatch, status_code, body=b""):
+    monkeypatch.setattr(
+        gateway.storage_service.session,
+        "request",
+        lambda *args, **kwargs: make_response(status_code, body),
+    )
+
+
+@pytest.mark.parametrize(
+    "method, status_code",
+    [("HEAD", 200), ("GET", 304), ("GET", 204)],
+)
+def test_bodiless_responses_release_upstream_slot(client, monkeypatch, method, status_code):
+    serve(monkeypatch, status_code)
+    slots = gateway.storage_service.max_concurrency
+
+    for _ in range(slots + 1):
+        response = client.open(
+            "/api/scenario/scenario_1",
+            method=method,
+            headers={"If-None-Match": '"abc"'},
+        )
+        assert response.status_code == status_code
+        assert response.headers["ETag"] == '"abc"'
+        response.close()
+
+    assert gateway.storage_service.in_flight == 0
+
+
+def test_streamed_body_releases_upstream_slot(client, monkeypatch):
+    serve(monkeypatch, 200, b'{"scenario_id": "scenario_1"}')
+
+    response = client.get("/api/scenario/scenario_1")
+    assert response.get_json() == {"scenario_id": "scenario_1"}
+    response.close()
+
+    assert gateway.storage_service.in_flight == 0
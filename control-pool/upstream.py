@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Upstream Client
+API Gateway가 사용하는 업스트림 서비스 클라이언트
+(Keep-Alive 커넥션 풀 + 업스트림별 동시 요청 제한 + 타임아웃)
+"""
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamBusy(Exception):
+    """업스트림 동시 요청 한도 초과 (대기 시간 내에 슬롯을 얻지 못함)"""
+
+    def __init__(self, name, retry_after=1):
+        super().__init__(f"{name} service is busy, retry later")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class UpstreamStream:
+    """
+    스트리밍 업스트림 응답
+    본문을 파싱하지 않고 청크 단위로 전달하며, close() 시 커넥션과 동시 요청 슬롯을 반환
+    """
+
+    def __init__(self, upstream, response):
+        self.upstream = upstream
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self._closed = False
+
+    def iter_raw(self, chunk_size):
+        """업스트림 인코딩 그대로 (예: gzip) 바이트 전달"""
+        return self.response.raw.stream(chunk_size, decode_content=False)
+
+    def iter_decoded(self, chunk_size):
+        """Content-Encoding을 풀어서 바이트 전달"""
+        return self.response.iter_content(chunk_size)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.response.close()
+            self.upstream.release()
+
+
+class Upstream:
+    """
+    업스트림 서비스 하나에 대한 공유 클라이언트
+
+    - requests.Session + HTTPAdapter로 Keep-Alive 커넥션 재사용
+    - 세마포어로 동시 요청 수를 max_concurrency로 제한
+      (슬롯을 acquire_timeout 안에 얻지 못하면 UpstreamBusy)
+    - 기본 타임아웃 (connect, read) 적용
+    """
+
+    def __init__(
+        self,
+        name,
+        base_url,
+        max_concurrency=32,
+        connect_timeout=2.0,
+        read_timeout=5.0,
+        acquire_timeout=2.0,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout = (connect_timeout, read_timeout)
+        self.acquire_timeout = acquire_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def acquire(self):
+        """동시 요청 슬롯 획득"""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            logger.warning(f"Upstream {self.name} saturated ({self.max_concurrency})")
+            raise UpstreamBusy(self.name)
+        with self._lock:
+            self.in_flight += 1
+
+    def release(self):
+        """동시 요청 슬롯 반환"""
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def request(self, method, path, timeout=None, **kwargs):
+        """업스트림 요청 (응답 본문까지 읽은 후 슬롯 반환)"""
+        self.acquire()
+        try:
+            return self.session.request(
+                method,
+                f"{self.base_url}{path}",
+                timeout=timeout or self.timeout,
+                **kwargs,
+            )
+        finally:
+            self.release()
+
+    def stream(self, method, path, timeout=None, **kwargs):
+        """
+        스트리밍 요청, UpstreamStream 반환
+        슬롯은 호출자가 close()할 때까지 유지됨
+        """
+        self.acquire()
+        try:
+            response = self.session.request(
+                method,
+                f"{self.base_url}{path}",
+                timeout=timeout or self.timeout,
+                stream=True,
+                **kwargs,
+            )
+        except Exception:
+            self.release()
+            raise
+        return UpstreamStream(self, response)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def stats(self):
+        """업스트림 사용 현황"""
+        return {
+            "base_url": self.base_url,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+        }
@@ -15,6 +15,8 @@ import logging
 import os
 from datetime import datetime
 
+from task_queue import get_queue
+
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "wireless-simulation-secret"
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -42,6 +44,9 @@ try:
 except Exception as e:
     logger.error(f"Failed to connect to Redis: {str(e)}")
 
+MONITOR_UPDATE_QUEUE = "monitor_update_queue"
+MONITOR_BATCH_SIZE = int(os.getenv("MONITOR_BATCH_SIZE", 50))
+
 # Delta Buffer - 시뮬레이션별 마지막 상태 저장
 delta_buffer = {}
 client_subscriptions = {}  # {session_id: simulation_id}
@@ -175,41 +180,45 @@ def handle_unsubscribe(data):
 # ========== Background Worker ==========
 
 
-def monitor_queue_worker():
-    """Redis 큐를 모니터링하고 클라이언트에 업데이트 전송"""
-    logger.info("Monitor queue worker started")
-    MONITOR_UPDATE_QUEUE = "monitor_update_queue"
+def broadcast_update(update_data):
+    """업데이트를 해당 시뮬레이션 구독자에게 전송"""
+    simulation_id = update_data.get("simulation_id")
+    update_type = update_data.get("update_type")
 
-    while True:
-        try:
-            result = redis_client.brpop(MONITOR_UPDATE_QUEUE, timeout=1)
+    logger.info(f"Received update: {update_type} for simulation {simulation_id}")
 
-            if result:
-                queue_name, update_json = result
-                update_data = json.loads(update_json)
+    # Delta 계산
+    delta = get_delta_update(simulation_id, update_data["data"])
 
-                simulation_id = update_data.get("simulation_id")
-                update_type = update_data.get("update_type")
+    # 해당 시뮬레이션을 구독 중인 모든 클라이언트에게 전송
+    payload = {
+        "simulation_id": simulation_id,
+        "update_type": update_type,
+        "timestamp": update_data["timestamp"],
+        "delta": delta,
+    }
 
-                logger.info(
-                    f"Received update: {update_type} for simulation {simulation_id}"
-                )
+    socketio.emit("simulation_update", payload, room=simulation_id)
+    logger.info(f"Broadcasted update to room {simulation_id}")
 
-                # Delta 계산
-                delta = get_delta_update(simulation_id, update_data["data"])
 
-                # 해당 시뮬레이션을 구독 중인 모든 클라이언트에게 전송
-                payload = {
-                    "simulation_id": simulation_id,
-                    "update_type": update_type,
-                    "timestamp": update_data["timestamp"],
-                    "delta": delta,
-                }
+def monitor_queue_worker():
+    """Redis 큐를 모니터링하고 클라이언트에 업데이트 전송"""
+    logger.info("Monitor queue worker started")
+    monitor_update_queue = get_queue(redis_client, MONITOR_UPDATE_QUEUE)
+
+    while True:
+        try:
+            # 쌓인 업데이트는 한 번에 최대 MONITOR_BATCH_SIZE개씩 처리
+            entries = monitor_update_queue.pop_batch(MONITOR_BATCH_SIZE, block_timeout=1)
 
-                socketio.emit("simulation_update", payload, room=simulation_id)
-                logger.info(f"Broadcasted update to room {simulation_id}")
+            for handle, update_json in entries:
+                try:
+                    broadcast_update(json.loads(update_json))
+                except Exception as e:
+                    logger.error(f"Error broadcasting update: {str(e)}")
 
-            time.sleep(0.1)
+            monitor_update_queue.ack([handle for handle, _ in entries])
 
         except Exception as e:
             logger.error(f"Error in monitor worker: {str(e)}")
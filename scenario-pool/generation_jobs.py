@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Generation Jobs
+시나리오 생성 백그라운드 작업 관리
+
+- 작업마다 job_id / 상태(queued -> generating -> uploading -> completed | failed) / 진행률 기록
+- ThreadPoolExecutor로 max_workers개씩 실행 (HTTP 요청 스레드는 작업 등록 후 바로 반환)
+- 끝난 작업은 ttl초 동안 조회 가능, 이후 정리
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ('completed', 'failed')
+
+
+class GenerationJobs:
+    """생성 작업 레지스트리 (프로세스 메모리)"""
+
+    def __init__(self, max_workers=2, ttl=3600):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='generation')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, task, **info):
+        """
+        작업 등록, job 정보 반환
+        task(report): report(status=None, progress=None, **fields)로 진행 상황 기록
+        """
+        self._prune()
+        job_id = f"job_{uuid.uuid4().hex[:12]}"
+        now = datetime.now().isoformat()
+        job = {
+            **info,
+            'job_id': job_id,
+            'status': 'queued',
+            'progress': 0.0,
+            'created_at': now,
+            'updated_at': now
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job_id, task)
+        return dict(job)
+
+    def _run(self, job_id, task):
+        started = time.monotonic()
+
+        def report(status=None, progress=None, **fields):
+            self._update(job_id, status, progress, **fields)
+
+        try:
+            task(report)
+            self._update(job_id, 'completed', 1.0, elapsed=round(time.monotonic() - started, 3))
+        except Exception as e:
+            logger.error(f"Generation job {job_id} failed: {str(e)}")
+            self._update(job_id, 'failed', error=str(e), elapsed=round(time.monotonic() - started, 3))
+
+    def _update(self, job_id, status=None, progress=None, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if status is not None:
+                job['status'] = status
+            if progress is not None:
+                job['progress'] = round(progress, 4)
+            job.update(fields)
+            job['updated_at'] = datetime.now().isoformat()
+            if job['status'] in FINISHED_STATUSES:
+                job['finished_at'] = time.time()
+
+    def get(self, job_id):
+        """작업 정보 (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return {k: v for k, v in job.items() if k != 'finished_at'} if job else None
+
+    def list(self):
+        """작업 목록 (최근 생성 순)"""
+        with self._lock:
+            jobs = [
+                {k: v for k, v in job.items() if k != 'finished_at'} for job in self._jobs.values()
+            ]
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+    def counts(self):
+        """상태별 작업 수"""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+
+    def _prune(self):
+        """ttl이 지난 완료 / 실패 작업 정리"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.get('finished_at', cutoff + 1) < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -7,12 +7,17 @@ Scenario Pool Service
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import requests
+import json
 import uuid
-import random
+import secrets
 import os
+import time
 from datetime import datetime
 import logging
 
+from generation_jobs import GenerationJobs
+from scenario_generator import PROCEDURAL_GENERATOR, expand_scenario, validate_overrides
+
 app = Flask(__name__)
 CORS(app)
 
@@ -29,49 +34,22 @@ STORAGE_SERVICE_URL = os.getenv(
     "http://storage-service.storage-pool.svc.cluster.local:8080"
 )
 
-# ========== Helper Functions ==========
-
-def generate_user_positions(num_users, area_size):
-    """사용자 초기 위치 생성"""
-    users = []
-    for i in range(num_users):
-        user = {
-            'user_id': f'user_{i:04d}',
-            'position': {
-                'x': random.uniform(0, area_size[0]),
-                'y': random.uniform(0, area_size[1]),
-                'z': random.uniform(1.5, 2.0)  # 사람 높이
-            },
-            'velocity': {
-                'x': random.uniform(-5, 5),
-                'y': random.uniform(-5, 5),
-                'z': 0
-            },
-            'device_type': random.choice(['smartphone', 'tablet', 'laptop'])
-        }
-        users.append(user)
-    return users
-
-def generate_base_stations(area_size, num_bs=4):
-    """기지국 위치 생성"""
-    base_stations = []
-    # 균등 분포로 기지국 배치
-    grid_size = int(num_bs ** 0.5)
-    for i in range(grid_size):
-        for j in range(grid_size):
-            bs = {
-                'bs_id': f'bs_{len(base_stations):02d}',
-                'position': {
-                    'x': (i + 0.5) * area_size[0] / grid_size,
-                    'y': (j + 0.5) * area_size[1] / grid_size,
-                    'z': 25.0  # 기지국 높이
-                },
-                'frequency': 3.5e9,  # 3.5 GHz
-                'bandwidth': 100e6,   # 100 MHz
-                'tx_power': 43        # dBm
-            }
-            base_stations.append(bs)
-    return base_stations
+# 배치 생성 요청당 최대 시나리오 수
+MAX_BATCH_SCENARIOS = int(os.getenv('MAX_BATCH_SCENARIOS', 100))
+
+# 시나리오당 최대 사용자 / 기지국 수
+MAX_USERS = int(os.getenv('MAX_USERS', 200000))
+MAX_BASE_STATIONS = int(os.getenv('MAX_BASE_STATIONS', 1000))
+
+# 사용자 수가 이 이상인 시나리오는 백그라운드 작업으로 생성 (요청은 job_id를 바로 반환)
+ASYNC_GENERATION_MIN_USERS = int(os.getenv('ASYNC_GENERATION_MIN_USERS', 10000))
+GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', 2))
+GENERATION_JOB_TTL = float(os.getenv('GENERATION_JOB_TTL', 3600))  # 끝난 작업 조회 가능 시간 (초)
+generation_jobs = GenerationJobs(GENERATION_WORKERS, GENERATION_JOB_TTL)
+
+# 백그라운드 작업의 Storage 분할 업로드 청크 크기 / 청크당 재시도 수
+UPLOAD_CHUNK_BYTES = int(os.getenv('UPLOAD_CHUNK_BYTES', 4 * 1024 * 1024))
+UPLOAD_RETRIES = int(os.getenv('UPLOAD_RETRIES', 3))
 
 # ========== Health Check ==========
 
@@ -81,52 +59,188 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'scenario-pool',
+        'generation_jobs': generation_jobs.counts(),
         'timestamp': datetime.now().isoformat()
     }), 200
 
 # ========== Scenario Generation ==========
 
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def is_positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+def validate_parameters(num_users, num_base_stations, area_size, duration, seed):
+    """
+    시나리오 파라미터 형식 / 범위 확인 (잘못되면 ValueError)
+    절차적 시나리오는 저장 후 Calc 워커에서 전개되므로 저장 전에 여기서 걸러야 함
+    """
+    if not is_int(num_users) or not 0 < num_users <= MAX_USERS:
+        raise ValueError(f'num_users must be an integer between 1 and {MAX_USERS}')
+    if not is_int(num_base_stations) or not 0 < num_base_stations <= MAX_BASE_STATIONS:
+        raise ValueError(f'num_base_stations must be an integer between 1 and {MAX_BASE_STATIONS}')
+    if (
+        not isinstance(area_size, (list, tuple))
+        or len(area_size) != 2
+        or not all(is_positive_number(size) for size in area_size)
+    ):
+        raise ValueError('area_size must be two positive numbers [width, height]')
+    if not is_positive_number(duration):
+        raise ValueError('duration must be a positive number')
+    if not is_int(seed) or seed < 0:
+        raise ValueError('seed must be a non-negative integer')
+
+def scenario_spec(data):
+    """
+    요청 파라미터 검증 후 users / base_stations를 뺀 시나리오 (parameters(seed 포함) + overrides)
+    procedural=true면 이대로 저장 (Calc 워커가 expand_scenario로 직접 생성하므로 사용자 수와 관계없이 수백 바이트)
+    """
+    # 파라미터 추출
+    scenario_name = data.get('name', 'unnamed_scenario')
+    num_users = data.get('num_users', 10)
+    area_size = data.get('area_size', [1000, 1000])  # meters
+    duration = data.get('duration', 60)  # seconds
+    scenario_type = data.get('type', 'urban_mobility')
+    num_base_stations = data.get('num_base_stations', 4)
+    overrides = data.get('overrides') or {}
+    # seed가 없으면 새로 뽑아 parameters에 기록 (같은 seed로 재생성 가능)
+    seed = data.get('seed')
+    if seed is None:
+        seed = secrets.randbits(32)
+    validate_parameters(num_users, num_base_stations, area_size, duration, seed)
+    
+    # 시나리오 ID 생성
+    scenario_id = f"scenario_{uuid.uuid4().hex[:12]}"
+    parameters = {
+        'num_users': num_users,
+        'area_size': area_size,
+        'duration': duration,
+        'num_base_stations': num_base_stations,
+        'seed': seed
+    }
+    validate_overrides(parameters, overrides)
+    
+    # 시나리오 데이터 생성
+    scenario = {
+        'scenario_id': scenario_id,
+        'name': scenario_name,
+        'type': scenario_type,
+        'created_at': datetime.now().isoformat(),
+        'parameters': parameters,
+        'generator': PROCEDURAL_GENERATOR,
+        'environment': {
+            'area_size': area_size,
+            'terrain': 'urban',
+            'weather': 'clear'
+        },
+        'simulation_config': {
+            'time_step': 0.1,  # seconds
+            'total_steps': int(duration / 0.1),
+            'channel_model': 'ray_tracing',
+            'mobility_model': 'random_waypoint'
+        }
+    }
+    if overrides:
+        scenario['overrides'] = overrides
+    return scenario
+
+def build_scenario(data):
+    """요청 파라미터로 시나리오 데이터 생성 (procedural=true가 아니면 users / base_stations까지 생성)"""
+    scenario = scenario_spec(data)
+    if data.get('procedural'):
+        return scenario
+    return expand_scenario(scenario)
+
+def storage_request(method, path, retries=UPLOAD_RETRIES, **kwargs):
+    """Storage 요청 (연결 오류 / 5xx는 retries번까지 재시도)"""
+    for attempt in range(retries + 1):
+        try:
+            response = requests.request(method, f"{STORAGE_SERVICE_URL}{path}", **kwargs)
+            if response.status_code < 500 or attempt == retries:
+                return response
+        except requests.exceptions.RequestException:
+            if attempt == retries:
+                raise
+        time.sleep(min(2 ** attempt, 10))
+
+def upload_scenario(scenario_id, payload, report):
+    """
+    직렬화한 시나리오를 Storage 분할 업로드로 저장
+    청크마다 offset을 함께 보내고, 409면 Storage가 받은 위치부터 이어서 전송
+    """
+    response = storage_request('POST', '/uploads', json={'type': 'scenario', 'id': scenario_id}, timeout=10)
+    if response.status_code != 201:
+        raise RuntimeError(f"Failed to start upload: {response.text}")
+    upload_id = response.json()['upload_id']
+    try:
+        offset = 0
+        while offset < len(payload):
+            response = storage_request(
+                'PUT', f"/uploads/{upload_id}",
+                params={'offset': offset},
+                data=payload[offset:offset + UPLOAD_CHUNK_BYTES],
+                headers={'Content-Type': 'application/octet-stream'},
+                timeout=30
+            )
+            if response.status_code not in (200, 409):
+                raise RuntimeError(f"Failed to upload chunk at {offset}: {response.text}")
+            offset = response.json()['offset']
+            report(progress=0.2 + 0.75 * offset / len(payload), uploaded_bytes=offset)
+        response = storage_request('POST', f"/uploads/{upload_id}/complete", timeout=60)
+        if response.status_code != 201:
+            raise RuntimeError(f"Failed to complete upload: {response.text}")
+    except Exception:
+        try:
+            requests.delete(f"{STORAGE_SERVICE_URL}/uploads/{upload_id}", timeout=5)
+        except requests.exceptions.RequestException:
+            pass
+        raise
+
+def generation_task(spec):
+    """백그라운드 생성 작업: 사용자 / 기지국 생성 -> 직렬화 -> 분할 업로드"""
+    def run(report):
+        report('generating', 0.0)
+        scenario = expand_scenario(spec)
+        payload = json.dumps(scenario, separators=(',', ':')).encode('utf-8')
+        report('uploading', 0.2, total_bytes=len(payload), uploaded_bytes=0)
+        upload_scenario(spec['scenario_id'], payload, report)
+        logger.info(f"Scenario generated and uploaded: {spec['scenario_id']} ({len(payload)} bytes)")
+    return run
+
 @app.route('/generate', methods=['POST'])
 def generate_scenario():
-    """새 시나리오 생성"""
+    """
+    새 시나리오 생성
+    사용자 수가 ASYNC_GENERATION_MIN_USERS 이상이거나 async=true면 백그라운드 작업으로 생성하고
+    202 + job_id 반환 (진행률은 GET /generate/jobs/<job_id>), 절차적 시나리오는 항상 바로 저장
+    """
     try:
         data = request.get_json()
         
-        # 파라미터 추출
-        scenario_name = data.get('name', 'unnamed_scenario')
-        num_users = data.get('num_users', 10)
-        area_size = data.get('area_size', [1000, 1000])  # meters
-        duration = data.get('duration', 60)  # seconds
-        scenario_type = data.get('type', 'urban_mobility')
+        try:
+            spec = scenario_spec(data)
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
         
-        # 시나리오 ID 생성
-        scenario_id = f"scenario_{uuid.uuid4().hex[:12]}"
+        num_users = spec['parameters']['num_users']
+        if not data.get('procedural') and (data.get('async') or num_users >= ASYNC_GENERATION_MIN_USERS):
+            job = generation_jobs.submit(
+                generation_task(spec),
+                scenario_id=spec['scenario_id'],
+                scenario_name=spec['name'],
+                num_users=num_users
+            )
+            logger.info(f"Scenario generation job {job['job_id']} queued: {spec['scenario_id']}")
+            return jsonify({
+                **job,
+                'status_url': f"/generate/jobs/{job['job_id']}",
+                'message': 'Scenario generation started'
+            }), 202
         
-        # 시나리오 데이터 생성
-        scenario_data = {
-            'scenario_id': scenario_id,
-            'name': scenario_name,
-            'type': scenario_type,
-            'created_at': datetime.now().isoformat(),
-            'parameters': {
-                'num_users': num_users,
-                'area_size': area_size,
-                'duration': duration
-            },
-            'environment': {
-                'area_size': area_size,
-                'terrain': 'urban',
-                'weather': 'clear'
-            },
-            'users': generate_user_positions(num_users, area_size),
-            'base_stations': generate_base_stations(area_size),
-            'simulation_config': {
-                'time_step': 0.1,  # seconds
-                'total_steps': int(duration / 0.1),
-                'channel_model': 'ray_tracing',
-                'mobility_model': 'random_waypoint'
-            }
-        }
+        scenario_data = spec if data.get('procedural') else expand_scenario(spec)
+        scenario_id = scenario_data['scenario_id']
+        scenario_name = scenario_data['name']
         
         # Storage Service에 저장
         try:
@@ -143,6 +257,7 @@ def generate_scenario():
                     'scenario_id': scenario_id,
                     'scenario_name': scenario_name,
                     'num_users': num_users,
+                    'procedural': 'users' not in scenario_data,
                     'message': 'Scenario generated successfully'
                 }), 201
             else:
@@ -163,6 +278,70 @@ def generate_scenario():
         logger.error(f"Error in generate_scenario: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/generate/batch', methods=['POST'])
+def generate_scenario_batch():
+    """여러 시나리오를 생성해 Storage에 한 번에 저장"""
+    try:
+        data = request.get_json()
+        param_sets = data.get('scenarios') if data else None
+        if not param_sets:
+            return jsonify({'error': 'scenarios is required'}), 400
+        if len(param_sets) > MAX_BATCH_SCENARIOS:
+            return jsonify({
+                'error': f'At most {MAX_BATCH_SCENARIOS} scenarios per batch'
+            }), 400
+        
+        try:
+            scenarios = [build_scenario(params) for params in param_sets]
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        try:
+            response = requests.post(
+                f"{STORAGE_SERVICE_URL}/scenarios/batch",
+                json={'scenarios': scenarios},
+                timeout=30
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Storage service error: {str(e)}")
+            return jsonify({
+                'status': 'error',
+                'message': f'Storage service error: {str(e)}'
+            }), 500
+        
+        if response.status_code != 201:
+            logger.error(f"Failed to store scenario batch: {response.text}")
+            return jsonify({
+                'status': 'error',
+                'message': 'Failed to store scenarios'
+            }), 500
+        
+        logger.info(f"Scenario batch created and stored: {len(scenarios)} scenarios")
+        return jsonify({
+            'status': 'success',
+            'scenario_ids': [scenario['scenario_id'] for scenario in scenarios],
+            'count': len(scenarios),
+            'message': 'Scenarios generated successfully'
+        }), 201
+        
+    except Exception as e:
+        logger.error(f"Error in generate_scenario_batch: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/generate/jobs/<job_id>', methods=['GET'])
+def get_generation_job(job_id):
+    """생성 작업 상태 / 진행률"""
+    job = generation_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job), 200
+
+@app.route('/generate/jobs', methods=['GET'])
+def list_generation_jobs():
+    """생성 작업 목록 (최근 생성 순)"""
+    jobs = generation_jobs.list()
+    return jsonify({'jobs': jobs, 'count': len(jobs)}), 200
+
 @app.route('/templates', methods=['GET'])
 def get_templates():
     """시나리오 템플릿 목록"""
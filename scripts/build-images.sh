@@ -48,11 +48,12 @@ echo "✅ Storage Pool image ready"
 
 echo ""
 echo "🔨 Building Scenario Pool image..."
+# scenario-pool은 common 모듈(scenario_generator)이 필요하므로 프로젝트 루트를 빌드 컨텍스트로 사용
 if should_use_no_cache "scenario-pool"; then
     echo "   Using --no-cache option"
-    docker build --no-cache -t scenario-pool:latest ./scenario-pool
+    docker build --no-cache -t scenario-pool:latest -f ./scenario-pool/Dockerfile .
 else
-    docker build -t scenario-pool:latest ./scenario-pool
+    docker build -t scenario-pool:latest -f ./scenario-pool/Dockerfile .
 fi
 docker save scenario-pool:latest -o /tmp/scenario-pool.tar
 if k3s ctr images import /tmp/scenario-pool.tar 2>/dev/null; then
@@ -65,11 +66,12 @@ echo "✅ Scenario Pool image ready"
 
 echo ""
 echo "🔨 Building Calc Pool image..."
+# calc-pool은 common 모듈이 필요하므로 프로젝트 루트를 빌드 컨텍스트로 사용
 if should_use_no_cache "calc-pool"; then
     echo "   Using --no-cache option"
-    docker build --no-cache -t calc-pool:latest ./calc-pool
+    docker build --no-cache -t calc-pool:latest -f ./calc-pool/Dockerfile .
 else
-    docker build -t calc-pool:latest ./calc-pool
+    docker build -t calc-pool:latest -f ./calc-pool/Dockerfile .
 fi
 docker save calc-pool:latest -o /tmp/calc-pool.tar
 if k3s ctr images import /tmp/calc-pool.tar 2>/dev/null; then
@@ -82,11 +84,12 @@ echo "✅ Calc Pool image ready"
 
 echo ""
 echo "🔨 Building Monitor Pool image..."
+# monitor-pool은 common 모듈이 필요하므로 프로젝트 루트를 빌드 컨텍스트로 사용
 if should_use_no_cache "monitor-pool"; then
     echo "   Using --no-cache option"
-    docker build --no-cache -t monitor-pool:latest ./monitor-pool
+    docker build --no-cache -t monitor-pool:latest -f ./monitor-pool/Dockerfile .
 else
-    docker build -t monitor-pool:latest ./monitor-pool
+    docker build -t monitor-pool:latest -f ./monitor-pool/Dockerfile .
 fi
 docker save monitor-pool:latest -o /tmp/monitor-pool.tar
 if k3s ctr images import /tmp/monitor-pool.tar 2>/dev/null; then
@@ -99,7 +102,7 @@ echo "✅ Monitor Pool image ready"
 
 echo ""
 echo "🔨 Building Control Pool image..."
-# control-pool은 client 폴더가 필요하므로 프로젝트 루트를 빌드 컨텍스트로 사용
+# control-pool은 client 폴더와 common 모듈이 필요하므로 프로젝트 루트를 빌드 컨텍스트로 사용
 if should_use_no_cache "control-pool"; then
     echo "   Using --no-cache option"
     docker build --no-cache -t control-pool:latest -f ./control-pool/Dockerfile .
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Bulk Transfer
+시나리오 / 결과 일괄 내보내기 / 가져오기 스트림 형식
+
+- NDJSON: 한 줄에 {"type": "scenario" | "result", "id": ..., "document": {...}}
+- tar (gzip): scenarios/<id>.json, results/<id>.json, timeseries/<id>/<파일>
+  (결과 아카이브와 같은 구조라 아카이브도 그대로 가져올 수 있음)
+- 내보내기는 문서 하나씩 직렬화해서 바로 내보내고, 가져오기는 항목 하나씩 읽음
+  (전체 크기와 관계없이 메모리 사용량은 문서 하나 크기)
+"""
+
+import gzip
+import io
+import json
+import tarfile
+import time
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+TAR_MIMETYPE = 'application/gzip'
+
+# tar 경로 접두사 <-> 문서 타입
+TAR_PREFIXES = {'scenario': 'scenarios', 'result': 'results'}
+TAR_TYPES = {prefix: obj_type for obj_type, prefix in TAR_PREFIXES.items()}
+
+
+class StreamBuffer(io.RawIOBase):
+    """tarfile 스트림 모드 출력을 모아 두었다가 응답 청크로 내보내는 버퍼"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_document(document):
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def iter_ndjson_export(records):
+    """records: (type, id, 문서, 시계열 파일 목록) -> NDJSON 바이트 청크 (시계열은 제외)"""
+    for obj_type, obj_id, document, _ in records:
+        yield encode_document({'type': obj_type, 'id': obj_id, 'document': document}) + b'\n'
+
+
+def iter_tar_export(records, compresslevel=6):
+    """records: (type, id, 문서, 시계열 파일 목록) -> tar.gz 바이트 청크"""
+    buffer = StreamBuffer()
+    # tarfile 스트림 모드는 압축 수준을 받지 않으므로 gzip은 직접 감쌈
+    compressor = gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=compresslevel)
+    with compressor, tarfile.open(fileobj=compressor, mode='w|') as tar:
+        for obj_type, obj_id, document, files in records:
+            payload = encode_document(document)
+            info = tarfile.TarInfo(f"{TAR_PREFIXES[obj_type]}/{obj_id}.json")
+            info.size = len(payload)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(payload))
+            for path in files:
+                tar.add(path, arcname=f"timeseries/{obj_id}/{path.rsplit('/', 1)[-1]}")
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    yield buffer.drain()
+
+
+def iter_ndjson_import(stream, compressed=False):
+    """NDJSON 스트림 -> ('document', type, id, 문서)"""
+    if compressed:
+        stream = gzip.GzipFile(fileobj=stream)
+    for line_number, line in enumerate(iter(stream.readline, b''), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if record['type'] not in TAR_PREFIXES or not isinstance(record['document'], dict):
+                raise ValueError
+            yield 'document', record['type'], str(record['id']), record['document']
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f"Invalid NDJSON record at line {line_number}")
+
+
+def iter_tar_import(stream):
+    """tar(.gz) 스트림 -> ('document', type, id, 문서) / ('file', 'timeseries', id, (이름, 바이트))"""
+    with tarfile.open(fileobj=stream, mode='r|*') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            parts = member.name.strip('/').split('/')
+            content = tar.extractfile(member).read()
+            if len(parts) == 2 and parts[0] in TAR_TYPES and parts[1].endswith('.json'):
+                yield 'document', TAR_TYPES[parts[0]], parts[1][: -len('.json')], json.loads(content)
+            elif len(parts) == 3 and parts[0] == 'timeseries':
+                yield 'file', 'timeseries', parts[1], (parts[2], content)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chunked Upload
+큰 문서(시나리오 / 결과)를 여러 요청으로 나눠 올리는 업로드 세션
+
+- 세션마다 <upload_id>.part (받은 바이트) + <upload_id>.meta.json (대상 타입 / ID)
+- 청크는 offset을 함께 보내고, 이미 받은 범위는 건너뜀 (재시도해도 안전, 끊긴 위치에서 이어서 전송)
+- 같은 세션에 동시에 온 청크는 .part 파일 잠금(flock)으로 하나만 씀, 나머지는 offset 오류
+- 완료 시 .part 전체를 JSON으로 읽음 (gzip으로 압축한 본문도 가능)
+- 오래된 미완료 세션은 expire로 정리
+"""
+
+import fcntl
+import os
+import time
+import uuid
+
+from json_codec import read_json_file, write_json_atomic
+
+PART_SUFFIX = '.part'
+META_SUFFIX = '.meta.json'
+UPLOAD_TYPES = ('scenario', 'result')
+
+
+class UploadOffsetError(ValueError):
+    """받은 위치보다 뒤의 offset으로 청크를 보낸 경우 (중간 청크 누락) / 다른 청크를 쓰는 중인 경우"""
+
+    def __init__(self, expected):
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+class UploadStore:
+    """업로드 세션 저장소"""
+
+    def __init__(self, base_dir, max_bytes):
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _path(self, upload_id, suffix):
+        if not upload_id.isalnum():
+            raise KeyError(upload_id)
+        return os.path.join(self.base_dir, f"{upload_id}{suffix}")
+
+    def create(self, obj_type, obj_id):
+        """세션 생성, upload_id 반환"""
+        if obj_type not in UPLOAD_TYPES:
+            raise ValueError(f"Unsupported upload type: {obj_type}")
+        upload_id = uuid.uuid4().hex
+        open(self._path(upload_id, PART_SUFFIX), 'wb').close()
+        write_json_atomic(self._path(upload_id, META_SUFFIX), {
+            'upload_id': upload_id,
+            'type': obj_type,
+            'id': obj_id,
+            'created_at': time.time()
+        })
+        return upload_id
+
+    def describe(self, upload_id):
+        """세션 정보 + 받은 바이트 수 (없으면 KeyError)"""
+        try:
+            meta = read_json_file(self._path(upload_id, META_SUFFIX))
+            meta['offset'] = os.path.getsize(self._path(upload_id, PART_SUFFIX))
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        return meta
+
+    def append(self, upload_id, offset, data):
+        """offset 위치의 청크 저장, 받은 전체 바이트 수 반환"""
+        self.describe(upload_id)
+        with open(self._path(upload_id, PART_SUFFIX), 'ab') as f:
+            # offset 확인부터 쓰기까지 잠금 (프로세스 간에도 유효), 먼저 잡은 요청만 씀
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadOffsetError(os.fstat(f.fileno()).st_size)
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if offset > size:
+                    raise UploadOffsetError(size)
+                # 이미 받은 앞부분은 건너뜀 (같은 청크 재전송)
+                data = data[size - offset:]
+                if size + len(data) > self.max_bytes:
+                    raise ValueError(f"Upload exceeds {self.max_bytes} bytes")
+                if data:
+                    f.write(data)
+                    f.flush()
+                    size += len(data)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return size
+
+    def load(self, upload_id):
+        """받은 본문을 JSON으로 읽음 (세션 정보, 문서)"""
+        meta = self.describe(upload_id)
+        return meta, read_json_file(self._path(upload_id, PART_SUFFIX))
+
+    def remove(self, upload_id):
+        for suffix in (PART_SUFFIX, META_SUFFIX):
+            try:
+                os.remove(self._path(upload_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def expire(self, max_age):
+        """max_age초 동안 바뀌지 않은 세션 삭제, 삭제한 수 반환"""
+        cutoff = time.time() - max_age
+        expired = 0
+        with os.scandir(self.base_dir) as entries:
+            parts = [entry for entry in entries if entry.name.endswith(PART_SUFFIX)]
+        for entry in parts:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    self.remove(entry.name[: -len(PART_SUFFIX)])
+                    expired += 1
+            except FileNotFoundError:
+                pass
+        return expired
+
+    def count(self):
+        with os.scandir(self.base_dir) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(PART_SUFFIX))
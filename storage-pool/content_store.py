@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Content Store
+내용 주소(content-addressed) 문서 저장소
+
+- 문서를 정규화한 JSON의 SHA-256을 키로 한 번만 저장 (<hash>.json, 선택적 gzip)
+- 같은 내용을 다시 저장하면 기존 파일을 그대로 사용 (sweep이 같은 배치를 다시 생성하는 경우 등)
+"""
+
+import hashlib
+import json
+import os
+
+from json_codec import read_json_file, write_json_atomic
+
+
+def content_hash(document):
+    """정규화(키 정렬, 공백 제거)한 JSON의 SHA-256"""
+    canonical = json.dumps(document, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def split_document(document, ref_fields):
+    """문서 -> (내용 주소로 저장할 본문, 인스턴스별 필드) (ref_fields는 hash에서 제외)"""
+    body = {key: value for key, value in document.items() if key not in ref_fields}
+    ref = {key: document[key] for key in ref_fields if key in document}
+    return body, ref
+
+
+class ContentStore:
+    """SHA-256 키 문서 저장소"""
+
+    def __init__(self, directory, compress=True, level=6):
+        self.directory = directory
+        self.compress = compress
+        self.level = level
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, digest):
+        if len(digest) != 64 or not all(c in '0123456789abcdef' for c in digest):
+            raise ValueError(f"Invalid content hash: {digest}")
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def put(self, document):
+        """
+        문서 저장, (hash, 압축 전 크기, 새로 쓴 크기, 새로 저장했는지) 반환
+        이미 있는 내용이면 쓰지 않음 (새로 쓴 크기 0)
+        """
+        digest = content_hash(document)
+        path = self.path(digest)
+        if os.path.exists(path):
+            raw_size = len(json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            return digest, raw_size, 0, False
+        raw_size, stored_size = write_json_atomic(path, document, compress=self.compress, level=self.level)
+        return digest, raw_size, stored_size, True
+
+    def get(self, digest):
+        """문서 조회 (없으면 None)"""
+        try:
+            return read_json_file(self.path(digest))
+        except FileNotFoundError:
+            return None
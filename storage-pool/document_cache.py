@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Document Cache
+Storage Pool 조회용 파싱된 문서 LRU 캐시 (메모리 크기 제한)
+
+- 항목마다 파일 버전(stat의 mtime_ns / size)을 함께 저장, 조회 시 버전이 다르면 miss
+  (다른 경로로 파일이 바뀌거나 압축(compaction)된 경우에도 오래된 문서를 반환하지 않음)
+- 쓰기 시 invalidate로 즉시 제거
+- 반환한 문서는 여러 요청이 공유하므로 호출하는 쪽에서 수정하지 않아야 함
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def stat_version(*file_stats):
+    """파일 stat 목록으로 만든 버전 (없는 파일은 None)"""
+    return tuple(
+        (file_stat.st_mtime_ns, file_stat.st_size) if file_stat else None
+        for file_stat in file_stats
+    )
+
+
+class DocumentCache:
+    """
+    크기 제한 LRU 캐시
+
+    max_bytes: 캐시 전체 크기 한도 (호출하는 쪽이 넘긴 항목 크기 합, 파싱된 객체의 추정 메모리)
+    max_entry_bytes: 이보다 큰 문서는 캐시하지 않음 (큰 문서 하나가 캐시를 비우지 않도록)
+    """
+
+    def __init__(self, max_bytes=48 * 1024 * 1024, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max(1, max_bytes // 8)
+        self._entries = OrderedDict()  # {key: (version, document, nbytes)}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        """버전이 같은 문서 반환 (없거나 버전이 다르면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != version:
+                self._remove(key)
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, document, nbytes):
+        """문서 저장 (한도를 넘으면 오래 사용하지 않은 항목부터 제거)"""
+        if nbytes > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (version, document, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """항목 제거 (쓰기 시 호출)"""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def stats(self):
+        """캐시 사용량 / hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+JSON Codec
+Storage Pool 파일 인코딩 (선택적 gzip 압축)
+
+- 압축 여부와 관계없이 파일 이름은 <id>.json 유지, 읽을 때 gzip 매직 바이트로 판별
+  (압축 도입 전에 저장된 일반 JSON 파일도 그대로 읽힘)
+- 쓰기는 임시 파일에 쓴 후 rename
+"""
+
+import gzip
+import json
+import os
+import threading
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def encode_json(data, compress=False, level=6):
+    """(저장할 바이트, 압축 전 크기) 반환"""
+    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if compress:
+        # mtime=0: 같은 내용이면 같은 바이트 (재저장해도 파일 내용이 바뀌지 않음)
+        return gzip.compress(raw, compresslevel=level, mtime=0), len(raw)
+    return raw, len(raw)
+
+
+def decode_bytes(blob):
+    """압축되어 있으면 해제한 JSON 바이트"""
+    if blob[:2] == GZIP_MAGIC:
+        return gzip.decompress(blob)
+    return blob
+
+
+def read_json_bytes(path):
+    """파일의 (압축 해제한) JSON 바이트, 없으면 FileNotFoundError"""
+    with open(path, 'rb') as f:
+        return decode_bytes(f.read())
+
+
+def read_json_file(path):
+    """JSON 파일 로드 (압축 여부 자동 판별), 없으면 FileNotFoundError"""
+    return json.loads(read_json_bytes(path))
+
+
+def write_json_atomic(path, data, fsync=False, compress=False, level=6):
+    """
+    임시 파일에 쓴 후 rename (읽는 쪽은 항상 완전한 파일을 봄)
+    (압축 전 크기, 저장된 크기) 반환
+    """
+    blob, raw_size = encode_json(data, compress, level)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return raw_size, len(blob)
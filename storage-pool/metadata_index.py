@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Metadata Index
+Storage Pool 파일의 메타데이터 인덱스 (SQLite)
+
+- 저장할 때마다 (type, id, status, scenario_id, created_at, updated_at, size, logical_size) 기록
+  size: 디스크에 저장된 크기, logical_size: 압축 / 중복 제거 전 문서 크기
+  location: 보관(archive)된 항목이 들어 있는 아카이브 이름
+- 목록 / 통계 조회는 디렉토리 스캔 대신 인덱스에서 처리
+- 인덱스가 없거나 손상되면 기존 JSON 파일로부터 재구축
+"""
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from json_codec import read_json_bytes
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    status TEXT,
+    scenario_id TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    logical_size INTEGER,
+    location TEXT,
+    PRIMARY KEY (type, id)
+);
+CREATE INDEX IF NOT EXISTS objects_type_created ON objects (type, created_at, id);
+CREATE INDEX IF NOT EXISTS objects_type_status ON objects (type, status);
+CREATE INDEX IF NOT EXISTS objects_scenario ON objects (scenario_id);
+"""
+
+UPSERT_SQL = """
+INSERT INTO objects (type, id, status, scenario_id, created_at, updated_at, size, logical_size, location)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (type, id) DO UPDATE SET
+    status = excluded.status,
+    scenario_id = COALESCE(excluded.scenario_id, objects.scenario_id),
+    updated_at = excluded.updated_at,
+    size = excluded.size,
+    logical_size = COALESCE(excluded.logical_size, objects.logical_size),
+    location = excluded.location
+"""
+
+# 인덱스 생성 후 추가된 컬럼 (기존 인덱스는 ALTER TABLE로 추가)
+ADDED_COLUMNS = {'logical_size': 'INTEGER', 'location': 'TEXT'}
+
+REBUILD_BATCH_SIZE = 1000
+
+# 목록 조회 시 반환할 수 있는 컬럼
+INDEX_COLUMNS = (
+    'id', 'type', 'status', 'scenario_id', 'created_at', 'updated_at', 'size', 'logical_size',
+    'location'
+)
+
+
+def encode_cursor(created_at, obj_id):
+    """다음 페이지 커서 (마지막 항목의 created_at, id)"""
+    return base64.urlsafe_b64encode(json.dumps([created_at, obj_id]).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """커서 해석, 잘못된 커서는 ValueError"""
+    try:
+        created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    return created_at, obj_id
+
+
+class MetadataIndex:
+    """
+    SQLite 메타데이터 인덱스
+
+    - 스레드별 커넥션 (Flask 스레드 서버), WAL 모드로 읽기와 쓰기 동시 진행
+    - created_at은 처음 기록될 때의 값을 유지하고 나머지 필드는 갱신
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(objects)')}
+        for name, column_type in ADDED_COLUMNS.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE objects ADD COLUMN {name} {column_type}")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, obj_type, obj_id, status=None, scenario_id=None, created_at=None, size=0,
+               logical_size=None, location=None):
+        """항목 추가 또는 갱신 (logical_size가 None이면 기존 값 유지)"""
+        now = datetime.now().isoformat()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                UPSERT_SQL,
+                (obj_type, obj_id, status, scenario_id, created_at or now, now, size, logical_size,
+                 location),
+            )
+
+    def upsert_many(self, rows):
+        """
+        여러 항목을 한 트랜잭션으로 추가 또는 갱신
+        [(type, id, status, scenario_id, created_at, size, logical_size)]
+        """
+        now = datetime.now().isoformat()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                UPSERT_SQL,
+                [
+                    (obj_type, obj_id, status, scenario_id, created_at or now, now, size, logical_size,
+                     None)
+                    for obj_type, obj_id, status, scenario_id, created_at, size, logical_size in rows
+                ],
+            )
+
+    def delete(self, obj_type, obj_id):
+        """항목 삭제"""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM objects WHERE type = ? AND id = ?', (obj_type, obj_id))
+
+    def get(self, obj_type, obj_id):
+        """항목 하나 조회 (없으면 None)"""
+        row = self._connection().execute(
+            f"SELECT {', '.join(INDEX_COLUMNS)} FROM objects WHERE type = ? AND id = ?",
+            (obj_type, obj_id)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def retention_candidates(self, obj_type, cutoff=None, status_cutoffs=None,
+                             max_per_scenario=0, protected_statuses=(), limit=500):
+        """
+        보존 정책에 걸리는 항목 (오래된 순)
+        - cutoff: 이 시각 이전에 생성된 항목 (protected_statuses 제외)
+        - status_cutoffs: {status: cutoff} 상태별 기준 (protected_statuses와 무관하게 적용)
+        - max_per_scenario: 시나리오별 최신 N개를 넘는 항목 (protected_statuses 제외)
+        """
+        protected = ''
+        protected_params = []
+        if protected_statuses:
+            protected = f" AND COALESCE(status, '') NOT IN ({', '.join('?' * len(protected_statuses))})"
+            protected_params = list(protected_statuses)
+
+        selects = []
+        params = []
+        if cutoff:
+            selects.append(f"SELECT id FROM objects WHERE type = ? AND created_at < ?{protected}")
+            params += [obj_type, cutoff, *protected_params]
+        for status, status_cutoff in (status_cutoffs or {}).items():
+            selects.append('SELECT id FROM objects WHERE type = ? AND status = ? AND created_at < ?')
+            params += [obj_type, status, status_cutoff]
+        if max_per_scenario:
+            selects.append(
+                'SELECT id FROM ('
+                'SELECT id, ROW_NUMBER() OVER ('
+                'PARTITION BY scenario_id ORDER BY created_at DESC, id DESC) AS newer '
+                f"FROM objects WHERE type = ? AND scenario_id IS NOT NULL{protected}"
+                ') WHERE newer > ?'
+            )
+            params += [obj_type, *protected_params, max_per_scenario]
+        if not selects:
+            return []
+
+        rows = self._connection().execute(
+            f"SELECT {', '.join(INDEX_COLUMNS)} FROM objects "
+            f"WHERE type = ? AND id IN ({' UNION '.join(selects)}) "
+            'ORDER BY created_at, id LIMIT ?',
+            [obj_type, *params, limit]
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query(self, obj_type, status=None, scenario_id=None, created_after=None,
+              created_before=None, cursor=None, limit=100, descending=False):
+        """
+        필터 + keyset 페이지네이션 조회
+        (rows, next_cursor, total) 반환, total은 필터에 맞는 전체 항목 수
+        """
+        conditions = ['type = ?']
+        params = [obj_type]
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        if scenario_id:
+            conditions.append('scenario_id = ?')
+            params.append(scenario_id)
+        if created_after:
+            conditions.append('created_at >= ?')
+            params.append(created_after)
+        if created_before:
+            conditions.append('created_at < ?')
+            params.append(created_before)
+
+        conn = self._connection()
+        where = ' AND '.join(conditions)
+        total = conn.execute(
+            f"SELECT COUNT(*) AS count FROM objects WHERE {where}", params
+        ).fetchone()['count']
+
+        if cursor:
+            conditions.append('(created_at, id) < (?, ?)' if descending else '(created_at, id) > (?, ?)')
+            params.extend(decode_cursor(cursor))
+        order = 'DESC' if descending else 'ASC'
+        rows = conn.execute(
+            f"SELECT {', '.join(INDEX_COLUMNS)} FROM objects "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at {order}, id {order} LIMIT ?",
+            [*params, limit + 1]
+        ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+        return [dict(row) for row in rows], next_cursor, total
+
+    def count(self, obj_type):
+        """항목 수"""
+        row = self._connection().execute(
+            'SELECT COUNT(*) AS count FROM objects WHERE type = ?', (obj_type,)
+        ).fetchone()
+        return row['count']
+
+    def stats(self):
+        """타입별 항목 수 / 저장 크기 / 압축·중복 제거 전 크기, 상태별 항목 수 / 크기"""
+        conn = self._connection()
+        by_type = {
+            row['type']: {
+                'count': row['count'],
+                'bytes': row['bytes'],
+                'logical_bytes': row['logical_bytes']
+            }
+            for row in conn.execute(
+                'SELECT type, COUNT(*) AS count, COALESCE(SUM(size), 0) AS bytes, '
+                'COALESCE(SUM(COALESCE(logical_size, size)), 0) AS logical_bytes '
+                'FROM objects GROUP BY type'
+            )
+        }
+        by_status = {}
+        bytes_by_status = {}
+        for row in conn.execute(
+            'SELECT type, status, COUNT(*) AS count, COALESCE(SUM(size), 0) AS bytes FROM objects '
+            'WHERE status IS NOT NULL GROUP BY type, status'
+        ):
+            by_status.setdefault(row['type'], {})[row['status']] = row['count']
+            bytes_by_status.setdefault(row['type'], {})[row['status']] = row['bytes']
+        return {'by_type': by_type, 'by_status': by_status, 'bytes_by_status': bytes_by_status}
+
+    def rebuild(self, sources):
+        """
+        JSON 파일로부터 인덱스 재구축 (sources에 없는 타입의 항목은 유지)
+        sources: {type: (directory, describe)}
+          describe(data) -> (status, scenario_id, created_at, logical_size)
+          logical_size가 None이면 파일의 압축 해제 크기 사용
+        """
+        conn = self._connection()
+        counts = {}
+        with conn:
+            conn.execute(
+                f"DELETE FROM objects WHERE type IN ({', '.join('?' * len(sources))})",
+                list(sources)
+            )
+        for obj_type, (directory, describe) in sources.items():
+            rows = []
+            counts[obj_type] = 0
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        raw = read_json_bytes(entry.path)
+                        data = json.loads(raw)
+                        file_stat = entry.stat()
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Skipping {entry.path} during rebuild: {str(e)}")
+                        continue
+                    status, scenario_id, created_at, logical_size = describe(data)
+                    rows.append(
+                        (
+                            obj_type,
+                            entry.name[: -len('.json')],
+                            status,
+                            scenario_id,
+                            created_at
+                            or datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
+                            file_stat.st_size,
+                            len(raw) if logical_size is None else logical_size,
+                        )
+                    )
+                    if len(rows) >= REBUILD_BATCH_SIZE:
+                        self.upsert_many(rows)
+                        counts[obj_type] += len(rows)
+                        rows = []
+            self.upsert_many(rows)
+            counts[obj_type] += len(rows)
+        logger.info(f"Metadata index rebuilt: {counts}")
+        return counts
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Patch Log Document Store
+JSON 문서 + 추가 전용(append-only) 변경 로그
+
+- 기본 문서: <id>.json, 변경 로그: <id>.log (한 줄에 변경 하나, NDJSON)
+- PATCH(필드 병합) / append(리스트 필드에 값 추가)는 로그에 한 줄만 추가
+- 조회 시 기본 문서에 로그를 재생, 로그가 커지면 압축(compaction)해서
+  임시 파일에 쓴 후 rename으로 기본 문서를 교체
+- 로그 항목마다 seq를 기록하고 기본 문서에 마지막으로 반영한 seq를 보관
+  (압축 중 중단되어 로그가 남아도 같은 변경이 두 번 적용되지 않음,
+   끝부분이 잘린 로그 줄은 무시)
+- 쓰기 경로는 기본 문서를 읽지 않음: 마지막 seq / 로그 항목 수는 메모리에 보관하고
+  없으면 로그(압축 기준 이하로 작음)에서 구함 (로그도 없을 때만 기본 문서를 한 번 읽음)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from json_codec import read_json_file, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# 기본 문서에 저장하는 마지막 반영 seq (조회 시 제거)
+SEQ_FIELD = '_log_seq'
+
+
+def merge_patch(target, patch):
+    """JSON Merge Patch (RFC 7386): dict는 재귀 병합, null은 필드 삭제"""
+    if not isinstance(patch, dict):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = merge_patch(target.get(key), value)
+    return target
+
+
+def append_values(document, path, values):
+    """점으로 구분된 경로의 리스트 필드에 값 추가 (없으면 생성)"""
+    parts = path.split('.')
+    target = document
+    for part in parts[:-1]:
+        if not isinstance(target.get(part), dict):
+            target[part] = {}
+        target = target[part]
+    existing = target.get(parts[-1])
+    if not isinstance(existing, list):
+        existing = []
+    existing.extend(values)
+    target[parts[-1]] = existing
+
+
+class PatchLogStore:
+    """
+    디렉토리 하나의 문서 저장소
+
+    - 문서 ID로 고른 lock(lock_stripes개 중 하나)으로 같은 문서의 쓰기 / 압축을 직렬화
+      (Storage는 단일 레플리카, lock 수는 문서 수와 관계없이 고정)
+    - 로그가 compact_bytes 또는 compact_entries를 넘으면 쓰기 직후 압축
+    - 나머지 변경된 문서는 compact_idle 초 동안 추가 변경이 없으면 백그라운드에서 압축
+    - compress: 기본 문서를 gzip으로 저장 (로그는 항상 평문 NDJSON)
+    """
+
+    def __init__(self, directory, compact_bytes=256 * 1024, compact_entries=200,
+                 compact_idle=30.0, fsync=False, compress=False, level=6,
+                 lock_stripes=64, max_tracked=4096):
+        self.directory = directory
+        self.compact_bytes = compact_bytes
+        self.compact_entries = compact_entries
+        self.compact_idle = compact_idle
+        self.fsync = fsync
+        self.compress = compress
+        self.level = level
+
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
+        self._dirty = {}  # {doc_id: 마지막 변경 시각}
+        # {doc_id: (마지막 seq, 로그 항목 수)} 최근 쓴 문서만 보관 (LRU)
+        self._positions = OrderedDict()
+        self._positions_guard = threading.Lock()
+        self.max_tracked = max_tracked
+        self._compactor = None
+
+    def _lock(self, doc_id):
+        return self._locks[zlib.crc32(doc_id.encode('utf-8')) % len(self._locks)]
+
+    def _remember(self, doc_id, seq, count):
+        with self._positions_guard:
+            self._positions[doc_id] = (seq, count)
+            self._positions.move_to_end(doc_id)
+            while len(self._positions) > self.max_tracked:
+                self._positions.popitem(last=False)
+
+    def _forget(self, doc_id):
+        with self._positions_guard:
+            self._positions.pop(doc_id, None)
+
+    def _position(self, doc_id):
+        """
+        (마지막 seq, 로그 항목 수), 문서가 없으면 None (문서 lock 보유 상태에서 호출)
+        메모리에 없으면 로그에서, 로그도 없으면 기본 문서에서 구함
+        """
+        with self._positions_guard:
+            position = self._positions.get(doc_id)
+        if position is not None:
+            return position
+        entries = self._read_log(doc_id)
+        if entries:
+            # 로그가 있으면 기본 문서의 seq는 로그 마지막 seq 이하 (압축은 로그 끝까지 반영)
+            position = (entries[-1]['seq'], len(entries))
+        else:
+            if not os.path.exists(self.doc_path(doc_id)):
+                return None
+            document = self._read_base(doc_id)
+            if document is None:
+                return None
+            position = (document.get(SEQ_FIELD, 0), 0)
+        self._remember(doc_id, *position)
+        return position
+
+    def doc_path(self, doc_id):
+        return os.path.join(self.directory, f"{doc_id}.json")
+
+    def log_path(self, doc_id):
+        return os.path.join(self.directory, f"{doc_id}.log")
+
+    def _read_base(self, doc_id):
+        try:
+            return read_json_file(self.doc_path(doc_id))
+        except FileNotFoundError:
+            return None
+
+    def _read_log(self, doc_id):
+        """로그 항목 목록 (잘린 마지막 줄은 무시)"""
+        entries = []
+        try:
+            with open(self.log_path(doc_id), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        logger.warning(f"Ignoring torn log entry for {doc_id}")
+                        break
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _trim_torn_tail(self, doc_id):
+        """마지막 줄이 잘려 있으면 (쓰는 중 중단) 마지막 줄바꿈까지 잘라냄"""
+        try:
+            with open(self.log_path(doc_id), 'rb+') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    return
+                f.seek(size - 1)
+                if f.read(1) == b'\n':
+                    return
+                f.seek(0)
+                content = f.read()
+                f.truncate(content.rfind(b'\n') + 1)
+                logger.warning(f"Trimmed torn log tail for {doc_id}")
+        except FileNotFoundError:
+            pass
+
+    def _materialize(self, doc_id):
+        """기본 문서 + 로그 재생, (문서, 마지막 seq, 로그 항목 수) 반환"""
+        document = self._read_base(doc_id)
+        base_seq = document.pop(SEQ_FIELD, 0) if document else 0
+        seq = base_seq
+        entries = self._read_log(doc_id)
+        for entry in entries:
+            if entry['seq'] <= base_seq:
+                continue
+            if document is None:
+                document = {}
+            if entry['op'] == 'merge':
+                document = merge_patch(document, entry['patch'])
+            elif entry['op'] == 'append':
+                append_values(document, entry['path'], entry['values'])
+            seq = entry['seq']
+        return document, seq, len(entries)
+
+    def has_log(self, doc_id):
+        return os.path.exists(self.log_path(doc_id))
+
+    def load(self, doc_id):
+        """문서 조회 (없으면 None)"""
+        document, _, _ = self._materialize(doc_id)
+        return document
+
+    def _write_base(self, doc_id, document, seq):
+        return write_json_atomic(
+            self.doc_path(doc_id), {**document, SEQ_FIELD: seq},
+            fsync=self.fsync, compress=self.compress, level=self.level
+        )
+
+    def save(self, doc_id, document):
+        """문서 전체 저장 (기존 로그는 폐기), (압축 전 크기, 저장된 크기) 반환"""
+        with self._lock(doc_id):
+            # 남은 로그의 seq 이상으로 기록 (rename 후 로그 삭제 전에 중단되어도 재적용되지 않음)
+            position = self._position(doc_id) if self.has_log(doc_id) else None
+            seq = position[0] if position else 0
+            sizes = self._write_base(doc_id, document, seq)
+            self._remove_log(doc_id)
+            self._remember(doc_id, seq, 0)
+            return sizes
+
+    def _append_entry(self, doc_id, entry):
+        """
+        로그에 한 줄 추가 후 필요하면 압축 (기본 문서는 읽지 않음)
+        문서가 없으면 False
+        """
+        with self._lock(doc_id):
+            position = self._position(doc_id)
+            if position is None:
+                return False
+            seq, count = position
+            self._trim_torn_tail(doc_id)
+            entry['seq'] = seq + 1
+            entry['at'] = time.time()
+            with open(self.log_path(doc_id), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+                log_size = f.tell()
+            self._remember(doc_id, seq + 1, count + 1)
+
+            if count + 1 >= self.compact_entries or log_size >= self.compact_bytes:
+                document, seq, _ = self._materialize(doc_id)
+                self._compact_locked(doc_id, document, seq)
+            else:
+                self._dirty[doc_id] = time.monotonic()
+            return True
+
+    def patch(self, doc_id, patch):
+        """필드 병합 (JSON Merge Patch), 문서가 없으면 False"""
+        return self._append_entry(doc_id, {'op': 'merge', 'patch': patch})
+
+    def append(self, doc_id, path, values):
+        """리스트 필드에 값 추가, 문서가 없으면 False"""
+        return self._append_entry(doc_id, {'op': 'append', 'path': path, 'values': values})
+
+    def delete(self, doc_id):
+        """문서와 로그 삭제"""
+        with self._lock(doc_id):
+            try:
+                os.remove(self.doc_path(doc_id))
+            except FileNotFoundError:
+                pass
+            self._remove_log(doc_id)
+            self._forget(doc_id)
+
+    def _remove_log(self, doc_id):
+        try:
+            os.remove(self.log_path(doc_id))
+        except FileNotFoundError:
+            pass
+        self._dirty.pop(doc_id, None)
+
+    def _compact_locked(self, doc_id, document, seq):
+        """로그를 기본 문서에 반영 (문서 lock 보유 상태에서 호출)"""
+        self._write_base(doc_id, document, seq)
+        self._remove_log(doc_id)
+        self._remember(doc_id, seq, 0)
+        logger.debug(f"Compacted {doc_id} at seq {seq}")
+
+    def compact(self, doc_id):
+        """문서 하나 압축"""
+        with self._lock(doc_id):
+            if not self.has_log(doc_id):
+                self._dirty.pop(doc_id, None)
+                return False
+            document, seq, _ = self._materialize(doc_id)
+            if document is None:
+                self._remove_log(doc_id)
+                self._forget(doc_id)
+                return False
+            self._compact_locked(doc_id, document, seq)
+            return True
+
+    def compact_idle_documents(self):
+        """compact_idle 초 이상 변경이 없던 문서 압축"""
+        now = time.monotonic()
+        compacted = 0
+        for doc_id, changed_at in list(self._dirty.items()):
+            if now - changed_at >= self.compact_idle:
+                try:
+                    compacted += self.compact(doc_id)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Compaction failed for {doc_id}: {str(e)}")
+        return compacted
+
+    def compact_all(self):
+        """디렉토리의 모든 로그 압축 (시작 시 이전 실행에서 남은 로그 정리)"""
+        compacted = 0
+        with os.scandir(self.directory) as entries:
+            doc_ids = [entry.name[:-len('.log')] for entry in entries if entry.name.endswith('.log')]
+        for doc_id in doc_ids:
+            try:
+                compacted += self.compact(doc_id)
+            except (OSError, ValueError) as e:
+                logger.error(f"Compaction failed for {doc_id}: {str(e)}")
+        return compacted
+
+    def start_compactor(self, interval=10.0):
+        """백그라운드 압축 스레드 시작"""
+        if self._compactor is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                self.compact_idle_documents()
+
+        self._compactor = threading.Thread(target=run, name='compactor', daemon=True)
+        self._compactor.start()
+
+    def stats(self):
+        return {'pending_logs': len(self._dirty)}
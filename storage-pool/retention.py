@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Retention
+결과 보존 정책 + 오래된 결과 보관(archive)
+
+- 보존 정책: 생성 후 경과 시간 / 시나리오별 최신 N개 / 상태별 경과 시간
+- 정책에 걸린 결과는 tar.gz 아카이브 하나로 묶어 보관 (결과 문서 + 단계별 시계열)
+  아카이브마다 같은 이름의 manifest(.manifest.json)에 들어 있는 결과 목록 기록
+  (메타데이터 인덱스를 잃어도 manifest로 복구)
+"""
+
+import io
+import json
+import os
+import tarfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from json_codec import write_json_atomic
+
+ARCHIVE_SUFFIX = '.tar.gz'
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def parse_status_ages(value):
+    """'failed=7,completed=90' -> {'failed': 7.0, 'completed': 90.0} (일 단위)"""
+    ages = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            status, days = item.split('=', 1)
+            ages[status.strip()] = float(days)
+    return ages
+
+
+@dataclass
+class RetentionPolicy:
+    """결과 보존 정책 (0 / 빈 값은 해당 규칙 사용 안 함)"""
+
+    max_age_days: float = 0
+    max_per_scenario: int = 0
+    status_max_age_days: dict = field(default_factory=dict)
+    protected_statuses: tuple = ('queued', 'processing')
+    action: str = 'archive'  # archive | delete
+
+    @property
+    def enabled(self):
+        return bool(self.max_age_days or self.max_per_scenario or self.status_max_age_days)
+
+    def candidate_filters(self, now=None):
+        """MetadataIndex.retention_candidates 인자"""
+        now = now or datetime.now()
+        return {
+            'cutoff': (now - timedelta(days=self.max_age_days)).isoformat()
+            if self.max_age_days else None,
+            'status_cutoffs': {
+                status: (now - timedelta(days=days)).isoformat()
+                for status, days in self.status_max_age_days.items()
+            },
+            'max_per_scenario': self.max_per_scenario,
+            'protected_statuses': self.protected_statuses,
+        }
+
+    def describe(self):
+        return {
+            'max_age_days': self.max_age_days,
+            'max_per_scenario': self.max_per_scenario,
+            'status_max_age_days': self.status_max_age_days,
+            'protected_statuses': list(self.protected_statuses),
+            'action': self.action,
+        }
+
+
+class ResultArchiver:
+    """결과 아카이브 (tar.gz) 쓰기 / 읽기"""
+
+    def __init__(self, archive_dir, compresslevel=6):
+        self.archive_dir = archive_dir
+        self.compresslevel = compresslevel
+        os.makedirs(archive_dir, exist_ok=True)
+
+    def path(self, archive_name):
+        if os.sep in archive_name or not archive_name.endswith(ARCHIVE_SUFFIX):
+            raise ValueError(f"Invalid archive name: {archive_name}")
+        return os.path.join(self.archive_dir, archive_name)
+
+    @staticmethod
+    def member_name(simulation_id):
+        return f"results/{simulation_id}.json"
+
+    def write(self, entries):
+        """
+        아카이브 생성, entries: [(simulation_id, 결과 문서, 시계열 파일 경로 목록, manifest 항목)]
+        문서는 한 번에 하나씩 직렬화해서 추가 (메모리 사용량은 문서 하나 크기)
+        (아카이브 이름, 크기, manifest) 반환, 임시 파일에 쓴 후 rename
+        """
+        archive_name = f"results-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}{ARCHIVE_SUFFIX}"
+        path = self.path(archive_name)
+        tmp_path = f"{path}.tmp"
+        manifest = []
+        with tarfile.open(tmp_path, 'w:gz', compresslevel=self.compresslevel) as tar:
+            for simulation_id, document, extra_files, manifest_entry in entries:
+                payload = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                info = tarfile.TarInfo(self.member_name(simulation_id))
+                info.size = len(payload)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(payload))
+                for file_path in extra_files:
+                    tar.add(
+                        file_path,
+                        arcname=f"timeseries/{simulation_id}/{os.path.basename(file_path)}"
+                    )
+                manifest.append({**manifest_entry, 'logical_size': len(payload)})
+        os.replace(tmp_path, path)
+        write_json_atomic(path[: -len(ARCHIVE_SUFFIX)] + MANIFEST_SUFFIX, {
+            'archive': archive_name,
+            'created_at': datetime.now().isoformat(),
+            'results': manifest
+        })
+        return archive_name, os.path.getsize(path), manifest
+
+    def remove(self, archive_name):
+        """아카이브와 manifest 삭제"""
+        path = self.path(archive_name)
+        for file_path in (path, path[: -len(ARCHIVE_SUFFIX)] + MANIFEST_SUFFIX):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def read(self, archive_name, simulation_id):
+        """아카이브에서 결과 문서 하나 조회 (없으면 None)"""
+        try:
+            with tarfile.open(self.path(archive_name), 'r:gz') as tar:
+                member = tar.extractfile(self.member_name(simulation_id))
+                return json.load(member) if member else None
+        except (FileNotFoundError, KeyError):
+            return None
+
+    def manifests(self):
+        """모든 아카이브의 manifest"""
+        with os.scandir(self.archive_dir) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith(MANIFEST_SUFFIX)]
+        for path in sorted(paths):
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
@@ -8,9 +8,30 @@ from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 import json
 import os
-from datetime import datetime
+import hashlib
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
 import logging
 
+import numpy as np
+
+from bulk_transfer import (
+    NDJSON_MIMETYPE, TAR_MIMETYPE,
+    iter_ndjson_export, iter_ndjson_import, iter_tar_export, iter_tar_import
+)
+from chunked_upload import UploadOffsetError, UploadStore
+from content_store import ContentStore, split_document
+from document_cache import DocumentCache, stat_version
+from json_codec import read_json_file, write_json_atomic
+from metadata_index import INDEX_COLUMNS, MetadataIndex
+from patch_log import PatchLogStore
+from retention import ResultArchiver, RetentionPolicy, parse_status_ages
+from timeseries_store import TimeSeriesStore, aggregate_steps, validate_stats
+
 app = Flask(__name__)
 CORS(app)
 
@@ -24,18 +45,97 @@ logger = logging.getLogger(__name__)
 # 저장 디렉토리 설정
 RESULTS_DIR = os.getenv('RESULTS_DIR', '/app/results')
 SCENARIOS_DIR = os.getenv('SCENARIOS_DIR', '/app/scenarios')
+# 결과 캐시 인덱스 (cache_key -> 완료된 simulation_id)
+RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR', os.path.join(RESULTS_DIR, 'cache_index'))
 
 os.makedirs(RESULTS_DIR, exist_ok=True)
 os.makedirs(SCENARIOS_DIR, exist_ok=True)
+os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+
+# 시나리오 / 결과 압축 저장 (gzip | none), 압축 전 파일도 그대로 읽힘
+STORAGE_COMPRESSION = os.getenv('STORAGE_COMPRESSION', 'gzip').lower()
+STORAGE_COMPRESSION_LEVEL = int(os.getenv('STORAGE_COMPRESSION_LEVEL', 6))
+COMPRESS = STORAGE_COMPRESSION == 'gzip'
+
+# 시나리오 본문 (내용 주소 저장, 같은 본문은 한 번만 저장)
+# 시나리오 파일에는 인스턴스별 메타데이터(scenario_id / name / created_at)와 본문 hash만 기록
+# (본문은 배치 / 파라미터 / 환경만 포함, sweep이 이름만 다른 같은 배치를 만들어도 본문 하나 공유)
+SCENARIO_BLOB_DIR = os.getenv('SCENARIO_BLOB_DIR', os.path.join(SCENARIOS_DIR, 'blobs'))
+scenario_blobs = ContentStore(SCENARIO_BLOB_DIR, compress=COMPRESS, level=STORAGE_COMPRESSION_LEVEL)
+SCENARIO_REF_FIELDS = ('scenario_id', 'name', 'created_at')
+
+# 단계별 시계열 (컬럼형 청크, step 범위 조회)
+TIMESERIES_DIR = os.getenv('TIMESERIES_DIR', os.path.join(RESULTS_DIR, 'timeseries'))
+timeseries_store = TimeSeriesStore(TIMESERIES_DIR)
+
+# 메타데이터 인덱스 (목록 / 통계 조회용, 파일 저장 시 함께 갱신)
+METADATA_DB_PATH = os.getenv('METADATA_DB_PATH', os.path.join(RESULTS_DIR, 'metadata.sqlite3'))
+metadata_index = MetadataIndex(METADATA_DB_PATH)
+
+# 결과 문서 (PATCH / append는 변경 로그에 추가, 주기적으로 압축)
+PATCH_LOG_COMPACT_BYTES = int(os.getenv('PATCH_LOG_COMPACT_BYTES', 256 * 1024))
+PATCH_LOG_COMPACT_ENTRIES = int(os.getenv('PATCH_LOG_COMPACT_ENTRIES', 200))
+PATCH_LOG_COMPACT_IDLE = float(os.getenv('PATCH_LOG_COMPACT_IDLE', 30))
+PATCH_LOG_COMPACT_INTERVAL = float(os.getenv('PATCH_LOG_COMPACT_INTERVAL', 10))
+PATCH_LOG_FSYNC = os.getenv('PATCH_LOG_FSYNC', 'false').lower() == 'true'
+result_store = PatchLogStore(
+    RESULTS_DIR,
+    compact_bytes=PATCH_LOG_COMPACT_BYTES,
+    compact_entries=PATCH_LOG_COMPACT_ENTRIES,
+    compact_idle=PATCH_LOG_COMPACT_IDLE,
+    fsync=PATCH_LOG_FSYNC,
+    compress=COMPRESS,
+    level=STORAGE_COMPRESSION_LEVEL
+)
+
+# 자주 조회되는 시나리오 / 결과의 파싱된 문서 캐시 (쓰기 시 / 파일 버전이 바뀌면 무효화)
+# 크기는 파싱된 객체의 추정 메모리 (JSON 크기 x DOCUMENT_CACHE_OBJECT_OVERHEAD,
+# dict / list / float 객체는 JSON 텍스트의 약 4~5배), 기본 한도는 Pod 메모리 제한(512Mi) 기준
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv('DOCUMENT_CACHE_MAX_BYTES', 48 * 1024 * 1024))
+DOCUMENT_CACHE_MAX_ENTRY_BYTES = int(os.getenv('DOCUMENT_CACHE_MAX_ENTRY_BYTES', 8 * 1024 * 1024))
+DOCUMENT_CACHE_OBJECT_OVERHEAD = float(os.getenv('DOCUMENT_CACHE_OBJECT_OVERHEAD', 5))
+document_cache = DocumentCache(DOCUMENT_CACHE_MAX_BYTES, DOCUMENT_CACHE_MAX_ENTRY_BYTES)
+
+# 결과 보존 정책 (0 / 빈 값이면 해당 규칙 사용 안 함)
+# 정책에 걸린 결과는 tar.gz 아카이브로 묶어 보관 (RETENTION_ACTION=delete면 삭제)
+retention_policy = RetentionPolicy(
+    max_age_days=float(os.getenv('RETENTION_MAX_AGE_DAYS', 0)),
+    max_per_scenario=int(os.getenv('RETENTION_MAX_PER_SCENARIO', 0)),
+    status_max_age_days=parse_status_ages(os.getenv('RETENTION_STATUS_MAX_AGE_DAYS', '')),
+    action=os.getenv('RETENTION_ACTION', 'archive').lower()
+)
+RETENTION_INTERVAL = float(os.getenv('RETENTION_INTERVAL', 3600))
+RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 500))
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join(RESULTS_DIR, 'archive'))
+result_archiver = ResultArchiver(ARCHIVE_DIR, STORAGE_COMPRESSION_LEVEL)
+retention_lock = threading.Lock()
+retention_last_run = {}
+
+# 일괄 가져오기: 인덱스 반영 단위 (항목 수)
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 500))
+# 일괄 내보내기: 인덱스 조회 페이지 크기
+EXPORT_PAGE_SIZE = int(os.getenv('EXPORT_PAGE_SIZE', 500))
+# 외부에서 들어온 ID (가져오기) 허용 형식
+VALID_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]*$')
+
+# 분할 업로드: 세션 디렉토리 / 문서 최대 크기 / 청크 최대 크기 / 미완료 세션 보관 시간 (초)
+UPLOAD_DIR = os.getenv('UPLOAD_DIR', os.path.join(SCENARIOS_DIR, 'uploads'))
+UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', 1024 * 1024 * 1024))
+UPLOAD_MAX_CHUNK_BYTES = int(os.getenv('UPLOAD_MAX_CHUNK_BYTES', 16 * 1024 * 1024))
+UPLOAD_TTL = float(os.getenv('UPLOAD_TTL', 3600))
+upload_store = UploadStore(UPLOAD_DIR, UPLOAD_MAX_BYTES)
+
+# 목록 조회 페이지 크기
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 100))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
 
 # ========== Helper Functions ==========
 
 def save_json_file(directory, filename, data):
-    """JSON 파일 저장"""
+    """JSON 파일 저장 (임시 파일에 쓴 후 rename)"""
     filepath = os.path.join(directory, f"{filename}.json")
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json_atomic(filepath, data)
         logger.info(f"Saved file: {filepath}")
         return True
     except Exception as e:
@@ -43,12 +143,10 @@ def save_json_file(directory, filename, data):
         return False
 
 def load_json_file(directory, filename):
-    """JSON 파일 로드"""
+    """JSON 파일 로드 (압축 여부 자동 판별)"""
     filepath = os.path.join(directory, f"{filename}.json")
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
+        return read_json_file(filepath)
     except FileNotFoundError:
         logger.warning(f"File not found: {filepath}")
         return None
@@ -56,14 +154,411 @@ def load_json_file(directory, filename):
         logger.error(f"Error loading file {filepath}: {str(e)}")
         return None
 
-def list_files(directory):
-    """디렉토리의 JSON 파일 목록 반환"""
+def stat_or_none(path):
+    """파일 stat 조회 (없으면 None)"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+def get_file_stat(directory, filename):
+    """JSON 파일 stat 조회 (없으면 None)"""
+    return stat_or_none(os.path.join(directory, f"{filename}.json"))
+
+def cached_document_size(obj_type, obj_id, data, extra_bytes=0):
+    """
+    캐시 항목 크기: 인덱스의 압축 전 크기(+ extra_bytes) x 객체 오버헤드
+    (인덱스에 크기가 없을 때만 직렬화해서 계산)
+    """
+    row = metadata_index.get(obj_type, obj_id)
+    if row and row['logical_size']:
+        logical_size = row['logical_size'] + extra_bytes
+    else:
+        logical_size = len(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return int(logical_size * DOCUMENT_CACHE_OBJECT_OVERHEAD)
+
+def file_etag(file_stat, fields=None):
+    """
+    파일 stat 기반 ETag (mtime + size, 파일을 읽지 않고 계산)
+    필드 projection 응답은 projection마다 다른 ETag
+    """
+    etag = f"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"
+    if fields:
+        etag += '-' + hashlib.md5(','.join(fields).encode('utf-8')).hexdigest()[:8]
+    return etag
+
+def is_not_modified(file_stat, fields=None):
+    """If-None-Match / If-Modified-Since 조건부 요청 평가"""
+    if request.if_none_match:
+        return request.if_none_match.contains(file_etag(file_stat, fields))
+    if request.if_modified_since:
+        last_modified = datetime.fromtimestamp(int(file_stat.st_mtime), tz=timezone.utc)
+        return last_modified <= request.if_modified_since
+    return False
+
+def conditional_response(response, file_stat, fields=None):
+    """응답에 ETag / Last-Modified 헤더 추가"""
+    response.set_etag(file_etag(file_stat, fields))
+    response.last_modified = datetime.fromtimestamp(int(file_stat.st_mtime), tz=timezone.utc)
+    return response
+
+def parse_fields_param(name):
+    """쉼표로 구분된 목록 파라미터 (없으면 None)"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def parse_fields():
+    """?fields=a,b.c 파라미터 (없으면 None)"""
+    return parse_fields_param('fields')
+
+def project_fields(data, fields):
+    """
+    문서에서 요청한 필드만 추출 (점으로 중첩 필드 지정, 예: statistics.avg_snr_db)
+    없는 필드는 생략
+    """
+    if not fields:
+        return data
+    projected = {}
+    for field in fields:
+        parts = field.split('.')
+        value = data
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return projected
+
+def list_from_index(obj_type, collection):
+    """
+    메타데이터 인덱스 목록 조회 공통 처리
+    - limit / cursor: keyset 페이지네이션 (next_cursor로 다음 페이지)
+    - status, scenario_id, created_after, created_before: 필터
+    - order: asc (기본) / desc
+    - fields: 지정하면 ID 대신 인덱스 컬럼 dict 목록 반환
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    fields = parse_fields()
+    if fields:
+        unknown = [field for field in fields if field not in INDEX_COLUMNS]
+        if unknown:
+            return jsonify({
+                'error': f"Unknown fields: {unknown}",
+                'available_fields': list(INDEX_COLUMNS)
+            }), 400
+
+    try:
+        rows, next_cursor, total = metadata_index.query(
+            obj_type,
+            status=request.args.get('status'),
+            scenario_id=request.args.get('scenario_id'),
+            created_after=request.args.get('created_after'),
+            created_before=request.args.get('created_before'),
+            cursor=request.args.get('cursor'),
+            limit=limit,
+            descending=request.args.get('order', 'asc').lower() == 'desc'
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if fields:
+        items = [{field: row[field] for field in fields} for row in rows]
+    else:
+        items = [row['id'] for row in rows]
+    return jsonify({
+        collection: items,
+        'count': len(items),
+        'total': total,
+        'next_cursor': next_cursor
+    }), 200
+
+def describe_scenario(data):
+    """시나리오 인덱스 필드 (status, scenario_id, created_at, logical_size)"""
+    return None, None, data.get('created_at'), data.get('content_size')
+
+def describe_scenario_blob(data):
+    """시나리오 본문 인덱스 필드 (크기는 참조하는 시나리오의 logical_size에 포함)"""
+    return None, None, None, 0
+
+def describe_result(data):
+    """결과 인덱스 필드 (status, scenario_id, created_at, logical_size)"""
+    return (
+        data.get('status'), data.get('scenario_id'),
+        data.get('start_time') or data.get('stored_at'), None
+    )
+
+def describe_cache_entry(data):
+    """결과 캐시 항목 인덱스 필드 (status, scenario_id, created_at, logical_size)"""
+    return None, None, data.get('completed_at'), None
+
+# 인덱스 타입별 (디렉토리, 필드 추출 함수)
+INDEX_SOURCES = {
+    'scenario': (SCENARIOS_DIR, describe_scenario),
+    'scenario_blob': (SCENARIO_BLOB_DIR, describe_scenario_blob),
+    'result': (RESULTS_DIR, describe_result),
+    'cache': (RESULT_CACHE_DIR, describe_cache_entry),
+}
+
+def index_file(obj_type, obj_id, data, logical_size=None, rows=None):
+    """
+    저장된 파일을 메타데이터 인덱스에 반영 (실패해도 저장은 성공으로 처리)
+    logical_size: 압축 전 크기 (None이면 describe 값, 그것도 없으면 기존 값 유지)
+    rows: 목록이 주어지면 바로 반영하지 않고 upsert_many용 행을 추가 (일괄 가져오기)
+    """
+    directory, describe = INDEX_SOURCES[obj_type]
+    try:
+        file_stat = get_file_stat(directory, obj_id)
+        status, scenario_id, created_at, described_size = describe(data)
+        if rows is not None:
+            rows.append((
+                obj_type, obj_id, status, scenario_id, created_at,
+                file_stat.st_size if file_stat else 0,
+                described_size if logical_size is None else logical_size
+            ))
+            return
+        metadata_index.upsert(
+            obj_type, obj_id,
+            status=status,
+            scenario_id=scenario_id,
+            created_at=created_at,
+            size=file_stat.st_size if file_stat else 0,
+            logical_size=described_size if logical_size is None else logical_size
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Failed to index {obj_type} {obj_id}: {str(e)}")
+
+def unindex_file(obj_type, obj_id):
+    """메타데이터 인덱스에서 항목 제거"""
+    try:
+        metadata_index.delete(obj_type, obj_id)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to unindex {obj_type} {obj_id}: {str(e)}")
+
+# 바뀌면 메타데이터 인덱스 / 결과 캐시 갱신이 필요한 결과 필드
+INDEXED_RESULT_FIELDS = {'status', 'scenario_id', 'start_time', 'cache_key'}
+
+def register_result_cache(simulation_id, data):
+    """직접 계산해 완료된 결과는 결과 캐시에 등록"""
+    if (data.get('status') != 'completed' or not data.get('cache_key')
+            or data.get('cached_from')):
+        return
+    cache_entry = {
+        'cache_key': data['cache_key'],
+        'simulation_id': simulation_id,
+        'completed_at': data.get('stored_at') or datetime.now().isoformat()
+    }
+    if save_json_file(RESULT_CACHE_DIR, data['cache_key'], cache_entry):
+        index_file('cache', data['cache_key'], cache_entry)
+
+def store_scenario(scenario_id, data, rows=None):
+    """
+    시나리오 저장: 본문은 내용 주소 저장소에 (같은 본문이면 재사용),
+    시나리오 파일에는 scenario_id / name / created_at / 본문 hash만 기록
+    rows: 인덱스 행을 모을 목록 (index_file 참고)
+    """
     try:
-        files = [f.replace('.json', '') for f in os.listdir(directory) if f.endswith('.json')]
-        return files
+        body, fields = split_document(data, SCENARIO_REF_FIELDS)
+        digest, body_size, _, created = scenario_blobs.put(body)
+        if created:
+            index_file('scenario_blob', digest, body, rows=rows)
+        ref = {
+            **fields,
+            'scenario_id': scenario_id,
+            'created_at': data.get('created_at'),
+            'content_ref': digest,
+            'content_size': body_size
+        }
+        document_cache.invalidate(('scenario', scenario_id))
+        ref_size, _ = write_json_atomic(os.path.join(SCENARIOS_DIR, f"{scenario_id}.json"), ref)
+        index_file('scenario', scenario_id, ref, logical_size=body_size + ref_size, rows=rows)
+        return True
     except Exception as e:
-        logger.error(f"Error listing files in {directory}: {str(e)}")
-        return []
+        logger.error(f"Error saving scenario {scenario_id}: {str(e)}")
+        return False
+
+def store_result(simulation_id, data, rows=None):
+    """
+    결과 문서 전체 저장 (남아 있는 변경 로그는 폐기), rows: index_file 참고
+    보관된 결과를 다시 저장(아카이브 재가져오기 등)하면 보관 항목은 인덱스에서 제거
+    """
+    logical_size, _ = result_store.save(simulation_id, data)
+    document_cache.invalidate(('result', simulation_id))
+    unindex_file('archived_result', simulation_id)
+    index_file('result', simulation_id, data, logical_size=logical_size, rows=rows)
+    register_result_cache(simulation_id, data)
+
+def load_scenario(scenario_id):
+    """시나리오 조회 (본문 hash 참조를 풀어 저장 당시와 같은 문서 반환)"""
+    ref = load_json_file(SCENARIOS_DIR, scenario_id)
+    if not ref or 'content_ref' not in ref:
+        # 내용 주소 저장 도입 전에 저장된 시나리오
+        return ref
+    body = scenario_blobs.get(ref['content_ref'])
+    if body is None:
+        logger.error(f"Missing scenario body {ref['content_ref']} for {scenario_id}")
+        return None
+    # 본문에 name이 들어 있던 이전 시나리오도 그대로 조회되도록 ref에 있는 필드만 덮어씀
+    return {**body, **{field: ref[field] for field in SCENARIO_REF_FIELDS if field in ref}}
+
+def cached_scenario(scenario_id, file_stat):
+    """시나리오 조회 (문서 캐시 경유, 시나리오 파일 버전으로 검증)"""
+    key = ('scenario', scenario_id)
+    version = stat_version(file_stat)
+    data = document_cache.get(key, version)
+    if data is None:
+        data = load_scenario(scenario_id)
+        if data:
+            document_cache.put(key, version, data, cached_document_size('scenario', scenario_id, data))
+    return data
+
+def load_result(simulation_id):
+    """결과 조회 (문서 캐시 경유, 기본 문서 + 변경 로그 파일 버전으로 검증)"""
+    base_stat = stat_or_none(result_store.doc_path(simulation_id))
+    if base_stat is None:
+        return None
+    key = ('result', simulation_id)
+    log_stat = stat_or_none(result_store.log_path(simulation_id))
+    version = stat_version(base_stat, log_stat)
+    data = document_cache.get(key, version)
+    if data is None:
+        data = result_store.load(simulation_id)
+        if data:
+            # 인덱스 크기는 마지막 전체 저장 기준이므로 변경 로그 크기를 더함
+            size = cached_document_size(
+                'result', simulation_id, data, log_stat.st_size if log_stat else 0
+            )
+            document_cache.put(key, version, data, size)
+    return data
+
+def load_archived_result(simulation_id):
+    """보관된 결과 조회 (보관되지 않았으면 None)"""
+    row = metadata_index.get('archived_result', simulation_id)
+    if not row or not row['location']:
+        return None
+    return result_archiver.read(row['location'], simulation_id)
+
+def remove_result(simulation_id):
+    """결과 문서 / 변경 로그 / 시계열 삭제 및 인덱스 / 캐시에서 제거"""
+    result_store.delete(simulation_id)
+    timeseries_store.delete(simulation_id)
+    document_cache.invalidate(('result', simulation_id))
+    unindex_file('result', simulation_id)
+
+def archive_results(rows):
+    """결과를 아카이브 하나로 묶은 후 원본 삭제, 보관한 결과 수 반환"""
+    def entries():
+        for row in rows:
+            data = result_store.load(row['id'])
+            if data is None:
+                unindex_file('result', row['id'])
+                continue
+            yield row['id'], data, timeseries_store.files(row['id']), {
+                'id': row['id'],
+                'status': row['status'],
+                'scenario_id': row['scenario_id'],
+                'created_at': row['created_at']
+            }
+
+    archive_name, archive_size, manifest = result_archiver.write(entries())
+    if not manifest:
+        result_archiver.remove(archive_name)
+        return 0
+    metadata_index.upsert('archive', archive_name, size=archive_size, logical_size=0)
+    for entry in manifest:
+        remove_result(entry['id'])
+        metadata_index.upsert(
+            'archived_result', entry['id'],
+            status=entry['status'],
+            scenario_id=entry['scenario_id'],
+            created_at=entry['created_at'],
+            size=0,
+            logical_size=entry['logical_size'],
+            location=archive_name
+        )
+    logger.info(f"Archived {len(manifest)} results into {archive_name} ({archive_size} bytes)")
+    return len(manifest)
+
+def run_retention(dry_run=False, limit=None):
+    """보존 정책 적용 (한 번에 limit개까지), 실행 요약 반환"""
+    with retention_lock:
+        started = time.monotonic()
+        candidates = metadata_index.retention_candidates(
+            'result', limit=limit or RETENTION_BATCH_SIZE, **retention_policy.candidate_filters()
+        )
+        summary = {
+            'action': retention_policy.action,
+            'dry_run': dry_run,
+            'candidates': len(candidates),
+            'processed': 0,
+            'started_at': datetime.now().isoformat()
+        }
+        if dry_run:
+            summary['simulation_ids'] = [row['id'] for row in candidates]
+            return summary
+        
+        if candidates and retention_policy.action == 'archive':
+            summary['processed'] = archive_results(candidates)
+        elif candidates and retention_policy.action == 'delete':
+            for row in candidates:
+                remove_result(row['id'])
+            summary['processed'] = len(candidates)
+            logger.info(f"Deleted {len(candidates)} results by retention policy")
+        summary['duration_seconds'] = round(time.monotonic() - started, 3)
+        retention_last_run.clear()
+        retention_last_run.update(summary)
+        return summary
+
+def start_retention_worker():
+    """백그라운드 보존 정책 적용 스레드 (대상이 남아 있으면 이어서 처리)"""
+    def run():
+        while True:
+            time.sleep(RETENTION_INTERVAL)
+            try:
+                while run_retention()['processed'] >= RETENTION_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"Retention run failed: {str(e)}")
+
+    threading.Thread(target=run, name='retention', daemon=True).start()
+
+def restore_archive_index():
+    """인덱스에 보관 항목이 없으면 아카이브 manifest로 복구"""
+    if metadata_index.count('archive'):
+        return
+    for manifest in result_archiver.manifests():
+        archive_name = manifest['archive']
+        metadata_index.upsert(
+            'archive', archive_name,
+            created_at=manifest['created_at'],
+            size=os.path.getsize(result_archiver.path(archive_name)),
+            logical_size=0
+        )
+        for entry in manifest['results']:
+            metadata_index.upsert(
+                'archived_result', entry['id'],
+                status=entry['status'],
+                scenario_id=entry['scenario_id'],
+                created_at=entry['created_at'],
+                logical_size=entry['logical_size'],
+                location=archive_name
+            )
+        logger.info(f"Restored archive index from {archive_name}")
+
+def has_json_files(directory):
+    """디렉토리에 JSON 파일이 하나라도 있는지 확인"""
+    with os.scandir(directory) as entries:
+        return any(entry.name.endswith('.json') for entry in entries)
 
 # ========== Health Check ==========
 
@@ -73,6 +568,7 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'storage-pool',
+        'document_cache': document_cache.stats(),
         'timestamp': datetime.now().isoformat()
     }), 200
 
@@ -90,7 +586,7 @@ def save_scenario(scenario_id):
         data['scenario_id'] = scenario_id
         data['created_at'] = datetime.now().isoformat()
         
-        if save_json_file(SCENARIOS_DIR, scenario_id, data):
+        if store_scenario(scenario_id, data):
             logger.info(f"Scenario saved: {scenario_id}")
             return jsonify({
                 'status': 'success',
@@ -104,13 +600,58 @@ def save_scenario(scenario_id):
         logger.error(f"Error in save_scenario: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/scenarios/batch', methods=['POST'])
+def save_scenario_batch():
+    """여러 시나리오를 한 번의 요청으로 저장"""
+    try:
+        data = request.get_json()
+        scenarios = data.get('scenarios') if data else None
+        if not scenarios:
+            return jsonify({'error': 'No scenarios provided'}), 400
+        
+        created_at = datetime.now().isoformat()
+        saved, failed = [], []
+        for scenario in scenarios:
+            scenario_id = scenario.get('scenario_id')
+            if not scenario_id:
+                failed.append(None)
+                continue
+            scenario['created_at'] = created_at
+            if store_scenario(scenario_id, scenario):
+                saved.append(scenario_id)
+            else:
+                failed.append(scenario_id)
+        
+        logger.info(f"Scenario batch saved: {len(saved)} saved, {len(failed)} failed")
+        return jsonify({
+            'status': 'success' if not failed else 'partial',
+            'scenario_ids': saved,
+            'failed': failed,
+            'count': len(saved)
+        }), 201 if not failed else 207
+            
+    except Exception as e:
+        logger.error(f"Error in save_scenario_batch: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/scenarios/<scenario_id>', methods=['GET'])
 def get_scenario(scenario_id):
-    """시나리오 데이터 조회"""
+    """시나리오 데이터 조회 (ETag / Last-Modified 조건부 GET, ?fields= projection 지원)"""
     try:
-        data = load_json_file(SCENARIOS_DIR, scenario_id)
+        file_stat = get_file_stat(SCENARIOS_DIR, scenario_id)
+        if file_stat is None:
+            return jsonify({'error': 'Scenario not found'}), 404
+
+        # 캐시된 사본이 최신이면 파일을 읽지 않고 304 반환
+        fields = parse_fields()
+        if is_not_modified(file_stat, fields):
+            return conditional_response(app.response_class(status=304), file_stat, fields)
+
+        data = cached_scenario(scenario_id, file_stat)
         if data:
-            return jsonify(data), 200
+            return conditional_response(
+                jsonify(project_fields(data, fields)), file_stat, fields
+            ), 200
         else:
             return jsonify({'error': 'Scenario not found'}), 404
     except Exception as e:
@@ -119,13 +660,9 @@ def get_scenario(scenario_id):
 
 @app.route('/scenarios', methods=['GET'])
 def list_scenarios():
-    """시나리오 목록 조회"""
+    """시나리오 목록 조회 (메타데이터 인덱스, 페이지네이션 / 필터)"""
     try:
-        scenarios = list_files(SCENARIOS_DIR)
-        return jsonify({
-            'scenarios': scenarios,
-            'count': len(scenarios)
-        }), 200
+        return list_from_index('scenario', 'scenarios')
     except Exception as e:
         logger.error(f"Error in list_scenarios: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -144,27 +681,89 @@ def save_result(simulation_id):
         data['simulation_id'] = simulation_id
         data['stored_at'] = datetime.now().isoformat()
         
-        if save_json_file(RESULTS_DIR, simulation_id, data):
-            logger.info(f"Result saved: {simulation_id}")
-            return jsonify({
-                'status': 'success',
-                'simulation_id': simulation_id,
-                'message': 'Result saved successfully'
-            }), 201
-        else:
-            return jsonify({'error': 'Failed to save result'}), 500
+        store_result(simulation_id, data)
+        logger.info(f"Result saved: {simulation_id}")
+        return jsonify({
+            'status': 'success',
+            'simulation_id': simulation_id,
+            'message': 'Result saved successfully'
+        }), 201
             
     except Exception as e:
         logger.error(f"Error in save_result: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/results/<simulation_id>', methods=['PATCH'])
+def patch_result(simulation_id):
+    """
+    결과 필드 갱신 (JSON Merge Patch: 중첩 dict는 병합, null은 필드 삭제)
+    문서 전체를 다시 쓰지 않고 변경 로그에 한 줄 추가
+    """
+    try:
+        patch = request.get_json()
+        if not isinstance(patch, dict) or not patch:
+            return jsonify({'error': 'JSON object patch required'}), 400
+        patch.pop('simulation_id', None)
+        
+        patched = result_store.patch(simulation_id, patch)
+        document_cache.invalidate(('result', simulation_id))
+        if not patched:
+            return jsonify({'error': 'Result not found'}), 404
+        
+        # 인덱스 필드가 바뀐 경우에만 문서를 재구성해 인덱스 갱신 (진행률만 바뀌면 로그 추가로 끝)
+        if INDEXED_RESULT_FIELDS & patch.keys():
+            data = result_store.load(simulation_id)
+            index_file('result', simulation_id, data)
+            register_result_cache(simulation_id, data)
+        return jsonify({'status': 'success', 'simulation_id': simulation_id}), 200
+    except Exception as e:
+        logger.error(f"Error in patch_result: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/results/<simulation_id>/append', methods=['POST'])
+def append_result(simulation_id):
+    """
+    결과의 리스트 필드에 값 추가 (단계별 값 청크 등)
+    body: {"path": "statistics.avg_snr_db_per_step", "values": [...]}
+    """
+    try:
+        data = request.get_json()
+        if not data or not data.get('path') or not isinstance(data.get('values'), list):
+            return jsonify({'error': 'path and values (list) are required'}), 400
+        
+        appended = result_store.append(simulation_id, data['path'], data['values'])
+        document_cache.invalidate(('result', simulation_id))
+        if not appended:
+            return jsonify({'error': 'Result not found'}), 404
+        return jsonify({
+            'status': 'success',
+            'simulation_id': simulation_id,
+            'appended': len(data['values'])
+        }), 200
+    except Exception as e:
+        logger.error(f"Error in append_result: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/results/<simulation_id>', methods=['GET'])
 def get_result(simulation_id):
-    """시뮬레이션 결과 조회"""
+    """
+    시뮬레이션 결과 조회 (캐시 재사용 결과는 원본 결과를 함께 반환)
+    ?fields=status,progress 로 필요한 필드만 조회
+    """
     try:
-        data = load_json_file(RESULTS_DIR, simulation_id)
+        data = load_result(simulation_id)
+        archived = data is None
+        if archived:
+            data = load_archived_result(simulation_id)
+        if data and data.get('cached_from'):
+            source = load_result(data['cached_from']) or load_archived_result(data['cached_from'])
+            if source:
+                data = {**source, **data}
         if data:
-            return jsonify(data), 200
+            response = jsonify(project_fields(data, parse_fields()))
+            if archived:
+                response.headers['X-Archived'] = 'true'
+            return response, 200
         else:
             return jsonify({'error': 'Result not found'}), 404
     except Exception as e:
@@ -173,38 +772,563 @@ def get_result(simulation_id):
 
 @app.route('/results', methods=['GET'])
 def list_results():
-    """결과 목록 조회"""
+    """결과 목록 조회 (메타데이터 인덱스, 페이지네이션 / 필터)"""
     try:
-        results = list_files(RESULTS_DIR)
-        return jsonify({
-            'results': results,
-            'count': len(results)
-        }), 200
+        return list_from_index('result', 'results')
     except Exception as e:
         logger.error(f"Error in list_results: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# ========== Time Series ==========
+
+@app.route('/timeseries/<simulation_id>', methods=['POST'])
+def save_timeseries_chunk(simulation_id):
+    """
+    시계열 청크 저장
+    body: {"start_step": 0, "user_ids": [...], "columns": {"snr_db": [[...], ...], ...}}
+    """
+    try:
+        data = request.get_json()
+        if not data or 'columns' not in data or 'user_ids' not in data:
+            return jsonify({'error': 'start_step, user_ids and columns are required'}), 400
+        
+        chunk = timeseries_store.write_chunk(
+            simulation_id,
+            int(data.get('start_step', 0)),
+            data['user_ids'],
+            data['columns']
+        )
+        logger.info(
+            f"Time series chunk saved: {simulation_id} "
+            f"steps {chunk['start_step']}-{chunk['end_step']}"
+        )
+        return jsonify({'status': 'success', 'simulation_id': simulation_id, **chunk}), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in save_timeseries_chunk: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/timeseries/<simulation_id>', methods=['GET'])
+def query_timeseries(simulation_id):
+    """
+    시계열 범위 조회 (겹치는 청크 / 요청한 컬럼만 읽음)
+    ?start=0&end=100 (end 미포함), ?columns=snr_db,best_bs, ?users=user_0001,user_0002
+    """
+    try:
+        start_step = int(request.args.get('start', 0))
+        end_step = int(request.args['end']) if 'end' in request.args else None
+        columns = parse_fields_param('columns')
+        users = parse_fields_param('users')
+        
+        result = timeseries_store.read(simulation_id, start_step, end_step, columns, users)
+        if result is None:
+            # 결과 캐시로 완료된 시뮬레이션은 원본 시뮬레이션의 시계열 사용
+            data = load_result(simulation_id)
+            if data and data.get('cached_from'):
+                result = timeseries_store.read(
+                    data['cached_from'], start_step, end_step, columns, users
+                )
+        if result is None:
+            return jsonify({'error': 'Time series not found'}), 404
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in query_timeseries: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def parse_groups_param():
+    """?groups=edge:user_0001,user_0002;center:user_0003 -> {그룹: 사용자 목록} (없으면 None)"""
+    value = request.args.get('groups')
+    if not value:
+        return None
+    groups = {}
+    for item in value.split(';'):
+        name, _, members = item.partition(':')
+        if not name.strip() or not members.strip():
+            raise ValueError(f"Invalid group: {item}")
+        groups[name.strip()] = [member.strip() for member in members.split(',') if member.strip()]
+    return groups
+
+def aggregate_result_statistics(simulation_id, start_step, end_step, bucket_steps, points, stats):
+    """
+    시계열이 없는 결과 (시계열 저장 도입 전 / 보관된 결과)는 결과 문서의
+    단계별 평균 SNR(statistics.avg_snr_db_per_step)로 집계 (snr_db, 전체 사용자만)
+    """
+    data = load_result(simulation_id) or load_archived_result(simulation_id)
+    per_step = ((data or {}).get('statistics') or {}).get('avg_snr_db_per_step')
+    if not per_step:
+        return None
+    end_step = len(per_step) if end_step is None else min(end_step, len(per_step))
+    values = np.asarray(per_step[start_step:end_step], dtype=float).reshape(-1, 1)
+    if not bucket_steps:
+        bucket_steps = max(1, -(-len(values) // max(1, points)))
+    result = {
+        'simulation_id': simulation_id,
+        'column': 'snr_db',
+        'source': 'result_statistics',
+        'start_step': start_step,
+        'end_step': end_step,
+        'bucket_steps': bucket_steps,
+        'stats': stats,
+        'steps': [],
+        'series': {}
+    }
+    if len(values):
+        result.update(aggregate_steps(values, range(start_step, start_step + len(values)), bucket_steps, stats))
+    return result
+
+@app.route('/timeseries/<simulation_id>/aggregate', methods=['GET'])
+def aggregate_timeseries(simulation_id):
+    """
+    시계열 구간별 집계 (차트에 필요한 점만 반환)
+    ?column=snr_db (기본), ?start=&end=: step 범위
+    ?bucket=N: N step 구간 / ?points=500: 구간 수 상한 (bucket이 없을 때)
+    ?stats=mean,min,max (기본), count, p5, p50, p95 등 백분위
+    ?group_by=user: 사용자별 / ?groups=edge:user_0001,user_0002;center:user_0003: 사용자 그룹별
+    """
+    try:
+        column = request.args.get('column', 'snr_db')
+        start_step = max(0, int(request.args.get('start', 0)))
+        end_step = int(request.args['end']) if 'end' in request.args else None
+        bucket_steps = int(request.args['bucket']) if 'bucket' in request.args else None
+        points = int(request.args.get('points', 500))
+        if (bucket_steps is not None and bucket_steps < 1) or points < 1:
+            return jsonify({'error': 'bucket and points must be positive'}), 400
+        stats = parse_fields_param('stats') or ['mean', 'min', 'max']
+        validate_stats(stats)
+        group_by = request.args.get('group_by')
+        groups = parse_groups_param()
+        
+        def aggregate(source_id):
+            return timeseries_store.aggregate(
+                source_id, column, start_step, end_step, bucket_steps, points,
+                stats, group_by, groups
+            )
+        
+        result = aggregate(simulation_id)
+        if result is None:
+            # 결과 캐시로 완료된 시뮬레이션은 원본 시뮬레이션의 시계열 사용
+            data = load_result(simulation_id)
+            source_id = data.get('cached_from') if data else None
+            if source_id:
+                result = aggregate(source_id)
+            if result is None and column == 'snr_db' and not group_by and not groups:
+                result = aggregate_result_statistics(
+                    source_id or simulation_id, start_step, end_step, bucket_steps, points, stats
+                )
+        if result is None:
+            return jsonify({'error': 'Time series not found'}), 404
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in aggregate_timeseries: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/timeseries/<simulation_id>/meta', methods=['GET'])
+def get_timeseries_meta(simulation_id):
+    """시계열 메타데이터 (사용자, 컬럼, 청크 범위)"""
+    try:
+        meta = timeseries_store.load_meta(simulation_id)
+        if meta is None:
+            return jsonify({'error': 'Time series not found'}), 404
+        return jsonify(meta), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in get_timeseries_meta: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ========== Result Cache ==========
+
+@app.route('/cache/<cache_key>', methods=['GET'])
+def get_cached_result(cache_key):
+    """캐시 키로 완료된 결과 조회"""
+    try:
+        entry = load_json_file(RESULT_CACHE_DIR, cache_key)
+        if not entry:
+            return jsonify({'error': 'Cache entry not found'}), 404
+        
+        # 원본 결과가 없거나 완료 상태가 아니면 무효화
+        source = load_result(entry['simulation_id'])
+        if not source or source.get('status') != 'completed':
+            os.remove(os.path.join(RESULT_CACHE_DIR, f"{cache_key}.json"))
+            unindex_file('cache', cache_key)
+            logger.info(f"Invalidated stale cache entry: {cache_key}")
+            return jsonify({'error': 'Cache entry not found'}), 404
+        
+        return jsonify(entry), 200
+    except Exception as e:
+        logger.error(f"Error in get_cached_result: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # ========== Statistics ==========
 
 @app.route('/stats', methods=['GET'])
 def get_stats():
-    """스토리지 통계"""
+    """스토리지 통계 (메타데이터 인덱스 집계)"""
     try:
-        scenario_count = len(list_files(SCENARIOS_DIR))
-        result_count = len(list_files(RESULTS_DIR))
+        index_stats = metadata_index.stats()
+        by_type = index_stats['by_type']
+        stored_bytes = sum(stats['bytes'] for stats in by_type.values())
+        logical_bytes = sum(stats['logical_bytes'] for stats in by_type.values())
         
         return jsonify({
-            'scenarios': scenario_count,
-            'results': result_count,
+            'scenarios': by_type.get('scenario', {}).get('count', 0),
+            'results': by_type.get('result', {}).get('count', 0),
+            'result_cache_entries': by_type.get('cache', {}).get('count', 0),
+            'results_by_status': index_stats['by_status'].get('result', {}),
+            'bytes': {obj_type: stats['bytes'] for obj_type, stats in by_type.items()},
+            'storage': {
+                'compression': STORAGE_COMPRESSION,
+                'unique_scenario_bodies': by_type.get('scenario_blob', {}).get('count', 0),
+                'logical_bytes': {
+                    obj_type: stats['logical_bytes'] for obj_type, stats in by_type.items()
+                },
+                'stored_bytes_total': stored_bytes,
+                'logical_bytes_total': logical_bytes,
+                'saved_bytes': logical_bytes - stored_bytes,
+                'savings_ratio': round(1 - stored_bytes / logical_bytes, 4) if logical_bytes else 0.0
+            },
+            'result_patch_logs': result_store.stats(),
+            'document_cache': document_cache.stats(),
+            'usage': {
+                'by_type': by_type,
+                'results_bytes_by_status': index_stats['bytes_by_status'].get('result', {}),
+                'archived_results': by_type.get('archived_result', {}).get('count', 0),
+                'pending_uploads': upload_store.count(),
+                'disk': dict(zip(('total', 'used', 'free'), shutil.disk_usage(RESULTS_DIR)))
+            },
+            'retention': {
+                'policy': retention_policy.describe(),
+                'last_run': retention_last_run or None
+            },
             'timestamp': datetime.now().isoformat()
         }), 200
     except Exception as e:
         logger.error(f"Error in get_stats: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# ========== Bulk Export / Import ==========
+
+def iter_index_ids(obj_type, **filters):
+    """메타데이터 인덱스 ID를 페이지 단위로 조회 (keyset 페이지네이션)"""
+    cursor = None
+    while True:
+        rows, cursor, _ = metadata_index.query(
+            obj_type, cursor=cursor, limit=EXPORT_PAGE_SIZE, **filters
+        )
+        for row in rows:
+            yield row['id']
+        if not cursor:
+            return
+
+def export_records(types, filters, include_timeseries):
+    """내보낼 (type, id, 문서, 시계열 파일 목록), 문서 캐시를 거치지 않고 하나씩 읽음"""
+    for obj_type in types:
+        if obj_type == 'scenario':
+            # 시나리오 항목에는 scenario_id 컬럼이 없으므로 ID로 직접 조회
+            if filters.get('scenario_id'):
+                ids = [filters['scenario_id']]
+            else:
+                ids = iter_index_ids(
+                    'scenario',
+                    created_after=filters.get('created_after'),
+                    created_before=filters.get('created_before')
+                )
+            for scenario_id in ids:
+                data = load_scenario(scenario_id)
+                if data:
+                    yield 'scenario', scenario_id, data, []
+        else:
+            for simulation_id in iter_index_ids('result', **filters):
+                data = result_store.load(simulation_id)
+                if data:
+                    files = timeseries_store.files(simulation_id) if include_timeseries else []
+                    yield 'result', simulation_id, data, files
+
+@app.route('/export', methods=['GET'])
+def export_bulk():
+    """
+    시나리오 / 결과 일괄 내보내기 (스트리밍, 메모리 사용량 일정)
+    ?types=scenario,result (기본 둘 다), ?format=ndjson (기본) | tar
+    필터: status, scenario_id, created_after, created_before
+    ?timeseries=false: tar 형식에서 단계별 시계열 제외
+    """
+    try:
+        types = parse_fields_param('types') or ['scenario', 'result']
+        unknown = [obj_type for obj_type in types if obj_type not in ('scenario', 'result')]
+        if unknown:
+            return jsonify({'error': f"Unknown types: {unknown}"}), 400
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in ('ndjson', 'tar'):
+            return jsonify({'error': 'format must be ndjson or tar'}), 400
+        
+        filters = {
+            name: request.args.get(name)
+            for name in ('status', 'scenario_id', 'created_after', 'created_before')
+        }
+        include_timeseries = request.args.get('timeseries', 'true').lower() == 'true'
+        records = export_records(types, filters, include_timeseries)
+        
+        filename = f"storage-export-{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+        if export_format == 'tar':
+            body = iter_tar_export(records, STORAGE_COMPRESSION_LEVEL)
+            mimetype, filename = TAR_MIMETYPE, f"{filename}.tar.gz"
+        else:
+            body = iter_ndjson_export(records)
+            mimetype, filename = NDJSON_MIMETYPE, f"{filename}.ndjson"
+        
+        logger.info(f"Bulk export started: types={types}, format={export_format}")
+        response = app.response_class(body, mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    except Exception as e:
+        logger.error(f"Error in export_bulk: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/import', methods=['POST'])
+def import_bulk():
+    """
+    /export 형식 (또는 결과 아카이브) 일괄 가져오기 (스트림을 항목 단위로 읽음)
+    Content-Type: application/x-ndjson (Content-Encoding: gzip 가능) | application/gzip, application/x-tar
+    ?overwrite=true: 이미 있는 항목도 덮어씀 (기본은 건너뜀, 같은 스트림을 다시 가져와도 안전)
+    인덱스는 IMPORT_BATCH_SIZE 항목마다 한 트랜잭션으로 반영
+    """
+    try:
+        overwrite = request.args.get('overwrite', 'false').lower() == 'true'
+        content_type = request.mimetype
+        if content_type in (NDJSON_MIMETYPE, 'application/json', 'text/plain'):
+            items = iter_ndjson_import(
+                request.stream, compressed=request.content_encoding == 'gzip'
+            )
+        elif content_type in (TAR_MIMETYPE, 'application/x-tar', 'application/x-gzip',
+                              'application/octet-stream'):
+            items = iter_tar_import(request.stream)
+        else:
+            return jsonify({'error': f"Unsupported content type: {content_type}"}), 415
+        
+        counts = {'scenario': 0, 'result': 0, 'timeseries_files': 0, 'skipped': 0}
+        failed = []
+        rows = []
+        batches = 0
+        
+        def flush():
+            nonlocal batches
+            if rows:
+                try:
+                    metadata_index.upsert_many(rows)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to index import batch: {str(e)}")
+                rows.clear()
+                batches += 1
+        
+        # 중간에 잘못된 항목을 만나도 그때까지 저장한 항목은 인덱스에 반영
+        try:
+            for kind, obj_type, obj_id, payload in items:
+                if not VALID_ID_PATTERN.match(obj_id):
+                    failed.append(obj_id)
+                    continue
+                if kind == 'file':
+                    timeseries_store.import_file(obj_id, *payload)
+                    counts['timeseries_files'] += 1
+                    continue
+                
+                directory = SCENARIOS_DIR if obj_type == 'scenario' else RESULTS_DIR
+                if not overwrite and get_file_stat(directory, obj_id):
+                    counts['skipped'] += 1
+                    continue
+                if obj_type == 'scenario':
+                    if not store_scenario(obj_id, {**payload, 'scenario_id': obj_id}, rows=rows):
+                        failed.append(obj_id)
+                        continue
+                else:
+                    store_result(obj_id, {**payload, 'simulation_id': obj_id}, rows=rows)
+                counts[obj_type] += 1
+                if len(rows) >= IMPORT_BATCH_SIZE:
+                    flush()
+        finally:
+            flush()
+        
+        logger.info(f"Bulk import finished: {counts}, {len(failed)} failed")
+        return jsonify({
+            'status': 'success' if not failed else 'partial',
+            'imported': counts,
+            'batches': batches,
+            'failed': failed[:100],
+            'failed_count': len(failed)
+        }), 200 if not failed else 207
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in import_bulk: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ========== Chunked Upload ==========
+
+@app.route('/uploads', methods=['POST'])
+def create_upload():
+    """
+    분할 업로드 세션 생성 {"type": "scenario" | "result", "id": ...}
+    이후 PUT /uploads/<upload_id>?offset=N 으로 청크 전송, POST /uploads/<upload_id>/complete로 저장
+    """
+    try:
+        data = request.get_json() or {}
+        obj_type, obj_id = data.get('type'), str(data.get('id') or '')
+        if not VALID_ID_PATTERN.match(obj_id):
+            return jsonify({'error': f"Invalid id: {obj_id}"}), 400
+        expired = upload_store.expire(UPLOAD_TTL)
+        if expired:
+            logger.info(f"Expired {expired} stale upload sessions")
+        upload_id = upload_store.create(obj_type, obj_id)
+        return jsonify({
+            'upload_id': upload_id,
+            'type': obj_type,
+            'id': obj_id,
+            'offset': 0,
+            'max_chunk_bytes': UPLOAD_MAX_CHUNK_BYTES
+        }), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in create_upload: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/uploads/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """업로드 세션 상태 (offset: 지금까지 받은 바이트 수, 이어서 보낼 위치)"""
+    try:
+        return jsonify(upload_store.describe(upload_id)), 200
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except Exception as e:
+        logger.error(f"Error in get_upload: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """
+    청크 전송 (본문: 원본 바이트, ?offset=: 청크 시작 위치)
+    이미 받은 범위는 건너뛰므로 같은 청크를 다시 보내도 안전, 중간이 비면 409 + 받은 위치
+    """
+    try:
+        offset = int(request.args.get('offset', 0))
+        if request.content_length and request.content_length > UPLOAD_MAX_CHUNK_BYTES:
+            return jsonify({'error': f"Chunk exceeds {UPLOAD_MAX_CHUNK_BYTES} bytes"}), 413
+        received = upload_store.append(upload_id, offset, request.get_data(cache=False))
+        return jsonify({'upload_id': upload_id, 'offset': received}), 200
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except UploadOffsetError as e:
+        return jsonify({'error': str(e), 'offset': e.expected}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in upload_chunk: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """받은 본문(JSON, gzip 가능)을 시나리오 / 결과로 저장하고 세션 삭제"""
+    try:
+        try:
+            meta, data = upload_store.load(upload_id)
+        except KeyError:
+            return jsonify({'error': 'Upload not found'}), 404
+        except (ValueError, OSError, EOFError) as e:
+            return jsonify({'error': f"Uploaded body is not valid JSON: {str(e)}"}), 400
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Uploaded body must be a JSON object'}), 400
+        
+        obj_type, obj_id = meta['type'], meta['id']
+        if obj_type == 'scenario':
+            data['scenario_id'] = obj_id
+            data['created_at'] = datetime.now().isoformat()
+            if not store_scenario(obj_id, data):
+                return jsonify({'error': 'Failed to save scenario'}), 500
+        else:
+            data['simulation_id'] = obj_id
+            store_result(obj_id, data)
+        upload_store.remove(upload_id)
+        
+        logger.info(f"Chunked upload completed: {obj_type} {obj_id} ({meta['offset']} bytes)")
+        return jsonify({
+            'status': 'success',
+            'type': obj_type,
+            'id': obj_id,
+            'bytes': meta['offset']
+        }), 201
+    except Exception as e:
+        logger.error(f"Error in complete_upload: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_upload(upload_id):
+    """업로드 세션 취소"""
+    try:
+        upload_store.remove(upload_id)
+        return jsonify({'status': 'aborted', 'upload_id': upload_id}), 200
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except Exception as e:
+        logger.error(f"Error in abort_upload: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ========== Retention ==========
+
+@app.route('/retention/run', methods=['POST'])
+def run_retention_now():
+    """
+    보존 정책 즉시 적용
+    ?dry_run=true: 대상 결과 목록만 반환, ?limit=N: 최대 처리 수
+    """
+    try:
+        if not retention_policy.enabled:
+            return jsonify({'error': 'No retention policy configured'}), 400
+        dry_run = request.args.get('dry_run', 'false').lower() == 'true'
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        return jsonify(run_retention(dry_run=dry_run, limit=limit)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in run_retention_now: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ========== Metadata Index ==========
+
+@app.route('/index/rebuild', methods=['POST'])
+def rebuild_index():
+    """JSON 파일로부터 메타데이터 인덱스 재구축"""
+    try:
+        result_store.compact_all()
+        counts = metadata_index.rebuild(INDEX_SOURCES)
+        return jsonify({
+            'status': 'rebuilt',
+            'counts': counts,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        logger.error(f"Error in rebuild_index: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def ensure_index():
+    """인덱스가 비어 있는데 저장된 파일이 있으면 (기존 볼륨 / 인덱스 유실) 재구축"""
+    indexed = sum(metadata_index.count(obj_type) for obj_type in INDEX_SOURCES)
+    if indexed == 0 and any(has_json_files(directory) for directory, _ in INDEX_SOURCES.values()):
+        logger.info("Metadata index is empty, rebuilding from files")
+        metadata_index.rebuild(INDEX_SOURCES)
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8080))
     logger.info(f"Starting Storage Pool Service on port {port}")
     logger.info(f"Results directory: {RESULTS_DIR}")
     logger.info(f"Scenarios directory: {SCENARIOS_DIR}")
+    result_store.compact_all()
+    result_store.start_compactor(PATCH_LOG_COMPACT_INTERVAL)
+    ensure_index()
+    restore_archive_index()
+    if retention_policy.enabled and RETENTION_INTERVAL > 0:
+        start_retention_worker()
     app.run(host='0.0.0.0', port=port, debug=False)
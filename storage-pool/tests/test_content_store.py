@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Content Store 테스트
+이름(인스턴스별 메타데이터)만 다른 시나리오가 본문 하나를 공유하는지 확인
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_store import ContentStore, split_document  # noqa: E402
+
+# storage-app.py의 SCENARIO_REF_FIELDS와 같은 값
+SCENARIO_REF_FIELDS = ('scenario_id', 'name', 'created_at')
+
+
+def make_scenario(scenario_id, name):
+    return {
+        'scenario_id': scenario_id,
+        'name': name,
+        'created_at': '2026-01-01T00:00:00',
+        'type': 'urban_mobility',
+        'parameters': {'num_users': 2, 'area_size': [100, 100], 'duration': 10, 'seed': 7},
+        'environment': {'area_size': [100, 100], 'terrain': 'urban', 'weather': 'clear'},
+        'users': [{'user_id': 'user_0000', 'position': {'x': 1.0, 'y': 2.0, 'z': 1.5}}],
+        'base_stations': [{'bs_id': 'bs_00', 'position': {'x': 50.0, 'y': 50.0, 'z': 25.0}}],
+    }
+
+
+def test_scenarios_differing_only_in_name_share_one_blob(tmp_path):
+    store = ContentStore(str(tmp_path), compress=True)
+
+    first_body, first_ref = split_document(make_scenario('scenario_a', 'sweep_0000'), SCENARIO_REF_FIELDS)
+    second_body, second_ref = split_document(make_scenario('scenario_b', 'sweep_0001'), SCENARIO_REF_FIELDS)
+    first_digest, _, first_written, first_created = store.put(first_body)
+    second_digest, _, second_written, second_created = store.put(second_body)
+
+    assert first_digest == second_digest
+    assert first_created and not second_created
+    assert first_written > 0 and second_written == 0
+    assert len(os.listdir(tmp_path)) == 1
+    assert first_ref['name'] == 'sweep_0000' and second_ref['name'] == 'sweep_0001'
+    assert 'name' not in store.get(first_digest)
+
+
+def test_different_layouts_get_different_blobs(tmp_path):
+    store = ContentStore(str(tmp_path))
+    moved = make_scenario('scenario_b', 'sweep_0001')
+    moved['users'][0]['position']['x'] = 3.0
+
+    first_digest = store.put(split_document(make_scenario('scenario_a', 'sweep_0000'), SCENARIO_REF_FIELDS)[0])[0]
+    second_digest = store.put(split_document(moved, SCENARIO_REF_FIELDS)[0])[0]
+
+    assert first_digest != second_digest
+    assert len(os.listdir(tmp_path)) == 2
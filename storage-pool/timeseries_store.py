@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Time Series Store
+시뮬레이션 단계별 시계열의 컬럼형 청크 저장소
+
+- 시뮬레이션마다 디렉토리 하나: meta.json + step 범위별 청크 (chunk_<start>.npz)
+- 청크 안에서 컬럼마다 (steps, users) 배열 하나 (np.savez_compressed)
+- 조회 시 요청한 step 범위에 겹치는 청크만 열고, 요청한 컬럼 배열만 읽음
+- 집계 조회는 N step 구간별 통계(mean / min / max / 백분위)만 계산해서 반환
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+META_FILE = 'meta.json'
+CHUNK_FILE_PATTERN = re.compile(r'^chunk_\d{8}\.npz$')
+PERCENTILE_PATTERN = re.compile(r'^p(\d{1,2}(\.\d+)?|100)$')
+
+
+def bucket_statistics(values, stats):
+    """
+    values: (구간 수, 구간 내 값 수) 배열 (빈 자리는 NaN)
+    구간 축(axis=1) 통계 {stat: 배열}
+    """
+    result = {}
+    with np.errstate(all='ignore'):
+        for stat in stats:
+            if stat == 'mean':
+                result[stat] = np.nanmean(values, axis=1)
+            elif stat == 'min':
+                result[stat] = np.nanmin(values, axis=1)
+            elif stat == 'max':
+                result[stat] = np.nanmax(values, axis=1)
+            elif stat == 'count':
+                result[stat] = np.sum(~np.isnan(values), axis=1)
+            else:
+                result[stat] = np.nanpercentile(values, float(stat[1:]), axis=1)
+    return result
+
+
+def validate_stats(stats):
+    """지원하는 통계 이름인지 확인 (mean, min, max, count, p0~p100)"""
+    unknown = [
+        stat for stat in stats
+        if stat not in ('mean', 'min', 'max', 'count') and not PERCENTILE_PATTERN.match(stat)
+    ]
+    if unknown:
+        raise ValueError(f"Unknown stats: {unknown}")
+
+
+def to_json_values(array, decimals=4):
+    """NaN은 None으로 바꾼 JSON 목록"""
+    rounded = np.round(array.astype(float), decimals)
+    return [None if np.isnan(value) else value for value in rounded.tolist()]
+
+
+def aggregate_steps(values, steps, bucket_steps, stats, groups=None):
+    """
+    values: (steps, users) 배열 -> bucket_steps 단위 구간별 통계
+    steps: values 각 행의 step 번호 (오름차순, 빠진 step이 있어도 됨)
+    구간 경계는 첫 step부터 bucket_steps 간격, 값이 하나도 없는 구간은 결과에서 제외
+    groups: {그룹 이름: 사용자 열 인덱스 목록} (None이면 전체 사용자 하나로 집계)
+    {'steps': 구간 시작 step 목록, 'series': {그룹: {stat: 값 목록}}}
+    """
+    steps = np.asarray(steps)
+    offsets = steps - steps[0]
+    bucket_index = offsets // bucket_steps
+    num_buckets = int(bucket_index[-1]) + 1
+    # (구간, 구간 내 step, 사용자), 빠진 step 자리는 NaN
+    buckets = np.full((num_buckets, bucket_steps, values.shape[1]), np.nan)
+    buckets[bucket_index, offsets % bucket_steps] = values
+    present = np.unique(bucket_index)
+    buckets = buckets[present]
+
+    series = {}
+    for name, columns in (groups or {'all': None}).items():
+        selected = buckets if columns is None else buckets[:, :, columns]
+        flat = selected.reshape(len(present), -1)
+        series[name] = {
+            stat: to_json_values(array) for stat, array in bucket_statistics(flat, stats).items()
+        }
+    return {
+        'steps': (int(steps[0]) + present * bucket_steps).tolist(),
+        'series': series
+    }
+
+
+class TimeSeriesStore:
+    """
+    컬럼형 청크 시계열 저장소
+
+    meta.json:
+      user_ids: 사용자 ID 목록 (배열의 두 번째 축 순서)
+      columns: 컬럼 이름 목록
+      chunks: [[start_step, end_step), ...] (start 순 정렬)
+      num_steps: 저장된 마지막 step + 1
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _sim_dir(self, simulation_id):
+        if not simulation_id or simulation_id.startswith('.') or os.sep in simulation_id:
+            raise ValueError(f"Invalid simulation id: {simulation_id}")
+        return os.path.join(self.base_dir, simulation_id)
+
+    def _chunk_path(self, simulation_id, start_step):
+        return os.path.join(self._sim_dir(simulation_id), f"chunk_{start_step:08d}.npz")
+
+    def load_meta(self, simulation_id):
+        """메타데이터 (없으면 None)"""
+        try:
+            with open(os.path.join(self._sim_dir(simulation_id), META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_meta(self, simulation_id, meta):
+        path = os.path.join(self._sim_dir(simulation_id), META_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def files(self, simulation_id):
+        """시뮬레이션의 시계열 파일 경로 목록 (meta.json + 청크, 없으면 빈 목록)"""
+        sim_dir = self._sim_dir(simulation_id)
+        try:
+            with os.scandir(sim_dir) as entries:
+                return sorted(
+                    entry.path for entry in entries
+                    if entry.name == META_FILE
+                    or (entry.name.startswith('chunk_') and not entry.name.endswith('.tmp.npz'))
+                )
+        except FileNotFoundError:
+            return []
+
+    def import_file(self, simulation_id, name, content):
+        """내보낸 시계열 파일(meta.json / 청크) 그대로 저장"""
+        if name != META_FILE and not CHUNK_FILE_PATTERN.match(name):
+            raise ValueError(f"Invalid time series file: {name}")
+        sim_dir = self._sim_dir(simulation_id)
+        os.makedirs(sim_dir, exist_ok=True)
+        path = os.path.join(sim_dir, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def delete(self, simulation_id):
+        """시뮬레이션의 시계열 삭제"""
+        shutil.rmtree(self._sim_dir(simulation_id), ignore_errors=True)
+
+    def write_chunk(self, simulation_id, start_step, user_ids, columns):
+        """
+        청크 저장
+        columns: {name: [[step별 사용자 값, ...], ...]} (모든 컬럼의 step 수가 같아야 함)
+        두 번째 청크부터는 meta와 user_ids 순서 / 컬럼 구성이 같아야 하고,
+        다른 start_step의 청크와 step 범위가 겹치면 안 됨 (같은 start_step은 재전송으로 보고 교체)
+        """
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        step_counts = {array.shape[0] for array in arrays.values()}
+        if len(step_counts) != 1:
+            raise ValueError('All columns must have the same number of steps')
+        num_steps = step_counts.pop()
+        for name, array in arrays.items():
+            if array.ndim != 2 or array.shape[1] != len(user_ids):
+                raise ValueError(f"Column {name} must be shaped (steps, {len(user_ids)})")
+        end_step = start_step + num_steps
+
+        sim_dir = self._sim_dir(simulation_id)
+        os.makedirs(sim_dir, exist_ok=True)
+
+        # 압축은 잠금 밖에서 임시 파일로, meta 확인 후 rename (읽는 쪽이 반쯤 쓰인 청크를 보지 않도록)
+        path = self._chunk_path(simulation_id, start_step)
+        tmp_path = f"{path[:-len('.npz')]}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+
+        try:
+            with self._lock:
+                meta = self.load_meta(simulation_id) or {
+                    'simulation_id': simulation_id,
+                    'user_ids': list(user_ids),
+                    'columns': sorted(arrays),
+                    'chunks': [],
+                    'num_steps': 0
+                }
+                self._check_chunk(meta, start_step, end_step, user_ids, arrays)
+                os.replace(tmp_path, path)
+
+                chunks = [chunk for chunk in meta['chunks'] if chunk[0] != start_step]
+                chunks.append([start_step, end_step])
+                meta['chunks'] = sorted(chunks)
+                meta['num_steps'] = max(meta['num_steps'], end_step)
+                self._save_meta(simulation_id, meta)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return {'start_step': start_step, 'end_step': end_step, 'columns': sorted(arrays)}
+
+    @staticmethod
+    def _check_chunk(meta, start_step, end_step, user_ids, arrays):
+        """새 청크가 저장된 meta와 맞는지 확인 (맞지 않으면 ValueError)"""
+        if list(user_ids) != meta['user_ids']:
+            raise ValueError('user_ids must match the stored time series (same users, same order)')
+        if sorted(arrays) != meta['columns']:
+            raise ValueError(f"Chunk columns must be {meta['columns']}")
+        for chunk_start, chunk_end in meta['chunks']:
+            if chunk_start != start_step and chunk_start < end_step and start_step < chunk_end:
+                raise ValueError(
+                    f"Steps {start_step}-{end_step} overlap stored chunk {chunk_start}-{chunk_end}"
+                )
+
+    def aggregate(self, simulation_id, column, start_step=0, end_step=None, bucket_steps=None,
+                  points=500, stats=('mean', 'min', 'max'), group_by=None, groups=None):
+        """
+        컬럼 하나의 구간별 통계 (겹치는 청크에서 해당 컬럼만 읽음)
+        - bucket_steps: 구간 크기 (없으면 points개 이하가 되도록 계산)
+        - group_by='user': 사용자별 / groups: {그룹 이름: 사용자 ID 목록} / 둘 다 없으면 전체
+        """
+        validate_stats(stats)
+        meta = self.load_meta(simulation_id)
+        if meta is None:
+            return None
+        if column == 'best_bs':
+            raise ValueError('best_bs is categorical and cannot be aggregated')
+
+        user_ids = meta['user_ids']
+        if group_by == 'user':
+            groups = {user: [index] for index, user in enumerate(user_ids)}
+        elif group_by not in (None, 'none'):
+            raise ValueError(f"Unknown group_by: {group_by}")
+        elif groups:
+            groups = {name: self._user_columns(user_ids, members) for name, members in groups.items()}
+
+        if column not in meta['columns']:
+            raise ValueError(f"Unknown columns: {[column]}")
+        end_step = meta['num_steps'] if end_step is None else min(end_step, meta['num_steps'])
+        steps, parts = self._read_arrays(simulation_id, meta, start_step, end_step, [column])
+        values = parts[column].astype(float)
+        num_steps = values.shape[0]
+        if not bucket_steps:
+            # 빠진 step이 있어도 구간 수가 points 이하가 되도록 실제 step 범위 기준
+            span = steps[-1] - steps[0] + 1 if steps else 0
+            bucket_steps = max(1, -(-span // max(1, points)))
+
+        result = {
+            'simulation_id': simulation_id,
+            'column': column,
+            'start_step': start_step,
+            'end_step': end_step,
+            'bucket_steps': bucket_steps,
+            'stats': list(stats),
+            'steps': [],
+            'series': {}
+        }
+        if num_steps:
+            result.update(aggregate_steps(values, steps, bucket_steps, stats, groups))
+        return result
+
+    @staticmethod
+    def _user_columns(user_ids, users):
+        """사용자 ID 목록 -> 배열 열 인덱스 목록 ({user_id: 열} 사전 한 번 구성, 사용자당 O(1))"""
+        columns = {user: column for column, user in enumerate(user_ids)}
+        missing = [user for user in users if user not in columns]
+        if missing:
+            raise ValueError(f"Unknown users: {missing}")
+        return [columns[user] for user in users]
+
+    def _read_arrays(self, simulation_id, meta, start_step, end_step, columns, user_index=None):
+        """겹치는 청크에서 요청한 컬럼만 읽어 (step 목록, {컬럼: (steps, users) 배열}) 반환"""
+        steps = []
+        parts = {name: [] for name in columns}
+        for chunk_start, chunk_end in meta['chunks']:
+            if chunk_end <= start_step or chunk_start >= end_step:
+                continue
+            lo = max(start_step, chunk_start) - chunk_start
+            hi = min(end_step, chunk_end) - chunk_start
+            with np.load(self._chunk_path(simulation_id, chunk_start)) as chunk:
+                for name in columns:
+                    array = chunk[name][lo:hi]
+                    if user_index is not None:
+                        array = array[:, user_index]
+                    parts[name].append(array)
+            steps.extend(range(chunk_start + lo, chunk_start + hi))
+        width = len(meta['user_ids']) if user_index is None else len(user_index)
+        return steps, {
+            name: np.concatenate(arrays) if arrays else np.empty((0, width))
+            for name, arrays in parts.items()
+        }
+
+    def read(self, simulation_id, start_step=0, end_step=None, columns=None, users=None):
+        """
+        step 범위 [start_step, end_step) / 컬럼 / 사용자 부분 조회
+        겹치는 청크만 열고 요청한 컬럼 배열만 읽음
+        """
+        meta = self.load_meta(simulation_id)
+        if meta is None:
+            return None
+
+        end_step = meta['num_steps'] if end_step is None else min(end_step, meta['num_steps'])
+        columns = columns or meta['columns']
+        unknown = [name for name in columns if name not in meta['columns']]
+        if unknown:
+            raise ValueError(f"Unknown columns: {unknown}")
+
+        user_ids = meta['user_ids']
+        if users:
+            user_index = self._user_columns(user_ids, users)
+        else:
+            users, user_index = user_ids, None
+
+        steps, parts = self._read_arrays(simulation_id, meta, start_step, end_step, columns, user_index)
+
+        return {
+            'simulation_id': simulation_id,
+            'start_step': start_step,
+            'end_step': end_step,
+            'steps': steps,
+            'users': list(users),
+            'columns': {name: array.tolist() for name, array in parts.items()}
+        }